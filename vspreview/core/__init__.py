@@ -1,5 +1,6 @@
 from . import vsenv  # noqa: F401  # Load vsenv early!
-from . import abstracts, bases, better_abc, types  # noqa: F401
+from . import abstracts, bases, better_abc, memory, types  # noqa: F401
 from .abstracts import *  # noqa: F401, F403
 from .bases import *  # noqa: F401, F403
+from .memory import *  # noqa: F401, F403
 from .types import *  # noqa: F401, F403
@@ -24,6 +24,7 @@ from .better_abc import abstract_attribute
 if TYPE_CHECKING:
     from ..main.timeline import Notches, Timeline
     from ..models import VideoOutputs
+    from .memory import MemoryAccountant, RenderedFrameCache
     from .types import Frame, Time, VideoOutput
 
 
@@ -407,10 +408,18 @@ class AbstractMainWindow(ExtendedMainWindow, QAbstractYAMLObjectSingleton):
         def graphics_view(self) -> None:
             ...
 
+        @property
+        def memory(self) -> MemoryAccountant:
+            ...
+
         @property
         def outputs(self) -> VideoOutputs:
             ...
 
+        @property
+        def rendered_frames(self) -> RenderedFrameCache:
+            ...
+
         @property
         def timeline(self) -> Timeline:
             ...
@@ -443,7 +452,9 @@ class AbstractMainWindow(ExtendedMainWindow, QAbstractYAMLObjectSingleton):
         display_scale: float = abstract_attribute()
         graphics_scene: QGraphicsScene = abstract_attribute()
         graphics_view: QGraphicsView = abstract_attribute()
+        memory: MemoryAccountant = abstract_attribute()
         outputs: VideoOutputs = abstract_attribute()
+        rendered_frames: RenderedFrameCache = abstract_attribute()
         timeline: Timeline = abstract_attribute()
         script_path: Path = abstract_attribute()
         statusbar: QStatusBar = abstract_attribute()
@@ -189,6 +189,14 @@ class GraphicsImageItem:
     def pixmap(self) -> QPixmap:
         return self._graphics_item.pixmap()
 
+    def release(self) -> QPixmap:
+        pixmap = self._pixmap
+
+        self._pixmap = QPixmap()
+        self._graphics_item.setPixmap(self._pixmap)
+
+        return pixmap
+
     def setPixmap(self, new_pixmap: QPixmap | None, crop_values: CroppingInfo | None = None) -> None:
         if new_pixmap is None:
             new_pixmap = self._pixmap
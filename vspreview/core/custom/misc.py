@@ -6,7 +6,7 @@ from PyQt6.QtCore import QRect, Qt
 from PyQt6.QtGui import QBrush, QColor, QPainter, QPaintEvent, QPen
 from PyQt6.QtWidgets import QLabel, QStatusBar, QWidget
 
-from ..abstracts import PushButton
+from ..abstracts import ProgressBar, PushButton
 
 
 class StatusBar(QStatusBar):
@@ -22,6 +22,7 @@ class StatusBar(QStatusBar):
     fps_label: QLabel
     frame_props_label: QLabel
     label: QLabel
+    cache_gauge: ProgressBar
 
     def __init__(self, parent: QWidget) -> None:
         super().__init__(parent)
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Mapping, NamedTuple, cast
+
+from PyQt6.QtGui import QImage, QPixmap
+from vstools import vs
+
+
+def get_image_size(image: QImage | QPixmap | None) -> int:
+    if image is None or image.isNull():
+        return 0
+
+    if isinstance(image, QImage):
+        return image.sizeInBytes()
+
+    return image.width() * image.height() * image.depth() // 8
+
+
+def get_frame_size(clip: vs.VideoNode | None) -> int:
+    if clip is None or not clip.format or not clip.width or not clip.height:
+        return 0
+
+    fmt = clip.format
+
+    return sum(
+        (clip.width >> (fmt.subsampling_w if i else 0)) * (clip.height >> (fmt.subsampling_h if i else 0))
+        for i in range(fmt.num_planes)
+    ) * fmt.bytes_per_sample
+
+
+def get_process_memory() -> int:
+    try:
+        from psutil import Process
+        return cast(int, Process().memory_info().rss)
+    except Exception:
+        pass
+
+    try:
+        from os import sysconf
+
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * sysconf('SC_PAGE_SIZE')
+    except Exception:
+        pass
+
+    return 0
+
+
+class MemoryStore(NamedTuple):
+    name: str
+    size: Callable[[], int]
+    evict: Callable[[], None] | None
+    # lowest gets evicted first
+    priority: int
+    # seconds before it can be evicted again
+    cooldown: float = 0.0
+
+
+class MemoryAccountant:
+    # once over the ceiling, stores are evicted down to this fraction of it
+    LOW_WATER = 0.85
+
+    __slots__ = ('stores', 'evicted_at', 'stuck')
+
+    def __init__(self) -> None:
+        self.stores = dict[str, MemoryStore]()
+        self.evicted_at = dict[str, float]()
+
+        # over the ceiling with nothing left the stores could free
+        self.stuck = False
+
+    def register(
+        self, name: str, size: Callable[[], int], evict: Callable[[], None] | None = None, priority: int = 0,
+        cooldown: float = 0.0
+    ) -> None:
+        self.stores[name] = MemoryStore(name, size, evict, priority, cooldown)
+
+    def unregister(self, name: str) -> None:
+        self.stores.pop(name, None)
+
+    def sizes(self) -> dict[str, int]:
+        sizes = dict[str, int]()
+
+        for store in self.stores.values():
+            try:
+                sizes[store.name] = store.size()
+            except Exception:
+                sizes[store.name] = 0
+
+        return sizes
+
+    def total(self) -> int:
+        return sum(self.sizes().values())
+
+    def usage(self) -> int:
+        # accounted stores are the best we can do without knowing the process' RSS
+        return get_process_memory() or self.total()
+
+    def enforce(self, ceiling: int) -> list[str]:
+        evicted = list[str]()
+
+        if ceiling <= 0 or (usage := self.usage()) <= ceiling:
+            self.stuck = False
+            return evicted
+
+        sizes = self.sizes()
+        now = monotonic()
+
+        stores = [
+            store for store in sorted(self.stores.values(), key=lambda store: store.priority)
+            if store.evict is not None and sizes[store.name]
+            and now - self.evicted_at.get(store.name, -store.cooldown) >= store.cooldown
+        ]
+
+        # the rest is memory the stores don't hold, evicting them every tick would only thrash the preview
+        if usage - sum(sizes[store.name] for store in stores) > ceiling:
+            if not self.stuck:
+                logging.warning(
+                    f'Memory: over {ceiling // 2 ** 20} MB, but most of it is not held by the preview caches'
+                )
+
+            self.stuck = True
+
+            return evicted
+
+        self.stuck = False
+
+        for store in stores:
+            try:
+                cast(Callable[[], None], store.evict)()
+            except Exception as e:
+                logging.error(f'Memory: failed to evict "{store.name}": {e}')
+                continue
+
+            evicted.append(store.name)
+            self.evicted_at[store.name] = now
+            usage -= sizes[store.name]
+
+            if usage <= ceiling * self.LOW_WATER:
+                break
+
+        if evicted:
+            logging.info(f'Memory: over {ceiling // 2 ** 20} MB, evicted {", ".join(evicted)}')
+
+        return evicted
+
+
+class RenderedFrameCache:
+    __slots__ = ('max_size', 'size', 'generation', '_items', '_lock')
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.size = 0
+
+        # bumped on every clear, so frames rendered off-thread for older outputs can be told apart
+        self.generation = 0
+
+        # (output index, frame) -> (pixmap, frame props), least recently used first.
+        # Frames rendered outside of the GUI thread are kept as QImage until they're shown.
+        self._items = OrderedDict[tuple[int, int], tuple[QPixmap | QImage, dict[str, Any]]]()
+        self._lock = Lock()
+
+    def __contains__(self, key: tuple[int, int]) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(
+        self, key: tuple[int, int], pixmap: QPixmap | QImage, props: Mapping[str, Any], generation: int | None = None
+    ) -> None:
+        if pixmap.isNull() or (pixmap_size := get_image_size(pixmap)) > self.max_size:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+
+            self._pop(key)
+
+            self._items[key] = (pixmap, dict(props))
+            self.size += pixmap_size
+
+            self._shrink()
+
+    def pop(self, key: tuple[int, int]) -> tuple[QPixmap | QImage, dict[str, Any]] | None:
+        with self._lock:
+            return self._pop(key)
+
+    def resize(self, max_size: int) -> None:
+        with self._lock:
+            self.max_size = max_size
+
+            self._shrink()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+            self.generation += 1
+
+    def _pop(self, key: tuple[int, int]) -> tuple[QPixmap | QImage, dict[str, Any]] | None:
+        if (item := self._items.pop(key, None)) is not None:
+            self.size -= get_image_size(item[0])
+
+        return item
+
+    def _shrink(self) -> None:
+        while self._items and self.size > self.max_size:
+            pixmap, _ = self._items.popitem(last=False)[1]
+            self.size -= get_image_size(pixmap)
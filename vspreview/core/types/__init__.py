@@ -1,6 +1,7 @@
-from . import audio, misc, scene, units, video, yaml  # noqa: F401
+from . import audio, misc, props, scene, units, video, yaml  # noqa: F401
 from .audio import *  # noqa: F401, F403
 from .misc import *  # noqa: F401, F403
+from .props import *  # noqa: F401, F403
 from .scene import *  # noqa: F401, F403
 from .units import *  # noqa: F401, F403
 from .video import *  # noqa: F401, F403
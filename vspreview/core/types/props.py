@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import sys
+from collections import deque
+from concurrent.futures import Future
+from threading import Lock
+from typing import Any, Iterable
+
+from vstools import vs
+
+# Props holding these keep whole frames/graphs alive, so they're never cached
+_HEAVY_PROP_TYPES = (vs.RawFrame, vs.RawNode)
+
+
+class FramePropsCache:
+    __slots__ = ('node', '_keys', '_keys_index', '_items', '_lock')
+
+    def __init__(self, clip: vs.VideoNode) -> None:
+        self.node = self.make_props_node(clip)
+
+        # frames almost always share the same set of keys,
+        # so every frame only stores its values and an index into the keys table
+        self._keys = list[tuple[str, ...]]()
+        self._keys_index = dict[tuple[str, ...], int]()
+        self._items = dict[int, tuple[int, tuple[Any, ...]]]()
+        self._lock = Lock()
+
+    @staticmethod
+    def make_props_node(clip: vs.VideoNode) -> vs.VideoNode:
+        # no resizing/packing of the output, only what's needed to compute the props
+        blank = vs.core.std.BlankClip(width=1, height=1, format=vs.GRAY8, length=clip.num_frames, keep=True)
+
+        return blank.std.CopyFrameProps(clip)
+
+    def __contains__(self, n: int) -> bool:
+        return n in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, n: int) -> dict[str, Any]:
+        return self.get(n)
+
+    def get(self, n: int) -> dict[str, Any]:
+        if n not in self._items:
+            with self.node.get_frame(n) as frame:
+                self.update(n, frame.props)
+
+        keys_idx, values = self._items[n]
+
+        return dict(zip(self._keys[keys_idx], values))
+
+    def update(self, n: int, props: vs.FrameProps | dict[str, Any]) -> None:
+        items = sorted(
+            (sys.intern(key), value) for key, value in props.items()
+            if not isinstance(value, _HEAVY_PROP_TYPES)
+        )
+
+        keys = tuple(key for key, _ in items)
+        values = tuple(value for _, value in items)
+
+        with self._lock:
+            if (keys_idx := self._keys_index.get(keys)) is None:
+                keys_idx = self._keys_index[keys] = len(self._keys)
+                self._keys.append(keys)
+
+            self._items[n] = (keys_idx, values)
+
+    def prefetch(self, frames: Iterable[int], max_in_flight: int | None = None) -> Future[None]:
+        result = Future[None]()
+        result.set_running_or_notify_cancel()
+
+        todo = deque(n for n in dict.fromkeys(frames) if n not in self._items)
+
+        if not todo:
+            result.set_result(None)
+            return result
+
+        max_in_flight = max_in_flight or vs.core.num_threads
+
+        lock = Lock()
+        in_flight = 0
+
+        def _request_next() -> None:
+            nonlocal in_flight
+
+            with lock:
+                if result.done() or not todo:
+                    return
+
+                n = todo.popleft()
+                in_flight += 1
+
+            self.node.get_frame_async(n).add_done_callback(lambda f: _on_done(n, f))
+
+        def _on_done(n: int, future: Future[vs.VideoFrame]) -> None:
+            nonlocal in_flight
+
+            try:
+                with future.result() as frame:
+                    self.update(n, frame.props)
+            except Exception as e:
+                with lock:
+                    if not result.done():
+                        result.set_exception(e)
+                return
+
+            with lock:
+                in_flight -= 1
+                finished = not todo and not in_flight
+
+            if finished:
+                with lock:
+                    if not result.done():
+                        result.set_result(None)
+            else:
+                _request_next()
+
+        for _ in range(min(len(todo), max_in_flight)):
+            _request_next()
+
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._keys.clear()
+            self._keys_index.clear()
@@ -14,6 +14,7 @@ from vstools import ColorRange, DependencyNotFoundError, FramesLengthError, core
 
 from ..abstracts import AbstractYAMLObject, main_window, try_load
 from .dataclasses import CroppingInfo, VideoOutputNode
+from .props import FramePropsCache
 from .units import Frame, Time
 
 
@@ -63,7 +64,7 @@ class VideoOutput(AbstractYAMLObject):
         *storable_attrs, 'index', 'width', 'height', 'fps_num', 'fps_den',
         'total_frames', 'total_time', 'graphics_scene_item',
         'end_frame', 'fps', 'source', 'prepared',
-        'main', 'checkerboard', 'props', '_stateset'
+        'main', 'checkerboard', 'props', 'props_cache', '_stateset'
     )
 
     source: VideoOutputNode
@@ -76,6 +77,12 @@ class VideoOutput(AbstractYAMLObject):
     def clear(self) -> None:
         self.source = self.prepared = None
 
+        if hasattr(self, 'props_cache'):
+            self.props_cache.clear()
+
+            # its props node references the whole graph of the source, it's rebuilt in setValue
+            del self.props_cache
+
     def __init__(
         self, vs_output: vs.VideoOutputTuple | VideoOutputNode, index: int, new_storage: bool = False
     ) -> None:
@@ -112,9 +119,10 @@ class VideoOutput(AbstractYAMLObject):
             self.title = self.main.user_output_names[vs.VideoNode].get(vs_outputs.index(vs_output))
             self.main.outputs.setData(self.main.outputs.index(index), self.title)
         self.props = cast(vs.FrameProps, {})
+        self.props_cache = FramePropsCache(self.source.clip)
 
-        if self.source.alpha:
-            self.checkerboard = self._generate_checkerboard()
+        if hasattr(self, 'checkerboard'):
+            del self.checkerboard
 
         if not hasattr(self, 'last_showed_frame') or not (0 <= self.last_showed_frame < self.total_frames):
             self.last_showed_frame = Frame(0)
@@ -126,7 +134,7 @@ class VideoOutput(AbstractYAMLObject):
 
             if self.fps_num == 0:
                 try:
-                    play_fps = self.main.toolbars.playback.get_true_fps(0, self.props, True)
+                    play_fps = self.main.toolbars.playback.get_true_fps(0, self.props_cache[0], True)
                 except Exception:
                     if isinstance(timecodes, list):
                         play_fps = timecodes[self.last_showed_frame]
@@ -168,7 +176,7 @@ class VideoOutput(AbstractYAMLObject):
         elif not hasattr(self, 'play_fps'):
             if self.fps_num == 0 and self._stateset:
                 self.play_fps = self.main.toolbars.playback.get_true_fps(
-                    self.last_showed_frame.value, self.props
+                    self.last_showed_frame.value, self.props_cache[self.last_showed_frame.value]
                 )
             else:
                 self.play_fps = self.fps_num / self.fps_den
@@ -295,7 +303,9 @@ class VideoOutput(AbstractYAMLObject):
 
         return clip
 
-    def frame_to_qimage(self, frame: vs.VideoFrame, is_alpha: bool = False) -> QImage:
+    def frame_to_qimage(
+        self, frame: vs.VideoFrame, is_alpha: bool = False, output_colorspace: QColorSpace | None = None
+    ) -> QImage:
         width, height, stride = frame.width, frame.height, frame.get_stride(0)
         mod, point_size, qt_format = self._FRAME_CONV_INFO[is_alpha]
 
@@ -304,7 +314,25 @@ class VideoOutput(AbstractYAMLObject):
         else:
             pointer = cast(sip.voidptr, frame[0])
 
-        return QImage(pointer, width, height, stride, qt_format).copy()
+        image = QImage(pointer, width, height, stride, qt_format).copy()
+
+        if output_colorspace is not None:
+            image.setColorSpace(QColorSpace(QColorSpace.NamedColorSpace.SRgb))
+            image.convertToColorSpace(output_colorspace)
+
+        return image
+
+    def cache_rendered_frame(
+        self, n: int, vs_frame: vs.VideoFrame, output_colorspace: QColorSpace | None = None,
+        generation: int | None = None
+    ) -> None:
+        # safe to call outside of the GUI thread, only a QImage is made
+        if self.prepared.alpha is not None:
+            return
+
+        self.main.rendered_frames.put(
+            (self.index, n), self.frame_to_qimage(vs_frame, False, output_colorspace), vs_frame.props, generation
+        )
 
     def update_graphic_item(
         self, pixmap: QPixmap | None = None, crop_values: CroppingInfo | None | bool = None
@@ -318,6 +346,15 @@ class VideoOutput(AbstractYAMLObject):
             self.graphics_scene_item.setPixmap(pixmap, self.crop_values)
         return pixmap
 
+    def release_graphic_item(self) -> None:
+        if not hasattr(self, 'graphics_scene_item'):
+            return
+
+        pixmap = self.graphics_scene_item.release()
+
+        if not pixmap.isNull():
+            self.main.rendered_frames.put((self.index, int(self.last_showed_frame)), pixmap, self.props)
+
     def render_frame(
         self, frame: Frame | None, vs_frame: vs.VideoFrame | None = None,
         vs_alpha_frame: vs.VideoFrame | None = None, do_painting: bool = True,
@@ -328,15 +365,28 @@ class VideoOutput(AbstractYAMLObject):
 
         frame = min(max(frame, Frame(0)), self.total_frames - 1)
 
+        if vs_frame is None and (cached := self.main.rendered_frames.pop((self.index, frame.value))) is not None:
+            qpixmap, props = cached
+
+            if isinstance(qpixmap, QImage):
+                qpixmap = QPixmap.fromImage(qpixmap, Qt.ImageConversionFlag.NoFormatConversion)
+
+            self.props = cast(vs.FrameProps, props)
+
+            # switch_frame reads them from the cache, they'd be fetched again on the GUI thread otherwise
+            self.props_cache.update(frame.value, self.props)
+
+            if do_painting:
+                self.update_graphic_item(qpixmap)
+
+            return qpixmap
+
         vs_frame = vs_frame or self.prepared.clip.get_frame(frame.value)
 
         self.props = cast(vs.FrameProps, vs_frame.props.copy())
+        self.props_cache.update(frame.value, self.props)
 
-        frame_image = self.frame_to_qimage(vs_frame, False)
-
-        if output_colorspace is not None:
-            frame_image.setColorSpace(QColorSpace(QColorSpace.NamedColorSpace.SRgb))
-            frame_image.convertToColorSpace(output_colorspace)
+        frame_image = self.frame_to_qimage(vs_frame, False, output_colorspace)
 
         if not vs_frame.closed:
             vs_frame.close()
@@ -362,6 +412,9 @@ class VideoOutput(AbstractYAMLObject):
         painter.drawImage(0, 0, alpha_image)
 
         if self.main.toolbars.playback.settings.CHECKERBOARD_ENABLED:
+            if not hasattr(self, 'checkerboard'):
+                self.checkerboard = self._generate_checkerboard()
+
             painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_DestinationOver)
             painter.drawImage(0, 0, self.checkerboard)
 
@@ -9,7 +9,8 @@ import logging
 import os
 import signal
 import sys
-from argparse import ArgumentParser
+from argparse import SUPPRESS, ArgumentParser, Namespace
+from dataclasses import asdict
 from pathlib import Path
 from typing import Literal, cast
 from PyQt6.QtWidgets import QApplication
@@ -55,6 +56,64 @@ def main() -> None:
     parser.add_argument(
         "--verbose", help="Set the logging to verbose.", action="store_true"
     )
+    parser.add_argument(
+        '--benchmark', action='store_true', help='Benchmark an output without opening the preview, outputs JSON'
+    )
+    parser.add_argument('--output', type=int, default=0, help='Output to benchmark (defaults to 0)')
+    parser.add_argument('--start', type=int, default=0, help='First frame to benchmark (defaults to 0)')
+    parser.add_argument('--end', type=int, help='Last frame to benchmark (defaults to the last frame)')
+    parser.add_argument(
+        '--requests', type=int, help='Concurrent frame requests to benchmark with (defaults to usable CPUs count)'
+    )
+    parser.add_argument(
+        '--unsequenced', action='store_true', help='Request a new frame as soon as any other one completes'
+    )
+    parser.add_argument(
+        '--pattern', type=str, choices=['sequential', 'random', 'strided', 'reverse'], default='sequential',
+        help='Order in which frames are requested (defaults to sequential)'
+    )
+    parser.add_argument('--stride', type=int, default=24, help='Frames skipped by every strided jump (defaults to 24)')
+    parser.add_argument('--seed', type=int, help='Seed of the random access pattern')
+    parser.add_argument(
+        '--sample-interval', type=float, default=0.15, metavar='SECONDS',
+        help='Interval between memory samples, 0 disables sampling (defaults to 0.15)'
+    )
+    parser.add_argument(
+        '--history', action='store_true', help="Record the benchmark in the script's .vspreview benchmark history"
+    )
+    parser.add_argument(
+        '--fail-on-regression', type=float, nargs='?', const=5.0, metavar='PERCENT',
+        help='Exit with code 2 if the benchmark is slower than the history baseline by more than PERCENT (default 5)'
+    )
+
+    parser.add_argument(
+        '--comp', type=Path, nargs='+', metavar='SCRIPT',
+        help='Make a comparison of each script without opening the preview, using the comp toolbar settings'
+    )
+    parser.add_argument('--frames', type=int, nargs='+', default=[], help='Frames to compare')
+    parser.add_argument('--random', type=int, default=0, metavar='N', help='Random frames to compare')
+    parser.add_argument(
+        '--picture-type', type=str, choices=['I', 'P', 'B'], help='Picture type the random frames have to be'
+    )
+    parser.add_argument(
+        '--selection', type=str, default='random', choices=['random', 'difference', 'darkest', 'scenes'],
+        help='How the random frames are picked: at random, or one per scene by highest difference between outputs, '
+        'darkest scenes or spread over all scenes (defaults to random)'
+    )
+    parser.add_argument(
+        '--collection-name', type=str, help='Name of the comparisons, {script_name} is replaced by the script name'
+    )
+    parser.add_argument('--local', action='store_true', help='Write local bundles instead of uploading to slow.pics')
+    parser.add_argument('--private', action='store_true', help='Upload the comparisons as private')
+    parser.add_argument('--nsfw', action='store_true', help='Mark the comparisons as NSFW')
+    parser.add_argument(
+        '--jobs', '-j', type=int, default=2, help='Scripts compared at the same time (defaults to 2)'
+    )
+    parser.add_argument(
+        '--manifest', type=Path, default=Path('comp_manifest.json'),
+        help='JSON file the comparisons results are written to (defaults to comp_manifest.json)'
+    )
+    parser.add_argument('--comp-result', type=Path, help=SUPPRESS)
 
     args = parser.parse_args()
 
@@ -69,6 +128,9 @@ def main() -> None:
         install_vscode_launch(args.vscode_setup)
         sys.exit(0)
 
+    if args.comp:
+        sys.exit(comp_batch(args))
+
     if args.script_path is None:
         logging.error('Script path required.')
         sys.exit(1)
@@ -81,20 +143,120 @@ def main() -> None:
     if not args.preserve_cwd:
         os.chdir(script_path.parent)
 
+    external_args = [tuple(a.split('=', maxsplit=1)) for a in args.arg or []]
+
+    if args.benchmark:
+        sys.exit(benchmark_headless(script_path, external_args, args))
+
+    if args.comp_result:
+        sys.exit(comp_headless(script_path, external_args, args))
+
     app = QApplication(sys.argv)
     set_vsengine_loop()
 
     signal.signal(signal.SIGINT, signal.SIG_DFL)
 
     main_window = MainWindow(Path(os.getcwd()) if args.preserve_cwd else script_path.parent)
-    main_window.load_script(
-        script_path, [tuple(a.split('=', maxsplit=1)) for a in args.arg or []], False, args.frame or None
-    )
+    main_window.load_script(script_path, external_args, False, args.frame or None)
     main_window.show()
 
     sys.exit(app.exec_())
 
 
+def benchmark_headless(script_path: Path, external_args: list[tuple[str, str]], args: Namespace) -> int:
+    # no QApplication nor vsengine Qt loop here, the default loop resolves everything synchronously
+    from .toolbars.benchmark.headless import run_headless_benchmark
+
+    try:
+        result = run_headless_benchmark(
+            script_path, external_args, args.output, args.start, args.end,
+            args.requests or MainSettings.get_usable_cpus_count(), args.unsequenced,
+            args.pattern, args.stride, args.seed, args.sample_interval
+        )
+    except Exception as e:
+        logging.error(f'Benchmark failed: {e}')
+        return 1
+
+    if result.error:
+        print(json.dumps(result.to_dict(), indent=4))
+        return 1
+
+    output = result.to_dict()
+    exit_code = 0
+
+    if args.history or args.fail_on_regression is not None:
+        from .toolbars.benchmark.history import BenchmarkHistory, BenchmarkRecord, compare_records
+
+        history = BenchmarkHistory.for_script(Path.cwd() / MainWindow.VSP_DIR_NAME, script_path)
+        record = BenchmarkRecord.from_result(result, script_path, args.output, BenchmarkRecord.SCRIPT)
+
+        if args.history:
+            history.append(record)
+
+        if args.fail_on_regression is not None:
+            if (baseline := history.get_baseline_for(record)) is None:
+                logging.warning('Benchmark: no baseline in the history to compare to')
+            else:
+                regressions = compare_records(record, baseline, args.fail_on_regression / 100)
+
+                output['baseline'] = asdict(baseline)
+                output['regressions'] = [regression._asdict() for regression in regressions]
+
+                if regressions:
+                    logging.error('Benchmark regression: ' + ', '.join(map(str, regressions)))
+                    exit_code = 2
+
+    print(json.dumps(output, indent=4))
+
+    return exit_code
+
+
+COMP_SELECTIONS = {
+    'random': 'Random', 'difference': 'Highest difference', 'darkest': 'Darkest scenes', 'scenes': 'One per scene'
+}
+
+
+def comp_batch(args: Namespace) -> int:
+    from .toolbars.comp.headless import run_comp_batch
+
+    scripts = [script.resolve() for script in args.comp]
+
+    if missing := [str(script) for script in scripts if not script.exists()]:
+        logging.error(f'Script path is invalid: {", ".join(missing)}')
+        return 1
+
+    # everything but the scripts and the batch options goes to every comp process
+    forwarded = [
+        *(f'--arg={arg}' for arg in args.arg or []), *(['--frames', *map(str, args.frames)] if args.frames else []),
+        f'--random={args.random}', f'--selection={args.selection}',
+        *([f'--picture-type={args.picture_type}'] if args.picture_type else []),
+        *([f'--collection-name={args.collection_name}'] if args.collection_name else []),
+        *(['--local'] if args.local else []), *(['--private'] if args.private else []),
+        *(['--nsfw'] if args.nsfw else []), *(['--preserve-cwd'] if args.preserve_cwd else []),
+        *(['--verbose'] if args.verbose else [])
+    ]
+
+    return run_comp_batch(scripts, forwarded, args.jobs, args.manifest.resolve())
+
+
+def comp_headless(script_path: Path, external_args: list[tuple[str, str]], args: Namespace) -> int:
+    from .toolbars.comp.headless import run_headless_comp
+
+    try:
+        result = run_headless_comp(
+            script_path, external_args, args.frames, args.random, args.picture_type, args.collection_name,
+            args.local, not args.private, args.nsfw, Path(os.getcwd()) if args.preserve_cwd else script_path.parent,
+            COMP_SELECTIONS[args.selection]
+        )
+    except Exception as e:
+        logging.error(f'Comp failed: {e}')
+        result = {'error': str(e)}
+
+    args.comp_result.write_text(json.dumps(result), 'utf-8')
+
+    return int('error' in result)
+
+
 def install_vscode_launch(mode: Literal['override', 'append', 'ignore']) -> None:
     vscode_settings_path = Path.cwd() / '.vscode'
     vscode_settings_path.mkdir(0o777, True, True)
@@ -4,7 +4,7 @@ import logging
 import sys
 from functools import partial
 from multiprocessing import cpu_count
-from typing import Any, Mapping
+from typing import Any, Mapping, cast
 
 from PyQt6.QtCore import Qt, QKeyCombination
 from PyQt6.QtGui import QShortcut
@@ -23,6 +23,8 @@ class MainSettings(AbstractToolbarSettings):
         'opengl_rendering_checkbox', 'output_index_spinbox',
         'png_compressing_spinbox', 'statusbar_timeout_control',
         'timeline_notches_margin_spinbox', 'usable_cpus_spinbox',
+        'vs_num_threads_spinbox', 'vs_max_cache_size_spinbox', 'memory_ceiling_spinbox',
+        'rendered_frames_cache_spinbox',
         'zoom_levels_combobox', 'zoom_levels_lineedit', 'zoom_level_default_combobox',
         'azerty_keyboard_checkbox', 'dragnavigator_timeout_spinbox', 'color_management_checkbox'
     )
@@ -30,6 +32,7 @@ class MainSettings(AbstractToolbarSettings):
     INSTANT_FRAME_UPDATE = False
     SYNC_OUTPUTS = True
     LOG_LEVEL = logging.INFO
+    MEMORY_REFRESH_INTERVAL = 1000  # ms
 
     def setup_ui(self) -> None:
         super().setup_ui()
@@ -54,6 +57,20 @@ class MainSettings(AbstractToolbarSettings):
 
         self.usable_cpus_spinbox = SpinBox(self, 1, self.get_usable_cpus_count())
 
+        self.vs_num_threads_spinbox = SpinBox(self, 1, 4 * self.get_usable_cpus_count())
+
+        self.vs_max_cache_size_spinbox = SpinBox(self, 1, self.get_total_memory() // 2 ** 20, ' MB')
+
+        self.memory_ceiling_spinbox = SpinBox(
+            self, 0, self.get_total_memory() // 2 ** 20, ' MB', specialValueText='Disabled',
+            tooltip='Preview caches get evicted when the process uses more memory than this'
+        )
+
+        self.rendered_frames_cache_spinbox = SpinBox(
+            self, 0, self.get_total_memory() // 2 ** 20, ' MB',
+            tooltip='Frames of hidden outputs are kept here, to be shown again without rendering them'
+        )
+
         self.azerty_keyboard_checkbox = CheckBox('AZERTY Keyboard', self)
 
         self.zoom_levels_combobox = ComboBox[int](editable=True, insertPolicy=QComboBox.InsertPolicy.NoInsert)
@@ -92,6 +109,14 @@ class MainSettings(AbstractToolbarSettings):
 
         HBoxLayout(self.vlayout, [QLabel('Usable CPUs count'), self.usable_cpus_spinbox])
 
+        HBoxLayout(self.vlayout, [QLabel('VapourSynth threads'), self.vs_num_threads_spinbox])
+
+        HBoxLayout(self.vlayout, [QLabel('VapourSynth max cache size'), self.vs_max_cache_size_spinbox])
+
+        HBoxLayout(self.vlayout, [QLabel('Memory ceiling'), self.memory_ceiling_spinbox])
+
+        HBoxLayout(self.vlayout, [QLabel('Rendered frames cache size'), self.rendered_frames_cache_spinbox])
+
         HBoxLayout(self.vlayout, [
             VBoxLayout([
                 QLabel('Zoom Levels'),
@@ -121,6 +146,10 @@ class MainSettings(AbstractToolbarSettings):
         self.force_old_storages_removal_checkbox.setChecked(False)
         self.azerty_keyboard_checkbox.setChecked(False)
         self.usable_cpus_spinbox.setValue(self.get_usable_cpus_count())
+        self.vs_num_threads_spinbox.setValue(self.get_usable_cpus_count())
+        self.vs_max_cache_size_spinbox.setValue(self.get_total_memory() // 4 // 2 ** 20)
+        self.memory_ceiling_spinbox.setValue(self.get_total_memory() * 3 // 4 // 2 ** 20)
+        self.rendered_frames_cache_spinbox.setValue(512)
         self.dragnavigator_timeout_spinbox.setValue(250)
 
         self.zoom_levels = [
@@ -173,6 +202,22 @@ class MainSettings(AbstractToolbarSettings):
     def usable_cpus_count(self) -> int:
         return self.usable_cpus_spinbox.value()
 
+    @property
+    def vs_num_threads(self) -> int:
+        return self.vs_num_threads_spinbox.value()
+
+    @property
+    def vs_max_cache_size(self) -> int:
+        return self.vs_max_cache_size_spinbox.value()
+
+    @property
+    def memory_ceiling(self) -> int:
+        return self.memory_ceiling_spinbox.value()
+
+    @property
+    def rendered_frames_cache_size(self) -> int:
+        return self.rendered_frames_cache_spinbox.value()
+
     @property
     def zoom_levels(self) -> list[float]:
         return [
@@ -233,6 +278,18 @@ class MainSettings(AbstractToolbarSettings):
             except Exception:
                 return cpu_count()
 
+    @staticmethod
+    def get_total_memory() -> int:
+        try:
+            from psutil import virtual_memory
+            return cast(int, virtual_memory().total)
+        except Exception:
+            try:
+                from os import sysconf
+                return sysconf('SC_PAGE_SIZE') * sysconf('SC_PHYS_PAGES')
+            except Exception:
+                return 8 * 2 ** 30
+
     @property
     def dragnavigator_timeout(self) -> int:
         return self.dragnavigator_timeout_spinbox.value()
@@ -286,6 +343,10 @@ class MainSettings(AbstractToolbarSettings):
             'png_compression': self.png_compression_level,
             'statusbar_message_timeout': self.statusbar_message_timeout,
             'timeline_label_notches_margin': self.timeline_label_notches_margin,
+            'vs_num_threads': self.vs_num_threads,
+            'vs_max_cache_size': self.vs_max_cache_size,
+            'memory_ceiling': self.memory_ceiling,
+            'rendered_frames_cache_size': self.rendered_frames_cache_size,
             'force_old_storages_removal': self.force_old_storages_removal,
             'zoom_levels': sorted([int(x * 100) for x in self.zoom_levels]),
             'zoom_default_index': self.zoom_default_index,
@@ -302,6 +363,10 @@ class MainSettings(AbstractToolbarSettings):
         try_load(state, 'png_compression', int, self.png_compressing_spinbox.setValue)
         try_load(state, 'statusbar_message_timeout', Time, self.statusbar_timeout_control.setValue)
         try_load(state, 'timeline_label_notches_margin', int, self.timeline_notches_margin_spinbox.setValue)
+        try_load(state, 'vs_num_threads', int, self.vs_num_threads_spinbox.setValue)
+        try_load(state, 'vs_max_cache_size', int, self.vs_max_cache_size_spinbox.setValue)
+        try_load(state, 'memory_ceiling', int, self.memory_ceiling_spinbox.setValue)
+        try_load(state, 'rendered_frames_cache_size', int, self.rendered_frames_cache_spinbox.setValue)
         try_load(state, 'force_old_storages_removal', bool, self.force_old_storages_removal_checkbox.setChecked)
         try_load(state, 'zoom_levels', list, self)
         try_load(state, 'zoom_default_index', int, self.zoom_level_default_combobox.setCurrentIndex)
@@ -20,12 +20,15 @@ from PyQt6.QtWidgets import QApplication, QGraphicsScene, QGraphicsView, QLabel,
 from vsengine import vpy  # type: ignore[import]
 from vstools import ChromaLocation, ColorRange, Matrix, Primaries, Transfer, vs
 
-from ..core import AbstractMainWindow, ExtendedWidget, Frame, Time, VBoxLayout, VideoOutput, ViewMode, try_load
+from ..core import (
+    AbstractMainWindow, ExtendedWidget, Frame, MemoryAccountant, ProgressBar, RenderedFrameCache, Time, Timer,
+    VBoxLayout, VideoOutput, ViewMode, try_load
+)
 from ..core.custom import DragNavigator, GraphicsImageItem, GraphicsView, StatusBar
 from ..core.vsenv import _monkey_runpy_dicts, get_current_environment, make_environment
 from ..models import VideoOutputs
 from ..toolbars import Toolbars
-from ..utils import fire_and_forget, set_status_label
+from ..utils import fire_and_forget, set_status_label, vs_clear_cache
 from .dialog import ScriptErrorDialog, SettingsDialog
 from .settings import MainSettings, WindowSettings
 from .timeline import Timeline
@@ -72,7 +75,8 @@ class MainWindow(AbstractMainWindow):
         'script_path', 'timeline', 'main_layout',
         'graphics_scene', 'graphics_view', 'script_error_dialog',
         'central_widget', 'statusbar', 'storage_not_found',
-        'current_storage_path', 'opengl_widget', 'drag_navigator'
+        'current_storage_path', 'opengl_widget', 'drag_navigator',
+        'core_settings_applied', 'memory', 'memory_timer', 'rendered_frames'
     )
 
     # emit when about to reload a script: clear all existing references to existing clips.
@@ -85,6 +89,12 @@ class MainWindow(AbstractMainWindow):
         super().__init__()
 
         self.settings = MainSettings()
+        self.memory = MemoryAccountant()
+        self.rendered_frames = RenderedFrameCache(self.settings.rendered_frames_cache_size * 2 ** 20)
+
+        self.settings.rendered_frames_cache_spinbox.valueChanged.connect(
+            lambda value: self.rendered_frames.resize(value * 2 ** 20)
+        )
 
         # logging
         logging.basicConfig(format='{asctime}: {levelname}: {message}', style='{', level=self.settings.LOG_LEVEL)
@@ -168,6 +178,17 @@ class MainWindow(AbstractMainWindow):
 
         self.env: vpy.Script | None = None
 
+        # values last written to the core, to tell apart the ones the script itself changed
+        self.core_settings_applied = dict[str, int]()
+
+        self.register_memory_stores()
+
+        self.memory_timer = Timer(timeout=self.check_memory_usage, interval=self.settings.MEMORY_REFRESH_INTERVAL)
+        self.memory_timer.start()
+
+        for spinbox in (self.settings.vs_num_threads_spinbox, self.settings.vs_max_cache_size_spinbox):
+            spinbox.editingFinished.connect(self.apply_core_settings)
+
     def setup_ui(self) -> None:
         self.central_widget = ExtendedWidget(self)
         self.main_layout = VBoxLayout(self.central_widget)
@@ -196,6 +217,10 @@ class MainWindow(AbstractMainWindow):
 
         self.statusbar.addPermanentWidget(self.statusbar.label)
 
+        self.statusbar.cache_gauge = ProgressBar(self.central_widget, maximumWidth=220, textVisible=True)
+        self.statusbar.cache_gauge.setFormat('VS cache: %v / %m MB')
+        self.statusbar.addPermanentWidget(self.statusbar.cache_gauge)
+
         self.setStatusBar(self.statusbar)
 
         # dialogs
@@ -233,6 +258,7 @@ class MainWindow(AbstractMainWindow):
                 module_name="__vspreview__"
             ).result()
             self.env.module.__dict__['_monkey_runpy'] = random()
+            self.apply_core_settings()
             self.env = vpy.script(script_path, environment=self.env).result()
         except vpy.ExecutionFailed as e:
             logging.error(e.parent_error)
@@ -275,6 +301,8 @@ class MainWindow(AbstractMainWindow):
 
             if not self.storage_not_found:
                 self.load_storage()
+
+            self.apply_core_settings(keep_script_overrides=True)
         except Exception as e:
             load_error = e
 
@@ -301,6 +329,45 @@ class MainWindow(AbstractMainWindow):
                 f'{error_string}{vpy.textwrap.indent(str(load_error), " | ")}\nSee console output for details.'
             )
 
+    def apply_core_settings(self, keep_script_overrides: bool = False) -> None:
+        core = vs.core
+
+        for attr, value in (
+            ('num_threads', self.settings.vs_num_threads),
+            ('max_cache_size', self.settings.vs_max_cache_size)
+        ):
+            if keep_script_overrides and getattr(core, attr) != self.core_settings_applied.get(attr):
+                continue
+
+            setattr(core, attr, value)
+            self.core_settings_applied[attr] = value
+
+        self.update_cache_gauge()
+
+    def register_memory_stores(self) -> None:
+        self.memory.register('Rendered frames', lambda: self.rendered_frames.size, self.rendered_frames.clear, 0)
+        self.memory.register(
+            'Checkerboards', lambda: self.outputs.get_checkerboards_size() if self.outputs else 0,
+            lambda: self.outputs and self.outputs.clear_checkerboards(), 10
+        )
+        self.memory.register(
+            'FFT spectrum outputs', lambda: self.outputs.get_fft_spectrum_size() if self.outputs else 0,
+            lambda: self.outputs and self.outputs.clear_fft_spectrum(), 20
+        )
+        self.memory.register('VapourSynth cache', lambda: vs.core.used_cache_size, vs_clear_cache, 100, 30.0)
+
+    def check_memory_usage(self) -> None:
+        self.update_cache_gauge()
+
+        if self.outputs:
+            self.memory.enforce(self.settings.memory_ceiling * 2 ** 20)
+
+    def update_cache_gauge(self) -> None:
+        core = vs.core
+
+        self.statusbar.cache_gauge.setMaximum(max(core.max_cache_size, 1))
+        self.statusbar.cache_gauge.setValue(min(core.used_cache_size // 2 ** 20, core.max_cache_size))
+
     @set_status_label('Loading...')
     def load_storage(self) -> None:
         storage_paths = [self.global_storage_path, self.current_storage_path]
@@ -466,6 +533,7 @@ class MainWindow(AbstractMainWindow):
             return
 
         self.graphics_scene.clear()
+        self.rendered_frames.clear()
 
         for output in self.outputs:
             raw_frame_item = self.graphics_scene.addPixmap(QPixmap())
@@ -546,7 +614,15 @@ class MainWindow(AbstractMainWindow):
         for toolbar in self.toolbars:
             toolbar.on_current_frame_changed(frame)
 
-        self.statusbar.frame_props_label.setText(self.STATUS_FRAME_PROP(self.current_output.props))
+        self.statusbar.frame_props_label.setText(
+            self.STATUS_FRAME_PROP(self.current_output.props_cache[frame.value])
+        )
+
+        # the neighbours' props are fetched in the background, so stepping to them doesn't block on get_frame
+        if not self.toolbars.playback.play_timer.isActive():
+            self.current_output.props_cache.prefetch(
+                n for n in (frame.value - 1, frame.value + 1) if 0 <= n < self.current_output.total_frames
+            )
 
     def switch_output(self, value: int | VideoOutput) -> None:
         if not self.outputs or len(self.outputs) == 0:
@@ -576,6 +652,9 @@ class MainWindow(AbstractMainWindow):
         for output in self.outputs:
             output.graphics_scene_item.hide()
 
+            if output is not self.current_output:
+                output.release_graphic_item()
+
         self.current_output.graphics_scene_item.show()
         self.graphics_scene.setSceneRect(QRectF(self.current_output.graphics_scene_item.pixmap().rect()))
         self.timeline.update_notches()
@@ -644,6 +723,8 @@ class MainWindow(AbstractMainWindow):
                 with open(icc_path, 'rb') as icc:
                     self.display_profile = QColorSpace.fromIccProfile(icc.read())
 
+                self.rendered_frames.clear()
+
         if hasattr(self, 'current_output') and self.current_output is not None and self.display_profile is not None:
             self.switch_frame(self.current_output.last_showed_frame)
 
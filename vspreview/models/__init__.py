@@ -1,3 +1,5 @@
+from .benchmark_records import BenchmarkRecords  # noqa: F401
+from .filter_timings import FilterTimings  # noqa: F401
 from .generalmodel import GeneralModel  # noqa: F401
 from .outputs import AudioOutputs, Outputs, VideoOutputs  # noqa: F401
 from .picture_types import PictureTypes  # noqa: F401
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+if TYPE_CHECKING:
+    from ..toolbars.benchmark.history import BenchmarkRecord
+
+
+class BenchmarkRecords(QAbstractTableModel):
+    __slots__ = ('items', 'baseline_index')
+
+    TIMESTAMP_COLUMN = 0
+    OUTPUT_COLUMN = 1
+    FRAMES_COLUMN = 2
+    PATTERN_COLUMN = 3
+    REQUESTS_COLUMN = 4
+    THREADS_COLUMN = 5
+    FPS_COLUMN = 6
+    P50_COLUMN = 7
+    P95_COLUMN = 8
+    P99_COLUMN = 9
+    COLUMN_COUNT = 10
+
+    def __init__(self, items: list[BenchmarkRecord] | None = None) -> None:
+        super().__init__()
+
+        self.items = items if items is not None else []
+        self.baseline_index: int | None = None
+
+    def set_items(self, items: list[BenchmarkRecord], baseline_index: int | None = None) -> None:
+        self.beginResetModel()
+        self.items = items
+        self.baseline_index = baseline_index
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return len(self.items)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return self.COLUMN_COUNT
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+
+        if orientation == Qt.Orientation.Horizontal:
+            if section == self.TIMESTAMP_COLUMN:
+                return 'Date'
+            if section == self.OUTPUT_COLUMN:
+                return 'Output'
+            if section == self.FRAMES_COLUMN:
+                return 'Frames'
+            if section == self.PATTERN_COLUMN:
+                return 'Pattern'
+            if section == self.REQUESTS_COLUMN:
+                return 'Requests'
+            if section == self.THREADS_COLUMN:
+                return 'Threads'
+            if section == self.FPS_COLUMN:
+                return 'FPS'
+            if section == self.P50_COLUMN:
+                return 'p50 (ms)'
+            if section == self.P95_COLUMN:
+                return 'p95 (ms)'
+            if section == self.P99_COLUMN:
+                return 'p99 (ms)'
+        if orientation == Qt.Orientation.Vertical:
+            return 'Baseline' if section == self.baseline_index else section + 1
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.UserRole) -> Any:
+        if not index.isValid() or index.row() >= len(self.items):
+            return None
+
+        record = self.items[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.TIMESTAMP_COLUMN:
+                return record.timestamp
+            if column == self.OUTPUT_COLUMN:
+                return f'{record.output} ({record.mode})'
+            if column == self.FRAMES_COLUMN:
+                return f'{record.start_frame}-{record.end_frame}'
+            if column == self.PATTERN_COLUMN:
+                return record.pattern
+            if column == self.REQUESTS_COLUMN:
+                return f'{record.requests}{"" if record.unsequenced else " (sequenced)"}'
+            if column == self.THREADS_COLUMN:
+                return str(record.threads)
+            if column == self.FPS_COLUMN:
+                return f'{record.fps:.2f}'
+            if column in (self.P50_COLUMN, self.P95_COLUMN, self.P99_COLUMN):
+                return f'{record.latency.get(self._latency_key(column), 0.0) * 1000:.2f}'
+
+        if role == Qt.ItemDataRole.TextAlignmentRole and column > self.PATTERN_COLUMN:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+
+        return None
+
+    def _latency_key(self, column: int) -> str:
+        return {self.P50_COLUMN: 'p50', self.P95_COLUMN: 'p95', self.P99_COLUMN: 'p99'}[column]
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+if TYPE_CHECKING:
+    from ..toolbars.benchmark.profiler import FilterTiming
+
+
+class FilterTimings(QAbstractTableModel):
+    __slots__ = ('items', )
+
+    NAME_COLUMN = 0
+    INSTANCES_COLUMN = 1
+    TOTAL_TIME_COLUMN = 2
+    MEAN_TIME_COLUMN = 3
+    SHARE_COLUMN = 4
+    COLUMN_COUNT = 5
+
+    def __init__(self, items: list[FilterTiming] | None = None) -> None:
+        super().__init__()
+
+        self.items = items if items is not None else []
+
+    def set_items(self, items: list[FilterTiming]) -> None:
+        self.beginResetModel()
+        self.items = items
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return len(self.items)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return self.COLUMN_COUNT
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+
+        if orientation == Qt.Orientation.Horizontal:
+            if section == self.NAME_COLUMN:
+                return 'Filter'
+            if section == self.INSTANCES_COLUMN:
+                return 'Instances'
+            if section == self.TOTAL_TIME_COLUMN:
+                return 'Total (ms)'
+            if section == self.MEAN_TIME_COLUMN:
+                return 'Mean per frame (ms)'
+            if section == self.SHARE_COLUMN:
+                return 'Share of wall time'
+        if orientation == Qt.Orientation.Vertical:
+            return section + 1
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.UserRole) -> Any:
+        if not index.isValid() or index.row() >= len(self.items):
+            return None
+
+        timing = self.items[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.NAME_COLUMN:
+                return timing.name
+            if column == self.INSTANCES_COLUMN:
+                return str(timing.instances)
+            if column == self.TOTAL_TIME_COLUMN:
+                return f'{timing.total_time * 1000:.2f}'
+            if column == self.MEAN_TIME_COLUMN:
+                return f'{timing.mean_time * 1000:.3f}'
+            if column == self.SHARE_COLUMN:
+                return f'{timing.share:.1%}'
+
+        # raw values, so the proxy model sorts numbers as numbers
+        if role == Qt.ItemDataRole.UserRole:
+            return timing[column]
+
+        if role == Qt.ItemDataRole.TextAlignmentRole and column != self.NAME_COLUMN:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+
+        return None
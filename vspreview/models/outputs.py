@@ -5,7 +5,10 @@ from typing import Any, Generic, Iterator, Mapping, OrderedDict, TypeVar, cast
 from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
 from vstools import vs
 
-from ..core import AbstractMainWindow, AudioOutput, QYAMLObject, VideoOutput, VideoOutputNode, main_window, try_load
+from ..core import (
+    AbstractMainWindow, AudioOutput, QYAMLObject, VideoOutput, VideoOutputNode, get_frame_size, get_image_size,
+    main_window, try_load
+)
 
 T = TypeVar('T', VideoOutput, AudioOutput)
 
@@ -178,6 +181,26 @@ class VideoOutputs(Outputs[VideoOutput]):
 
         self.items = self._fft_spectr_items
 
+    def get_checkerboards_size(self) -> int:
+        return sum(
+            get_image_size(output.checkerboard) for output in {*self._items, *self._fft_spectr_items}
+            if hasattr(output, 'checkerboard')
+        )
+
+    def clear_checkerboards(self) -> None:
+        # they're generated again on the next render
+        for output in {*self._items, *self._fft_spectr_items}:
+            if output is not self.main.current_output and hasattr(output, 'checkerboard'):
+                del output.checkerboard
+
+    def get_fft_spectrum_size(self) -> int:
+        # at least one packed frame of each is kept alive by the core cache
+        return sum(get_frame_size(output.prepared.clip) for output in self._fft_spectr_items if output.prepared)
+
+    def clear_fft_spectrum(self) -> None:
+        if self.items is not self._fft_spectr_items:
+            self._fft_spectr_items = list[VideoOutput]()
+
 
 class AudioOutputs(Outputs[AudioOutput]):
     out_type = AudioOutput
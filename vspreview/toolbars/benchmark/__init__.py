@@ -1,2 +1,3 @@
+from .runner import *  # noqa: F401, F403
 from .settings import *  # noqa: F401, F403
 from .toolbar import *  # noqa: F401, F403
@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from PyQt6.QtCore import QSortFilterProxyModel, Qt
+from PyQt6.QtWidgets import QFileDialog, QHeaderView, QLabel, QScrollArea, QTableView
+
+from ...core import AbstractMainWindow, ExtendedDialog, ExtendedTableView, HBoxLayout, PushButton, VBoxLayout
+from ...models import BenchmarkRecords, FilterTimings
+from .history import BenchmarkHistory, BenchmarkRecord, compare_records
+from .plot import SweepChart
+from .profiler import FilterTiming, FilterProfiler
+from .runner import BenchmarkResult, SweepConfiguration
+
+
+class SweepDialog(ExtendedDialog):
+    __slots__ = ('main', 'summary_label', 'chart')
+
+    def __init__(self, main: AbstractMainWindow) -> None:
+        super().__init__(main)
+
+        self.main = main
+
+        self.setWindowTitle('Benchmark Sweep')
+        self.setup_ui()
+
+        self.set_qobject_names()
+
+    def setup_ui(self) -> None:
+        self.summary_label = QLabel()
+
+        self.chart = SweepChart()
+
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setWidget(self.chart)
+
+        VBoxLayout(self, [self.summary_label, scroll_area])
+
+    def set_results(self, results: list[tuple[SweepConfiguration, BenchmarkResult]]) -> None:
+        self.chart.set_bars([
+            (self.get_bar_label(str(configuration), result), result.fps) for configuration, result in results
+        ])
+
+        if not results:
+            self.summary_label.setText('No configuration completed.')
+            return
+
+        best_configuration, best_result = max(results, key=lambda item: item[1].fps)
+
+        summary = (
+            f'{len(results)} configurations, best: {best_configuration} at {best_result.fps:.2f} fps '
+            f'(p95 latency {best_result.latency_stats()["p95"] * 1000:.2f} ms)'
+        )
+
+        if any(result.warm_cache for _, result in results):
+            summary += '\nThis VapourSynth core can\'t clear its cache, the runs didn\'t start cold.'
+
+        self.summary_label.setText(summary)
+
+    @staticmethod
+    def get_bar_label(label: str, result: BenchmarkResult) -> str:
+        if result.warm_cache:
+            label += ', warm cache'
+
+        if memory := result.memory_stats():
+            return f'{label}, {memory["peak_rss"] / 2 ** 20:.0f} MB peak RSS'
+
+        return label
+
+
+class BreakdownDialog(ExtendedDialog):
+    __slots__ = ('main', 'summary_label', 'chart')
+
+    def __init__(self, main: AbstractMainWindow) -> None:
+        super().__init__(main)
+
+        self.main = main
+
+        self.setWindowTitle('Benchmark Breakdown')
+        self.setup_ui()
+
+        self.set_qobject_names()
+
+    def setup_ui(self) -> None:
+        self.summary_label = QLabel()
+        self.summary_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+
+        self.chart = SweepChart()
+
+        VBoxLayout(self, [self.summary_label, self.chart])
+
+    def set_results(self, results: list[tuple[str, BenchmarkResult]]) -> None:
+        self.chart.set_bars([(name, result.fps) for name, result in results])
+
+        if not results:
+            self.summary_label.setText('No stage completed.')
+            return
+
+        lines = [
+            f'{name}: {result.fps:.2f} fps, {result.frame_time * 1000:.3f} ms per frame'
+            for name, result in results
+        ]
+
+        if any(result.warm_cache for _, result in results):
+            lines.append('This VapourSynth core can\'t clear its cache, the stages didn\'t start cold.')
+
+        stages = dict(results)
+
+        if (script := stages.get('Script')) and (pipeline := stages.get('Preview pipeline')):
+            overhead = pipeline.frame_time - script.frame_time
+
+            lines.append(
+                f'Preview conversion overhead: {overhead * 1000:.3f} ms per frame '
+                f'({overhead / (pipeline.frame_time or 1):.1%} of the preview pipeline time)'
+            )
+
+            if pipeline.convert_time:
+                lines.append(
+                    f'Frame to QImage (Python side): {pipeline.convert_frame_time * 1000:.3f} ms per frame, '
+                    'not included above'
+                )
+
+        self.summary_label.setText('\n'.join(lines))
+
+
+class OutputsComparisonDialog(ExtendedDialog):
+    __slots__ = ('main', 'summary_label', 'model', 'tableview', 'chart')
+
+    def __init__(self, main: AbstractMainWindow) -> None:
+        super().__init__(main)
+
+        self.main = main
+
+        self.setWindowTitle('Benchmark Outputs Comparison')
+        self.setup_ui()
+
+        self.set_qobject_names()
+
+    def setup_ui(self) -> None:
+        self.summary_label = QLabel()
+
+        self.model = BenchmarkRecords()
+
+        self.tableview = ExtendedTableView()
+        self.tableview.setModel(self.model)
+        self.tableview.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.tableview.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+
+        self.chart = SweepChart()
+
+        VBoxLayout(self, [self.summary_label, self.tableview, self.chart])
+
+        self.resize(900, 480)
+
+    def set_results(self, results: list[tuple[BenchmarkRecord, str]]) -> None:
+        self.model.set_items([record for record, _ in results])
+        self.chart.set_bars([(name, record.fps) for record, name in results])
+
+        if not results:
+            self.summary_label.setText('No output completed.')
+            return
+
+        best_record, best_name = max(results, key=lambda item: item[0].fps)
+
+        self.summary_label.setText(
+            f'{len(results)} outputs, fastest: {best_name} at {best_record.fps:.2f} fps '
+            f'(p95 latency {best_record.latency.get("p95", 0.0) * 1000:.2f} ms)'
+        )
+
+
+class FilterProfileDialog(ExtendedDialog):
+    __slots__ = ('main', 'summary_label', 'model', 'proxy_model', 'tableview', 'export_button')
+
+    def __init__(self, main: AbstractMainWindow) -> None:
+        super().__init__(main)
+
+        self.main = main
+
+        self.setWindowTitle('Benchmark Filter Profile')
+        self.setup_ui()
+
+        self.set_qobject_names()
+
+    def setup_ui(self) -> None:
+        self.summary_label = QLabel()
+
+        self.model = FilterTimings()
+
+        self.proxy_model = QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.model)
+        self.proxy_model.setSortRole(Qt.ItemDataRole.UserRole)
+
+        self.tableview = ExtendedTableView()
+        self.tableview.setModel(self.proxy_model)
+        self.tableview.setSortingEnabled(True)
+        self.tableview.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.tableview.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+
+        self.export_button = PushButton('Export CSV', clicked=self.on_export_clicked)
+        self.export_button.setAutoDefault(False)
+
+        VBoxLayout(self, [self.summary_label, self.tableview]).addLayout(
+            HBoxLayout([self.export_button], alignment=Qt.AlignmentFlag.AlignRight)
+        )
+
+        self.resize(720, 480)
+
+    def set_timings(self, timings: list[FilterTiming], frames: int, wall_time: float) -> None:
+        self.model.set_items(timings)
+        self.tableview.sortByColumn(FilterTimings.TOTAL_TIME_COLUMN, Qt.SortOrder.DescendingOrder)
+
+        self.summary_label.setText(
+            f'{len(timings)} filters over {frames} frames in {wall_time:.3f} s. '
+            'Times are summed over all threads, so shares can add up to more than 100%.'
+        )
+
+    def on_export_clicked(self, checked: bool | None = None) -> None:
+        save_path_str, _ = QFileDialog.getSaveFileName(
+            self, 'Export filter profile', str(self.main.script_path.with_suffix('.profile.csv')), 'CSV (*.csv)'
+        )
+
+        if save_path_str:
+            FilterProfiler.write_csv(Path(save_path_str), self.model.items)
+
+
+class BenchmarkHistoryDialog(ExtendedDialog):
+    __slots__ = (
+        'main', 'history', 'threshold', 'summary_label', 'model', 'tableview',
+        'set_baseline_button', 'clear_baseline_button'
+    )
+
+    def __init__(self, main: AbstractMainWindow) -> None:
+        super().__init__(main)
+
+        self.main = main
+        self.history: BenchmarkHistory | None = None
+        self.threshold = 0.0
+
+        self.setWindowTitle('Benchmark History')
+        self.setup_ui()
+
+        self.set_qobject_names()
+
+    def setup_ui(self) -> None:
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+
+        self.model = BenchmarkRecords()
+
+        self.tableview = ExtendedTableView()
+        self.tableview.setModel(self.model)
+        self.tableview.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.tableview.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+        self.tableview.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+
+        self.set_baseline_button = PushButton(
+            'Set as baseline', clicked=self.on_set_baseline_clicked,
+            tooltip='Compare the next runs against the selected one'
+        )
+        self.set_baseline_button.setAutoDefault(False)
+
+        self.clear_baseline_button = PushButton(
+            'Clear baseline', clicked=self.on_clear_baseline_clicked,
+            tooltip='Compare every run against the previous one with the same settings'
+        )
+        self.clear_baseline_button.setAutoDefault(False)
+
+        VBoxLayout(self, [self.summary_label, self.tableview]).addLayout(
+            HBoxLayout([self.set_baseline_button, self.clear_baseline_button], alignment=Qt.AlignmentFlag.AlignRight)
+        )
+
+        self.resize(900, 480)
+
+    def set_history(self, history: BenchmarkHistory, threshold: float) -> None:
+        self.history = history
+        self.threshold = threshold
+
+        self.update_history()
+
+    def update_history(self) -> None:
+        if self.history is None:
+            return
+
+        self.model.set_items(self.history.records, self.history.baseline_index)
+
+        if self.history.records:
+            self.tableview.scrollToBottom()
+
+        self.summary_label.setText(self.get_summary())
+
+    def get_summary(self) -> str:
+        assert self.history
+
+        if not self.history.records:
+            return f'No benchmark recorded yet in {self.history.path}.'
+
+        latest = self.history.records[-1]
+
+        if (baseline := self.history.get_baseline_for(latest)) is None:
+            return f'Latest: {latest}. No baseline to compare it to.'
+
+        summary = f'Latest: {latest}.\nBaseline: {baseline}.'
+
+        if self.history.baseline is not None and baseline is not self.history.baseline:
+            summary += '\nThe baseline ran with different settings, the previous comparable run is used instead.'
+
+        if regressions := compare_records(latest, baseline, self.threshold):
+            return summary + f'\nRegressions above {self.threshold:.0%}: ' + ', '.join(map(str, regressions))
+
+        return summary + f'\nNo regression above {self.threshold:.0%}.'
+
+    def on_set_baseline_clicked(self, checked: bool | None = None) -> None:
+        if self.history is None or not (selection := self.tableview.selectionModel().selectedRows()):
+            return
+
+        self.history.set_baseline(selection[0].row())
+        self.update_history()
+
+    def on_clear_baseline_clicked(self, checked: bool | None = None) -> None:
+        if self.history is None:
+            return
+
+        self.history.set_baseline(None)
+        self.update_history()
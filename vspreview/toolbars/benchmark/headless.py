@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import logging
+import sys
+from pathlib import Path
+from random import random
+
+from vsengine import vpy  # type: ignore[import]
+from vstools import vs
+
+from .runner import AccessPattern, BenchmarkResult, BenchmarkRunner
+
+
+def load_script_outputs(script_path: Path, external_args: list[tuple[str, str]] | None = None) -> vpy.Script:
+    # same as MainWindow.load_script, minus everything that needs a window
+    sys.path.append(str(script_path.parent))
+
+    argv_orig = sys.argv
+    sys.argv = [script_path.name]
+
+    try:
+        env = vpy.variables(
+            dict(external_args or []), environment=vs.get_current_environment(), module_name='__vspreview__'
+        ).result()
+        env.module.__dict__['_monkey_runpy'] = random()
+
+        return vpy.script(script_path, environment=env).result()
+    finally:
+        sys.argv = argv_orig
+        sys.path.pop()
+
+
+def get_output_clip(index: int) -> vs.VideoNode:
+    outputs = vs.get_outputs()
+
+    if index not in outputs:
+        raise KeyError(f'Output {index} is not set, available outputs: {", ".join(map(str, sorted(outputs)))}')
+
+    output = outputs[index]
+
+    if isinstance(output, vs.VideoOutputTuple):
+        return output.clip
+
+    if not isinstance(output, vs.VideoNode):
+        raise TypeError(f'Output {index} is not a video output!')
+
+    return output
+
+
+def run_headless_benchmark(
+    script_path: Path, external_args: list[tuple[str, str]] | None = None, output: int = 0,
+    start: int = 0, end: int | None = None, requests: int = 1, unsequenced: bool = False,
+    pattern: str = 'sequential', stride: int = 1, seed: int | None = None, sample_interval: float = 0.0
+) -> BenchmarkResult:
+    load_script_outputs(script_path, external_args)
+
+    clip = get_output_clip(output)
+
+    end = clip.num_frames - 1 if end is None else min(end, clip.num_frames - 1)
+
+    if not 0 <= start <= end:
+        raise ValueError(f'Invalid frame range {start}-{end} for a clip of {clip.num_frames} frames!')
+
+    access_pattern = AccessPattern[pattern.upper()]
+
+    logging.info(f'Benchmark: output {output}, frames {start}-{end}, {requests} requests, {pattern} access')
+
+    return BenchmarkRunner(
+        clip, start, end, requests, unsequenced, access_pattern,
+        access_pattern.get_frames(start, end, stride, seed), sample_interval=sample_interval
+    ).run()
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from vstools import vs
+
+from .runner import BenchmarkResult
+
+
+@dataclass
+class BenchmarkRecord:
+    # the preview benchmarks the prepared output, with its conversion, the command line only the script's
+    PREVIEW = 'preview'
+    SCRIPT = 'script'
+
+    timestamp: str
+    script_path: str
+    script_mtime: float
+    script_hash: str
+    output: int
+    start_frame: int
+    end_frame: int
+    total_frames: int
+    pattern: str
+    requests: int
+    unsequenced: bool
+    threads: int
+    cache_size: int  # MB
+    frames_done: int
+    wall_time: float
+    fps: float
+    latency: dict[str, float] = field(default_factory=dict)
+    mode: str = PREVIEW
+
+    @classmethod
+    def from_result(
+        cls, result: BenchmarkResult, script_path: Path, output: int, mode: str = PREVIEW
+    ) -> BenchmarkRecord:
+        try:
+            script_mtime = script_path.stat().st_mtime
+            script_hash = hashlib.sha1(script_path.read_bytes()).hexdigest()
+        except OSError:
+            script_mtime, script_hash = 0.0, ''
+
+        core = vs.core
+
+        return cls(
+            datetime.now().isoformat(timespec='seconds'), str(script_path), script_mtime, script_hash, output,
+            result.start_frame, result.end_frame, result.total_frames, result.pattern.value, result.requests,
+            result.unsequenced, core.num_threads, core.max_cache_size, result.frames_done, result.wall_time,
+            result.fps, result.latency_stats(), mode
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> BenchmarkRecord:
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
+
+    @property
+    def settings_key(self) -> tuple[Any, ...]:
+        return (
+            self.mode, self.output, self.start_frame, self.end_frame, self.pattern,
+            self.requests, self.unsequenced, self.threads, self.cache_size
+        )
+
+    def __str__(self) -> str:
+        return (
+            f'{self.timestamp}: output {self.output} ({self.mode}), frames {self.start_frame}-{self.end_frame}, '
+            f'{self.fps:.2f} fps'
+        )
+
+
+class Regression(NamedTuple):
+    metric: str
+    baseline: float
+    latest: float
+    change: float  # relative, positive is worse
+
+    def __str__(self) -> str:
+        if self.metric == 'fps':
+            return f'fps {self.baseline:.2f} -> {self.latest:.2f} ({-self.change:+.1%})'
+
+        return f'{self.metric} {self.baseline * 1000:.2f} -> {self.latest * 1000:.2f} ms ({self.change:+.1%})'
+
+
+def compare_records(latest: BenchmarkRecord, baseline: BenchmarkRecord, threshold: float) -> list[Regression]:
+    regressions = list[Regression]()
+
+    if baseline.fps and (change := 1 - latest.fps / baseline.fps) > threshold:
+        regressions.append(Regression('fps', baseline.fps, latest.fps, change))
+
+    for metric in ('p50', 'p95', 'p99'):
+        before, after = baseline.latency.get(metric, 0.0), latest.latency.get(metric, 0.0)
+
+        if before and (change := after / before - 1) > threshold:
+            regressions.append(Regression(f'{metric} latency', before, after, change))
+
+    return regressions
+
+
+class BenchmarkHistory:
+    MAX_RECORDS = 1000
+
+    __slots__ = ('path', 'records', 'baseline_index')
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.records = list[BenchmarkRecord]()
+        self.baseline_index: int | None = None
+
+        self.load()
+
+    @classmethod
+    def for_script(cls, config_dir: Path, script_path: Path) -> BenchmarkHistory:
+        return cls(config_dir / f'{script_path.stem}.benchmark.json')
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+
+            self.records = [BenchmarkRecord.from_dict(record) for record in data.get('records', [])]
+            self.baseline_index = data.get('baseline')
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logging.warning(f'Benchmark history: could not read {self.path}: {e}')
+            self.records, self.baseline_index = [], None
+
+        if self.baseline_index is not None and not 0 <= self.baseline_index < len(self.records):
+            self.baseline_index = None
+
+    def save(self) -> None:
+        self.path.parent.mkdir(0o777, True, True)
+
+        with open(self.path, 'w', encoding='utf-8') as file:
+            json.dump({
+                'baseline': self.baseline_index,
+                'records': [asdict(record) for record in self.records]
+            }, file, indent=4)
+
+    def append(self, record: BenchmarkRecord) -> None:
+        self.records.append(record)
+
+        if (overflow := len(self.records) - self.MAX_RECORDS) > 0:
+            del self.records[:overflow]
+
+            if self.baseline_index is not None:
+                self.baseline_index = self.baseline_index - overflow if self.baseline_index >= overflow else None
+
+        self.save()
+
+    @property
+    def baseline(self) -> BenchmarkRecord | None:
+        if self.baseline_index is None:
+            return None
+
+        return self.records[self.baseline_index]
+
+    def set_baseline(self, index: int | None) -> None:
+        self.baseline_index = index
+        self.save()
+
+    def get_baseline_for(self, record: BenchmarkRecord) -> BenchmarkRecord | None:
+        # runs with other settings, modes or outputs can't be compared, not even to the explicit baseline
+        if (baseline := self.baseline) is not None and baseline is not record:
+            if baseline.settings_key == record.settings_key:
+                return baseline
+
+        # otherwise, the previous run with the same settings
+        for previous in reversed(self.records):
+            if previous is not record and previous.settings_key == record.settings_key:
+                return previous
+
+        return None
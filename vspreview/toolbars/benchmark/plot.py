@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Sequence
+
+from PyQt6.QtCore import QPointF, QRectF, Qt
+from PyQt6.QtGui import QPainter, QPaintEvent, QPalette, QPen, QPolygonF
+from PyQt6.QtWidgets import QWidget
+
+if TYPE_CHECKING:
+    from .runner import MemorySample
+
+
+class LatencyPlot(QWidget):
+    __slots__ = ('_points', '_marker')
+
+    def __init__(self, parent: QWidget) -> None:
+        super().__init__(parent)
+
+        self._points = list[tuple[int, float]]()
+        self._marker: float | None = None
+
+        self.setMinimumSize(240, 48)
+
+    def set_points(self, points: Sequence[tuple[int, float]], marker: float | None = None) -> None:
+        self._points = list(points)
+        self._marker = marker
+
+        self.setToolTip(
+            f'Latency of frames {min(n for n, _ in points)}-{max(n for n, _ in points)}' if points else ''
+        )
+
+        self.update()
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        super().paintEvent(event)
+
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().color(QPalette.ColorRole.Base))
+
+        width, height = self.width(), self.height()
+
+        if not self._points or width < 2 or height < 2:
+            painter.end()
+            return
+
+        first = min(n for n, _ in self._points)
+        span = max(max(n for n, _ in self._points) - first, 1)
+        max_latency = max(latency for _, latency in self._points) or 1.0
+
+        # one column per pixel, keeping the worst latency of the frames falling in it
+        columns = [0.0] * width
+
+        for n, latency in self._points:
+            column = (n - first) * (width - 1) // span
+            columns[column] = max(columns[column], latency)
+
+        painter.setPen(QPen(self.palette().color(QPalette.ColorRole.Highlight)))
+
+        for x, latency in enumerate(columns):
+            if latency:
+                painter.drawLine(QPointF(x, height), QPointF(x, height - latency / max_latency * (height - 1)))
+
+        if self._marker is not None:
+            painter.setPen(QPen(self.palette().color(QPalette.ColorRole.Text), 1, Qt.PenStyle.DashLine))
+
+            y = height - self._marker / max_latency * (height - 1)
+            painter.drawLine(QPointF(0, y), QPointF(width, y))
+
+        painter.end()
+
+
+class MemoryPlot(QWidget):
+    __slots__ = ('_samples', )
+
+    def __init__(self, parent: QWidget) -> None:
+        super().__init__(parent)
+
+        self._samples = list[MemorySample]()
+
+        self.setMinimumSize(160, 48)
+
+    def set_samples(self, samples: Sequence[MemorySample]) -> None:
+        self._samples = list(samples)
+
+        if self._samples:
+            last = self._samples[-1]
+
+            self.setToolTip(
+                f'Process RSS (solid) and VS cache (dashed) over {last.time:.1f} s\n'
+                f'Last: RSS {last.rss / 2 ** 20:.0f} MB, VS cache {last.cache_size / 2 ** 20:.0f} MB, '
+                f'{last.in_flight} frames in flight'
+            )
+        else:
+            self.setToolTip('')
+
+        self.update()
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        super().paintEvent(event)
+
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().color(QPalette.ColorRole.Base))
+
+        width, height = self.width(), self.height()
+
+        if len(self._samples) < 2 or width < 2 or height < 2:
+            painter.end()
+            return
+
+        duration = self._samples[-1].time or 1.0
+        max_memory = max(max(sample.rss, sample.cache_size) for sample in self._samples) or 1
+
+        def _line(values: list[tuple[float, int]], pen: QPen) -> None:
+            painter.setPen(pen)
+            painter.drawPolyline(QPolygonF([
+                QPointF(time / duration * (width - 1), height - 1 - value / max_memory * (height - 1))
+                for time, value in values
+            ]))
+
+        _line(
+            [(sample.time, sample.rss) for sample in self._samples],
+            QPen(self.palette().color(QPalette.ColorRole.Highlight))
+        )
+        _line(
+            [(sample.time, sample.cache_size) for sample in self._samples],
+            QPen(self.palette().color(QPalette.ColorRole.Text), 1, Qt.PenStyle.DashLine)
+        )
+
+        painter.end()
+
+
+class SweepChart(QWidget):
+    ROW_HEIGHT = 20  # px
+
+    __slots__ = ('_bars', )
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+
+        self._bars = list[tuple[str, float]]()
+
+        self.setMinimumWidth(480)
+
+    def set_bars(self, bars: Sequence[tuple[str, float]]) -> None:
+        self._bars = list(bars)
+
+        self.setMinimumHeight(max(len(self._bars), 1) * self.ROW_HEIGHT)
+        self.update()
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        super().paintEvent(event)
+
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().color(QPalette.ColorRole.Base))
+
+        if not self._bars:
+            painter.end()
+            return
+
+        metrics = painter.fontMetrics()
+        label_width = max(metrics.horizontalAdvance(label) for label, _ in self._bars) + 8
+        value_width = metrics.horizontalAdvance('0000.00 fps') + 8
+        bar_space = max(self.width() - label_width - value_width, 1)
+
+        best = max(value for _, value in self._bars) or 1.0
+
+        text_color = self.palette().color(QPalette.ColorRole.Text)
+        bar_color = self.palette().color(QPalette.ColorRole.Highlight)
+
+        for i, (label, value) in enumerate(self._bars):
+            top = i * self.ROW_HEIGHT
+            bar_width = round(value / best * bar_space)
+
+            painter.setPen(text_color)
+            painter.drawText(
+                QRectF(0, top, label_width - 8, self.ROW_HEIGHT),
+                Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, label
+            )
+
+            painter.fillRect(
+                QRectF(label_width, top + 3, bar_width, self.ROW_HEIGHT - 6),
+                bar_color if value < best else bar_color.darker(130)
+            )
+
+            painter.drawText(
+                QRectF(label_width + bar_width + 4, top, value_width, self.ROW_HEIGHT),
+                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, f'{value:.2f} fps'
+            )
+
+        painter.end()
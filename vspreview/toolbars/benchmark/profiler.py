@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from vstools import vs
+
+
+class FilterTiming(NamedTuple):
+    name: str
+    instances: int
+    total_time: float  # s
+    mean_time: float  # s per benchmarked frame
+    share: float  # of the wall time, can be over 1 with multiple threads
+
+
+def is_node_timing_supported() -> bool:
+    return hasattr(vs.core, 'node_timing') and hasattr(vs.RawNode, '_timings')
+
+
+def _node_key(node: vs.RawNode) -> Any:
+    try:
+        return hash(node)
+    except TypeError:
+        return id(node)
+
+
+def get_node_dependencies(node: vs.RawNode) -> list[vs.RawNode]:
+    try:
+        dependencies = [dep for dep in getattr(node, '_dependencies', None) or [] if isinstance(dep, vs.RawNode)]
+    except Exception:
+        dependencies = []
+
+    if dependencies:
+        return dependencies
+
+    # needs graph inspection to have been enabled before the script was evaluated
+    try:
+        inputs = node._inputs
+    except Exception:
+        return []
+
+    for value in inputs.values():
+        for item in (value if isinstance(value, (list, tuple)) else [value]):
+            if isinstance(item, vs.RawNode):
+                dependencies.append(item)
+
+    return dependencies
+
+
+def walk_graph(node: vs.RawNode) -> list[vs.RawNode]:
+    nodes = dict[Any, vs.RawNode]()
+    stack = [node]
+
+    while stack:
+        current = stack.pop()
+
+        if (key := _node_key(current)) in nodes:
+            continue
+
+        nodes[key] = current
+        stack.extend(get_node_dependencies(current))
+
+    return list(nodes.values())
+
+
+def get_filter_name(node: vs.RawNode) -> str:
+    for attr in ('_name', '_node_name'):
+        try:
+            if name := getattr(node, attr):
+                return str(name)
+        except Exception:
+            pass
+
+    return node.__class__.__name__
+
+
+class FilterProfiler:
+    __slots__ = ('nodes', '_start_timings', '_node_timing')
+
+    def __init__(self, clip: vs.RawNode) -> None:
+        self.nodes = walk_graph(clip)
+
+        self._start_timings = list[int]()
+        self._node_timing = False
+
+    def start(self) -> None:
+        self._node_timing = vs.core.node_timing
+        vs.core.node_timing = True
+
+        # timings are cumulative, a snapshot is taken instead of clearing them for the whole core
+        self._start_timings = [node._timings for node in self.nodes]
+
+    def stop(self, frames: int, wall_time: float) -> list[FilterTiming]:
+        totals = dict[str, tuple[int, int]]()
+
+        for node, start in zip(self.nodes, self._start_timings):
+            name = get_filter_name(node)
+            instances, total = totals.get(name, (0, 0))
+            totals[name] = (instances + 1, total + max(node._timings - start, 0))
+
+        vs.core.node_timing = self._node_timing
+
+        return sorted((
+            FilterTiming(
+                name, instances, total / 1e9, total / 1e9 / max(frames, 1), total / 1e9 / wall_time if wall_time else 0
+            ) for name, (instances, total) in totals.items()
+        ), key=lambda timing: timing.total_time, reverse=True)
+
+    @staticmethod
+    def write_csv(path: Path, timings: list[FilterTiming]) -> None:
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['filter', 'instances', 'total_ms', 'mean_ms_per_frame', 'share_of_wall'])
+            writer.writerows(
+                (
+                    timing.name, timing.instances, f'{timing.total_time * 1000:.3f}',
+                    f'{timing.mean_time * 1000:.3f}', f'{timing.share:.4f}'
+                ) for timing in timings
+            )
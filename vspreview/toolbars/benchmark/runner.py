@@ -0,0 +1,524 @@
+from __future__ import annotations
+
+import csv
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import partial
+from itertools import product
+from math import ceil
+from pathlib import Path
+from random import Random
+from statistics import median
+from threading import Event, Lock, Semaphore, Thread
+from time import perf_counter
+from typing import Any, Callable, Iterable, NamedTuple, Sequence
+
+from vstools import vs
+
+from ...core.memory import get_process_memory
+
+
+class AccessPattern(str, Enum):
+    SEQUENTIAL = 'Sequential'
+    RANDOM = 'Random'
+    STRIDED = 'Strided'
+    REVERSE = 'Reverse'
+    SCENES = 'Scene boundaries'
+
+    def get_frames(
+        self, start_frame: int, end_frame: int, stride: int = 1, seed: int | None = None,
+        scene_frames: Iterable[int] = ()
+    ) -> list[int]:
+        frames = range(start_frame, end_frame + 1)
+
+        if self is AccessPattern.RANDOM:
+            # every frame once, in a uniformly random order
+            return Random(seed).sample(frames, len(frames))
+
+        if self is AccessPattern.STRIDED:
+            stride = max(stride, 1)
+            return [n for offset in range(min(stride, len(frames))) for n in frames[offset::stride]]
+
+        if self is AccessPattern.REVERSE:
+            return list(reversed(frames))
+
+        if self is AccessPattern.SCENES:
+            return [n for n in scene_frames if start_frame <= n <= end_frame]
+
+        return list(frames)
+
+
+class MemorySample(NamedTuple):
+    time: float  # s since the start of the run
+    rss: int  # bytes
+    cache_size: int  # bytes
+    in_flight: int
+
+
+@dataclass
+class BenchmarkResult:
+    start_frame: int
+    end_frame: int
+    requests: int
+    unsequenced: bool
+    pattern: AccessPattern = AccessPattern.SEQUENTIAL
+    requested_frames: int = 0
+    frames_done: int = 0
+    wall_time: float = 0.0
+    aborted: bool = False
+    error: str | None = None
+    # seconds spent converting the frames outside of VapourSynth, summed over all threads
+    convert_time: float = 0.0
+    # the core couldn't clear its cache beforehand, so it's not a cold run
+    warm_cache: bool = False
+    # seconds from request to completion, in the order frames completed
+    latencies: list[tuple[int, float]] = field(default_factory=list)
+    memory_samples: list[MemorySample] = field(default_factory=list)
+
+    @property
+    def total_frames(self) -> int:
+        return self.requested_frames or (self.end_frame - self.start_frame + 1)
+
+    @property
+    def fps(self) -> float:
+        return self.frames_done / self.wall_time if self.wall_time else 0.0
+
+    @property
+    def frame_time(self) -> float:
+        return self.wall_time / self.frames_done if self.frames_done else 0.0
+
+    @property
+    def convert_frame_time(self) -> float:
+        return self.convert_time / self.frames_done if self.frames_done else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'start_frame': self.start_frame,
+            'end_frame': self.end_frame,
+            'total_frames': self.total_frames,
+            'requests': self.requests,
+            'unsequenced': self.unsequenced,
+            'pattern': self.pattern.value,
+            'frames_done': self.frames_done,
+            'aborted': self.aborted,
+            'error': self.error,
+            'wall_time': self.wall_time,
+            'fps': self.fps,
+            'convert_time': self.convert_time,
+            'warm_cache': self.warm_cache,
+            'latency': self.latency_stats(),
+            'memory': self.memory_stats(),
+            'memory_samples': [sample._asdict() for sample in self.memory_samples],
+            'latencies': {str(n): latency for n, latency in sorted(self.latencies)}
+        }
+
+    def latency_percentile(self, percentile: float, latencies: list[float] | None = None) -> float:
+        if latencies is None:
+            latencies = sorted(latency for _, latency in self.latencies)
+
+        if not latencies:
+            return 0.0
+
+        # nearest-rank, so it's always a latency that was actually measured
+        return latencies[min(max(ceil(percentile / 100 * len(latencies)) - 1, 0), len(latencies) - 1)]
+
+    def latency_stats(self) -> dict[str, float]:
+        latencies = sorted(latency for _, latency in self.latencies)
+
+        return {
+            'p50': self.latency_percentile(50, latencies),
+            'p95': self.latency_percentile(95, latencies),
+            'p99': self.latency_percentile(99, latencies),
+            'max': latencies[-1] if latencies else 0.0
+        }
+
+    def merge(self, other: BenchmarkResult) -> None:
+        self.memory_samples.extend(
+            sample._replace(time=sample.time + self.wall_time) for sample in other.memory_samples
+        )
+
+        self.requested_frames = self.total_frames + other.total_frames
+        self.frames_done += other.frames_done
+        self.wall_time += other.wall_time
+        self.convert_time += other.convert_time
+        self.latencies.extend(other.latencies)
+        self.aborted = self.aborted or other.aborted
+        self.warm_cache = self.warm_cache or other.warm_cache
+        self.error = self.error or other.error
+
+    def memory_stats(self) -> dict[str, float]:
+        if not (samples := self.memory_samples):
+            return {}
+
+        # steady state is the second half of the run, once the caches and requests have ramped up
+        steady = samples[len(samples) // 2:]
+
+        return {
+            'peak_rss': max(sample.rss for sample in samples),
+            'steady_rss': median(sample.rss for sample in steady),
+            'peak_cache_size': max(sample.cache_size for sample in samples),
+            'steady_cache_size': median(sample.cache_size for sample in steady),
+            'mean_in_flight': sum(sample.in_flight for sample in samples) / len(samples)
+        }
+
+    def slowest_frames(self, count: int) -> list[tuple[int, float]]:
+        return sorted(self.latencies, key=lambda item: item[1], reverse=True)[:count]
+
+    def write_csv(self, path: Path) -> None:
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['frame', 'latency_ms'])
+            writer.writerows((n, f'{latency * 1000:.3f}') for n, latency in sorted(self.latencies))
+
+
+class BenchmarkRunner:
+    __slots__ = (
+        'clip', 'frames', 'convert', 'sample_interval', 'result', 'run_start_time',
+        '_lock', '_requested', '_sampling_done'
+    )
+
+    def __init__(
+        self, clip: vs.VideoNode, start_frame: int, end_frame: int, requests: int, unsequenced: bool,
+        pattern: AccessPattern = AccessPattern.SEQUENTIAL, frames: Sequence[int] | None = None,
+        convert: Callable[[vs.VideoFrame], Any] | None = None, sample_interval: float = 0.0
+    ) -> None:
+        self.clip = clip
+        self.convert = convert
+        self.sample_interval = sample_interval
+        self.frames = list(range(start_frame, end_frame + 1)) if frames is None else list(frames)
+        self.result = BenchmarkResult(
+            start_frame, end_frame, max(requests, 1), unsequenced, pattern, len(self.frames)
+        )
+        self.run_start_time = 0.0
+
+        self._lock = Lock()
+        # only ever written by the thread calling run
+        self._requested = 0
+        self._sampling_done = Event()
+
+    @property
+    def frames_done(self) -> int:
+        # list.append is atomic, so the latencies double as a lock-free completion counter
+        return len(self.result.latencies)
+
+    @property
+    def in_flight(self) -> int:
+        return self._requested - len(self.result.latencies)
+
+    @property
+    def elapsed(self) -> float:
+        if not self.run_start_time:
+            return 0.0
+
+        return self.result.wall_time or (perf_counter() - self.run_start_time)
+
+    def run(self) -> BenchmarkResult:
+        self.run_start_time = perf_counter()
+
+        sampler = None
+
+        if self.sample_interval > 0:
+            sampler = Thread(target=self._sample_memory, name='vspreview-benchmark-memory', daemon=True)
+            sampler.start()
+
+        try:
+            if self.result.unsequenced:
+                self._run_unsequenced()
+            else:
+                self._run_sequenced()
+        except Exception as e:
+            self.result.error = str(e)
+            self.abort()
+
+        self.result.wall_time = perf_counter() - self.run_start_time
+        self.result.frames_done = len(self.result.latencies)
+
+        if sampler is not None:
+            self._sampling_done.set()
+            sampler.join()
+
+        return self.result
+
+    def abort(self) -> None:
+        if self.result.wall_time:
+            # the run is already over
+            return
+
+        # the request loops check it before every new request
+        self.result.aborted = True
+
+    def sample_memory(self) -> None:
+        self.result.memory_samples.append(MemorySample(
+            perf_counter() - self.run_start_time, get_process_memory(), vs.core.used_cache_size, self.in_flight
+        ))
+
+    def _sample_memory(self) -> None:
+        self.sample_memory()
+
+        while not self._sampling_done.wait(self.sample_interval):
+            self.sample_memory()
+
+        self.sample_memory()
+
+    def _frame_done(self, n: int, requested_at: float, frame: vs.VideoFrame) -> None:
+        latency = perf_counter() - requested_at
+
+        if self.convert is not None:
+            self.convert(frame)
+            convert_time = perf_counter() - requested_at - latency
+
+            with self._lock:
+                self.result.convert_time += convert_time
+
+        frame.close()
+
+        self.result.latencies.append((n, latency))
+
+    def _run_sequenced(self) -> None:
+        # the oldest request is waited on before the next one is made
+        result, get_frame_async = self.result, self.clip.get_frame_async
+        buffer = deque[tuple[int, float, Future[vs.VideoFrame]]]()
+
+        for n in self.frames:
+            if result.aborted:
+                break
+
+            if len(buffer) >= result.requests:
+                n_done, requested_at, future = buffer.popleft()
+                self._frame_done(n_done, requested_at, future.result())
+
+            self._requested += 1
+            buffer.append((n, perf_counter(), get_frame_async(n)))
+
+        while buffer:
+            n_done, requested_at, future = buffer.popleft()
+            self._frame_done(n_done, requested_at, future.result())
+
+    def _run_unsequenced(self) -> None:
+        # a new request is made as soon as any of the in-flight ones completes,
+        # callbacks only record the frame and free a slot, the requests are all made from this thread
+        result, get_frame_async = self.result, self.clip.get_frame_async
+        slots = Semaphore(result.requests)
+
+        def _on_done(n: int, requested_at: float, future: Future[vs.VideoFrame]) -> None:
+            try:
+                self._frame_done(n, requested_at, future.result())
+            except Exception as e:
+                result.error = str(e)
+                self.abort()
+            finally:
+                slots.release()
+
+        for n in self.frames:
+            slots.acquire()
+
+            if result.aborted:
+                slots.release()
+                break
+
+            self._requested += 1
+            requested_at = perf_counter()
+            get_frame_async(n).add_done_callback(partial(_on_done, n, requested_at))
+
+        # every slot back means every request completed
+        for _ in range(result.requests):
+            slots.acquire()
+
+
+class SweepConfiguration(NamedTuple):
+    threads: int
+    requests: int
+    cache_size: int  # MB
+
+    def __str__(self) -> str:
+        return f'{self.threads} threads, {self.requests} requests, {self.cache_size} MB cache'
+
+
+class BenchmarkSweep:
+    __slots__ = (
+        'clip', 'start_frame', 'end_frame', 'unsequenced', 'pattern', 'frames', 'configurations',
+        'results', 'current', 'current_configuration', 'clear_cache', 'sample_interval', '_aborted'
+    )
+
+    def __init__(
+        self, clip: vs.VideoNode, start_frame: int, end_frame: int, unsequenced: bool,
+        configurations: list[SweepConfiguration], clear_cache: Callable[[], bool],
+        pattern: AccessPattern = AccessPattern.SEQUENTIAL, frames: Sequence[int] | None = None,
+        sample_interval: float = 0.0
+    ) -> None:
+        self.clip = clip
+        self.pattern = pattern
+        self.sample_interval = sample_interval
+        self.frames = frames
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.unsequenced = unsequenced
+        self.configurations = configurations
+        self.clear_cache = clear_cache
+
+        self.results = list[tuple[SweepConfiguration, BenchmarkResult]]()
+        self.current: BenchmarkRunner | None = None
+        self.current_configuration: SweepConfiguration | None = None
+        self._aborted = False
+
+    @staticmethod
+    def make_grid(
+        threads: Iterable[int], requests: Iterable[int], cache_sizes: Iterable[int]
+    ) -> list[SweepConfiguration]:
+        return [
+            SweepConfiguration(*configuration)
+            for configuration in product(*(sorted(set(values)) for values in (threads, requests, cache_sizes)))
+        ]
+
+    def run(self) -> list[tuple[SweepConfiguration, BenchmarkResult]]:
+        core = vs.core
+        num_threads, max_cache_size = core.num_threads, core.max_cache_size
+
+        try:
+            for configuration in self.configurations:
+                if self._aborted:
+                    break
+
+                core.num_threads = configuration.threads
+                core.max_cache_size = configuration.cache_size
+
+                # every configuration starts from a cold cache, when the core can clear it
+                cleared = self.clear_cache()
+
+                self.current_configuration = configuration
+                self.current = BenchmarkRunner(
+                    self.clip, self.start_frame, self.end_frame, configuration.requests, self.unsequenced,
+                    self.pattern, self.frames, sample_interval=self.sample_interval
+                )
+
+                result = self.current.run()
+                result.warm_cache = not cleared
+
+                if not result.aborted or result.error:
+                    self.results.append((configuration, result))
+        finally:
+            core.num_threads, core.max_cache_size = num_threads, max_cache_size
+            self.clear_cache()
+
+        return self.results
+
+    def abort(self) -> None:
+        self._aborted = True
+
+        if self.current is not None:
+            self.current.abort()
+
+
+class BenchmarkStage(NamedTuple):
+    name: str
+    clip: vs.VideoNode
+    frames: Sequence[int] | None = None
+    convert: Callable[[vs.VideoFrame], Any] | None = None
+
+
+class BenchmarkStages:
+    __slots__ = (
+        'stages', 'start_frame', 'end_frame', 'requests', 'unsequenced', 'pattern',
+        'results', 'current', 'current_stage', 'clear_cache', 'sample_interval', 'interleave', '_aborted'
+    )
+
+    def __init__(
+        self, stages: list[BenchmarkStage], start_frame: int, end_frame: int, requests: int, unsequenced: bool,
+        clear_cache: Callable[[], bool], pattern: AccessPattern = AccessPattern.SEQUENTIAL,
+        sample_interval: float = 0.0, interleave: int = 0
+    ) -> None:
+        self.stages = stages
+        self.sample_interval = sample_interval
+        # frames per stage before switching to the next one, 0 runs every stage to completion in turn
+        self.interleave = interleave
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.requests = requests
+        self.unsequenced = unsequenced
+        self.pattern = pattern
+        self.clear_cache = clear_cache
+
+        self.results = list[tuple[str, BenchmarkResult]]()
+        self.current: BenchmarkRunner | None = None
+        self.current_stage: BenchmarkStage | None = None
+        self._aborted = False
+
+    def run(self) -> list[tuple[str, BenchmarkResult]]:
+        try:
+            if self.interleave > 0:
+                self._run_interleaved()
+            else:
+                self._run_in_turn()
+        finally:
+            self.clear_cache()
+
+        return self.results
+
+    def _run_stage(self, stage: BenchmarkStage, frames: Sequence[int] | None) -> BenchmarkResult:
+        # every stage starts from a cold cache, or the later ones would reuse the frames of shared upstream nodes
+        cleared = self.clear_cache()
+
+        self.current_stage = stage
+        self.current = BenchmarkRunner(
+            stage.clip, self.start_frame, self.end_frame, self.requests, self.unsequenced,
+            self.pattern, frames, stage.convert, self.sample_interval
+        )
+
+        result = self.current.run()
+        result.warm_cache = not cleared
+
+        return result
+
+    def _run_in_turn(self) -> None:
+        for stage in self.stages:
+            if self._aborted:
+                break
+
+            result = self._run_stage(stage, stage.frames)
+
+            if not result.aborted or result.error:
+                self.results.append((stage.name, result))
+
+    def _run_interleaved(self) -> None:
+        # chunks of every stage alternate, so a drift of the machine's load affects all of them alike
+        stages_frames = [
+            list(range(self.start_frame, self.end_frame + 1)) if stage.frames is None else list(stage.frames)
+            for stage in self.stages
+        ]
+
+        # every chunk pays the warm-up again, the price for not reusing what the previous stage cached
+        merged = dict[str, BenchmarkResult]()
+
+        try:
+            for offset in range(0, max(map(len, stages_frames), default=0), self.interleave):
+                for stage, frames in zip(self.stages, stages_frames):
+                    if self._aborted:
+                        return
+
+                    if not (chunk := frames[offset:offset + self.interleave]):
+                        continue
+
+                    result = self._run_stage(stage, chunk)
+
+                    if result.aborted and not result.error:
+                        return
+
+                    if stage.name in merged:
+                        merged[stage.name].merge(result)
+                    else:
+                        merged[stage.name] = result
+        finally:
+            if self._aborted:
+                # the chunks measured so far are still shown, but they're not a complete run
+                for result in merged.values():
+                    result.aborted = True
+
+            self.results.extend(merged.items())
+
+    def abort(self) -> None:
+        self._aborted = True
+
+        if self.current is not None:
+            self.current.abort()
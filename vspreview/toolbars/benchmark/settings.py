@@ -4,14 +4,19 @@ from typing import Any, Mapping
 
 from PyQt6.QtWidgets import QLabel
 
-from ...core import AbstractToolbarSettings, CheckBox, HBoxLayout, Time, try_load
+from ...core import AbstractToolbarSettings, CheckBox, HBoxLayout, LineEdit, SpinBox, Time, try_load
 from ...core.custom import TimeEdit
+from ...main.settings import MainSettings
 
 
 class BenchmarkSettings(AbstractToolbarSettings):
     __slots__ = (
         'clear_cache_checkbox',
         'refresh_interval_control', 'frame_data_sharing_fix_checkbox',
+        'slowest_frames_spinbox', 'sweep_threads_lineedit',
+        'sweep_requests_lineedit', 'sweep_cache_sizes_lineedit',
+        'history_checkbox', 'regression_threshold_spinbox',
+        'outputs_lineedit', 'outputs_interleave_spinbox'
     )
 
     def setup_ui(self) -> None:
@@ -23,6 +28,26 @@ class BenchmarkSettings(AbstractToolbarSettings):
 
         self.refresh_interval_control = TimeEdit(self)
 
+        self.slowest_frames_spinbox = SpinBox(self, 1, 10000)
+
+        self.history_checkbox = CheckBox('Record completed runs in the script benchmark history', self)
+
+        self.regression_threshold_spinbox = SpinBox(
+            self, 1, 100, '%', tooltip='Slowdown against the baseline reported as a regression'
+        )
+
+        self.outputs_lineedit = LineEdit(self, placeholderText='Indices or ranges, e.g. 0, 2-3, all outputs if empty')
+
+        self.outputs_interleave_spinbox = SpinBox(
+            self, 0, 1 << 20, ' frames', tooltip=(
+                'Alternate between the outputs every this many frames instead of benchmarking them one after another'
+            ), specialValueText='Disabled'
+        )
+
+        self.sweep_threads_lineedit = LineEdit(self, placeholderText='Comma separated, e.g. 1, 4, 8')
+        self.sweep_requests_lineedit = LineEdit(self, placeholderText='Comma separated, e.g. 1, 4, 8')
+        self.sweep_cache_sizes_lineedit = LineEdit(self, placeholderText='Comma separated MB, e.g. 1024, 4096')
+
         self.vlayout.addWidgets([
             self.clear_cache_checkbox,
             self.frame_data_sharing_fix_checkbox
@@ -33,11 +58,42 @@ class BenchmarkSettings(AbstractToolbarSettings):
                 self.refresh_interval_control
             ])
         )
+        self.vlayout.addLayout(
+            HBoxLayout([
+                QLabel('Slowest frames put in a scening list', self),
+                self.slowest_frames_spinbox
+            ])
+        )
+        self.vlayout.addWidget(self.history_checkbox)
+        self.vlayout.addLayout(
+            HBoxLayout([
+                QLabel('Regression threshold', self),
+                self.regression_threshold_spinbox
+            ])
+        )
+        self.vlayout.addLayout(HBoxLayout([QLabel('All outputs: outputs', self), self.outputs_lineedit]))
+        self.vlayout.addLayout(HBoxLayout([QLabel('All outputs: interleave', self), self.outputs_interleave_spinbox]))
+        self.vlayout.addLayout(HBoxLayout([QLabel('Sweep threads', self), self.sweep_threads_lineedit]))
+        self.vlayout.addLayout(HBoxLayout([QLabel('Sweep requests', self), self.sweep_requests_lineedit]))
+        self.vlayout.addLayout(HBoxLayout([QLabel('Sweep cache sizes', self), self.sweep_cache_sizes_lineedit]))
 
     def set_defaults(self) -> None:
         self.clear_cache_checkbox.setChecked(False)
         self.refresh_interval_control.setValue(Time(milliseconds=150))
         self.frame_data_sharing_fix_checkbox.setChecked(True)
+        self.slowest_frames_spinbox.setValue(10)
+        self.history_checkbox.setChecked(True)
+        self.regression_threshold_spinbox.setValue(5)
+
+        cpus_count = MainSettings.get_usable_cpus_count()
+        cpus_steps = ', '.join(map(str, sorted({*(2 ** i for i in range(cpus_count.bit_length())), cpus_count})))
+
+        self.sweep_threads_lineedit.setText(cpus_steps)
+        self.sweep_requests_lineedit.setText(cpus_steps)
+        self.sweep_cache_sizes_lineedit.setText('1024, 4096')
+
+        self.outputs_lineedit.setText('')
+        self.outputs_interleave_spinbox.setValue(0)
 
     @property
     def clear_cache_enabled(self) -> bool:
@@ -51,15 +107,80 @@ class BenchmarkSettings(AbstractToolbarSettings):
     def frame_data_sharing_fix_enabled(self) -> bool:
         return self.frame_data_sharing_fix_checkbox.isChecked()
 
+    @property
+    def slowest_frames_count(self) -> int:
+        return self.slowest_frames_spinbox.value()
+
+    @property
+    def history_enabled(self) -> bool:
+        return self.history_checkbox.isChecked()
+
+    @property
+    def regression_threshold(self) -> float:
+        return self.regression_threshold_spinbox.value() / 100
+
+    @property
+    def benchmarked_outputs(self) -> list[int]:
+        return self._parse_values(self.outputs_lineedit.text(), 0)
+
+    @property
+    def outputs_interleave(self) -> int:
+        return self.outputs_interleave_spinbox.value()
+
+    @property
+    def sweep_threads(self) -> list[int]:
+        return self._parse_values(self.sweep_threads_lineedit.text())
+
+    @property
+    def sweep_requests(self) -> list[int]:
+        return self._parse_values(self.sweep_requests_lineedit.text())
+
+    @property
+    def sweep_cache_sizes(self) -> list[int]:
+        return self._parse_values(self.sweep_cache_sizes_lineedit.text())
+
+    @staticmethod
+    def _parse_values(text: str, minimum: int = 1) -> list[int]:
+        # comma separated integers, or inclusive ranges as in 0-3
+        values = list[int]()
+
+        for value in text.replace(';', ',').split(','):
+            start, _, end = value.partition('-')
+
+            try:
+                parsed = range(int(start.strip()), int((end or start).strip()) + 1)
+            except ValueError:
+                continue
+
+            values.extend(n for n in parsed if n >= minimum)
+
+        return values
+
     def __getstate__(self) -> Mapping[str, Any]:
         return {
             'clear_cache_enabled': self.clear_cache_enabled,
             'refresh_interval': self.refresh_interval,
             'frame_data_sharing_fix_enabled': self.frame_data_sharing_fix_enabled,
+            'slowest_frames_count': self.slowest_frames_count,
+            'history_enabled': self.history_enabled,
+            'regression_threshold': self.regression_threshold_spinbox.value(),
+            'benchmarked_outputs': self.outputs_lineedit.text(),
+            'outputs_interleave': self.outputs_interleave,
+            'sweep_threads': self.sweep_threads_lineedit.text(),
+            'sweep_requests': self.sweep_requests_lineedit.text(),
+            'sweep_cache_sizes': self.sweep_cache_sizes_lineedit.text(),
         }
 
     def __setstate__(self, state: Mapping[str, Any]) -> None:
         try_load(state, 'clear_cache_enabled', bool, self.clear_cache_checkbox.setChecked)
         try_load(state, 'refresh_interval', Time, self.refresh_interval_control.setValue)
         try_load(state, 'frame_data_sharing_fix_enabled', bool, self.frame_data_sharing_fix_checkbox.setChecked)
+        try_load(state, 'slowest_frames_count', int, self.slowest_frames_spinbox.setValue)
+        try_load(state, 'history_enabled', bool, self.history_checkbox.setChecked)
+        try_load(state, 'regression_threshold', int, self.regression_threshold_spinbox.setValue)
+        try_load(state, 'benchmarked_outputs', str, self.outputs_lineedit.setText)
+        try_load(state, 'outputs_interleave', int, self.outputs_interleave_spinbox.setValue)
+        try_load(state, 'sweep_threads', str, self.sweep_threads_lineedit.setText)
+        try_load(state, 'sweep_requests', str, self.sweep_requests_lineedit.setText)
+        try_load(state, 'sweep_cache_sizes', str, self.sweep_cache_sizes_lineedit.setText)
         super().__setstate__(state)
@@ -1,231 +1,608 @@
-from __future__ import annotations
-
-from collections import deque
-from concurrent.futures import Future
-from copy import deepcopy
-from time import perf_counter
-
-from PyQt6.QtCore import QMetaObject, Qt
-from PyQt6.QtWidgets import QLabel
-from vstools import vs
-
-from ...core import AbstractMainWindow, AbstractToolbar, CheckBox, Frame, PushButton, Time, Timer
-from ...core.custom import FrameEdit
-from ...utils import qt_silent_call, strfdelta, vs_clear_cache
-from .settings import BenchmarkSettings
-
-
-class BenchmarkToolbar(AbstractToolbar):
-    __slots__ = (
-        'start_frame_control',
-        'end_frame_control', 'total_frames_control',
-        'prefetch_checkbox', 'unsequenced_checkbox',
-        'run_abort_button', 'info_label', 'running',
-        'unsequenced', 'run_start_time', 'start_frame',
-        'end_frame', 'total_frames', 'frames_left', 'buffer',
-        'update_info_timer', 'sequenced_timer'
-    )
-
-    def __init__(self, main: AbstractMainWindow) -> None:
-        super().__init__(main, BenchmarkSettings())
-
-        self.setup_ui()
-
-        self.running = False
-        self.unsequenced = False
-        self.buffer = deque[Future[vs.VideoFrame]]()
-        self.run_start_time = 0.0
-        self.start_frame = Frame(0)
-        self.end_frame = Frame(0)
-        self.total_frames = Frame(0)
-        self.frames_left = Frame(0)
-
-        self.sequenced_timer = Timer(
-            timeout=self._request_next_frame_sequenced, timerType=Qt.TimerType.PreciseTimer, interval=0
-        )
-
-        self.update_info_timer = Timer(timeout=self.update_info, timerType=Qt.TimerType.PreciseTimer)
-
-        self.set_qobject_names()
-
-    def setup_ui(self) -> None:
-        super().setup_ui()
-
-        self.start_frame_control = FrameEdit(self, valueChanged=lambda value: self.update_controls(start=value))
-
-        self.end_frame_control = FrameEdit(self, valueChanged=lambda value: self.update_controls(end=value))
-
-        self.total_frames_control = FrameEdit(self, 1, valueChanged=lambda value: self.update_controls(total=value))
-
-        self.unsequenced_checkbox = CheckBox(
-            'Unsequenced', self, checked=True, tooltip=(
-                "If enabled, next frame will be requested each time frameserver returns completed frame.\n"
-                "If disabled, first frame that's currently processing will be waited before requesting the next one."
-            )
-        )
-
-        self.prefetch_checkbox = CheckBox(
-            'Prefetch', self, checked=True, tooltip='Request multiple frames in advance.',
-            stateChanged=self.on_prefetch_changed
-        )
-
-        self.run_abort_button = PushButton('Run', self, checkable=True, clicked=self.on_run_abort_pressed)
-
-        self.info_label = QLabel(self)
-
-        self.hlayout.addWidgets([
-            QLabel('Start:'), self.start_frame_control,
-            QLabel('End:'), self.end_frame_control,
-            QLabel('Total:'), self.total_frames_control,
-            self.prefetch_checkbox,
-            self.unsequenced_checkbox,
-            self.run_abort_button,
-            self.info_label,
-        ])
-        self.hlayout.addStretch()
-
-    def on_current_output_changed(self, index: int, prev_index: int) -> None:
-        self.start_frame_control.setMaximum(self.main.current_output.total_frames - 1)
-        self.end_frame_control.setMaximum(self.main.current_output.total_frames - 1)
-        self.total_frames_control.setMaximum(self.main.current_output.total_frames - Frame(1))
-
-    def run(self) -> None:
-        if self.settings.clear_cache_enabled:
-            vs_clear_cache()
-
-        if self.settings.frame_data_sharing_fix_enabled:
-            self.main.current_output.update_graphic_item(
-                self.main.current_output.graphics_scene_item.pixmap().copy()
-            )
-
-        self.start_frame = self.start_frame_control.value()
-        self.end_frame = self.end_frame_control.value()
-        self.total_frames = self.total_frames_control.value()
-        self.frames_left = deepcopy(self.total_frames)
-        if self.prefetch_checkbox.isChecked():
-            concurrent_requests_count = self.main.settings.usable_cpus_count
-        else:
-            concurrent_requests_count = 1
-
-        self.unsequenced = self.unsequenced_checkbox.isChecked()
-        if not self.unsequenced:
-            self.buffer = deque([], concurrent_requests_count)
-            self.sequenced_timer.start()
-
-        self.running = True
-        self.run_start_time = perf_counter()
-
-        for offset in range(min(int(self.frames_left), concurrent_requests_count)):
-            if self.unsequenced:
-                self._request_next_frame_unsequenced()
-            else:
-                frame = self.start_frame + Frame(offset)
-                future = self.main.current_output.prepared.clip.get_frame_async(int(frame))
-                self.buffer.appendleft(future)
-
-        self.update_info_timer.setInterval(round(float(self.settings.refresh_interval) * 1000))
-        self.update_info_timer.start()
-
-    def abort(self) -> None:
-        if self.running:
-            self.update_info()
-
-        self.running = False
-        QMetaObject.invokeMethod(self.update_info_timer, 'stop', Qt.QueuedConnection)
-
-        if self.run_abort_button.isChecked():
-            self.run_abort_button.click()
-
-    def _request_next_frame_sequenced(self) -> None:
-        if self.frames_left <= Frame(0):
-            self.abort()
-            return
-
-        self.buffer.pop().result()
-
-        next_frame = self.end_frame + Frame(1) - self.frames_left
-        if next_frame <= self.end_frame:
-            new_future = self.main.current_output.prepared.clip.get_frame_async(int(next_frame))
-            self.buffer.appendleft(new_future)
-
-        self.frames_left -= Frame(1)
-
-    def _request_next_frame_unsequenced(self, future: Future | None = None) -> None:
-        if self.frames_left <= Frame(0):
-            self.abort()
-            return
-
-        if self.running:
-            next_frame = self.end_frame + Frame(1) - self.frames_left
-            new_future = self.main.current_output.prepared.clip.get_frame_async(int(next_frame))
-            new_future.add_done_callback(self._request_next_frame_unsequenced)
-
-        if future is not None:
-            future.result()
-        self.frames_left -= Frame(1)
-
-    def on_run_abort_pressed(self, checked: bool) -> None:
-        self.set_ui_editable(not checked)
-        if checked:
-            self.run()
-        else:
-            self.abort()
-
-    def on_prefetch_changed(self, new_state: int) -> None:
-        if new_state == Qt.Checked:
-            self.unsequenced_checkbox.setEnabled(True)
-        elif new_state == Qt.Unchecked:
-            self.unsequenced_checkbox.setChecked(False)
-            self.unsequenced_checkbox.setEnabled(False)
-
-    def set_ui_editable(self, new_state: bool) -> None:
-        self. start_frame_control.setEnabled(new_state)
-        self.end_frame_control.setEnabled(new_state)
-        self.total_frames_control.setEnabled(new_state)
-        self.prefetch_checkbox.setEnabled(new_state)
-        self. unsequenced_checkbox.setEnabled(new_state)
-
-    def update_controls(
-        self, start: Frame | None = None, end: Frame | None = None, total: Frame | None = None
-    ) -> None:
-        if not hasattr(self.main, 'current_output'):
-            return
-
-        if start is not None:
-            end = self.end_frame_control.value()
-            total = self.total_frames_control.value()
-
-            if start > end:
-                end = start
-            total = end - start + Frame(1)
-        elif end is not None:
-            start = self.start_frame_control.value()
-            total = self.total_frames_control.value()
-
-            if end < start:
-                start = end
-            total = end - start + Frame(1)
-        elif total is not None:
-            start = self.start_frame_control.value()
-            end = self.end_frame_control.value()
-            old_total = end - start + Frame(1)
-            delta = total - old_total
-
-            end += delta
-            if end > (e := self.main.current_output.total_frames - 1):
-                start -= end - e
-                end = e
-        else:
-            return
-
-        qt_silent_call(self.start_frame_control.setValue, start)
-        qt_silent_call(self.end_frame_control.setValue, end)
-        qt_silent_call(self.total_frames_control.setValue, total)
-
-    def update_info(self) -> None:
-        run_time = Time(seconds=(perf_counter() - self.run_start_time))
-        frames_done = self.total_frames - self.frames_left
-        fps = int(frames_done) / float(run_time)
-
-        info_str = (f"{frames_done}/{self.total_frames} frames in {strfdelta(run_time, '%M:%S.%Z')}, {fps:.4f} fps")
-        self.info_label.setText(info_str)
+from __future__ import annotations
+
+from pathlib import Path
+from threading import Thread
+from typing import Any, Callable
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QComboBox, QFileDialog, QLabel
+
+from ...core import AbstractMainWindow, AbstractToolbar, CheckBox, Frame, PushButton, SpinBox, Time, Timer
+from ...core.custom import ComboBox, FrameEdit
+from ...models import GeneralModel
+from ...utils import qt_silent_call, strfdelta, vs_clear_cache
+from .dialog import (
+    BenchmarkHistoryDialog, BreakdownDialog, FilterProfileDialog, OutputsComparisonDialog, SweepDialog
+)
+from .history import BenchmarkHistory, BenchmarkRecord, compare_records
+from .plot import LatencyPlot, MemoryPlot
+from .profiler import FilterProfiler, is_node_timing_supported
+from .runner import (
+    AccessPattern, BenchmarkStages, BenchmarkResult, BenchmarkRunner, BenchmarkStage, BenchmarkSweep
+)
+from .settings import BenchmarkSettings
+
+
+class BenchmarkToolbar(AbstractToolbar):
+    __slots__ = (
+        'start_frame_control',
+        'end_frame_control', 'total_frames_control',
+        'prefetch_checkbox', 'unsequenced_checkbox',
+        'run_abort_button', 'info_label', 'running',
+        'runner', 'run_thread', 'update_info_timer',
+        'latency_plot', 'export_csv_button', 'slowest_to_scening_button',
+        'sweep', 'sweep_button', 'sweep_dialog',
+        'profile_checkbox', 'profiler', 'profile_dialog',
+        'pattern_combobox', 'stride_spinbox',
+        'history_button', 'history_dialog',
+        'stages', 'breakdown_checkbox', 'breakdown_dialog',
+        'memory_plot', 'stages_outputs', 'all_outputs_button', 'outputs_dialog'
+    )
+
+    def __init__(self, main: AbstractMainWindow) -> None:
+        super().__init__(main, BenchmarkSettings())
+
+        self.setup_ui()
+
+        self.running = False
+        self.runner: BenchmarkRunner | None = None
+        self.sweep: BenchmarkSweep | None = None
+        self.stages: BenchmarkStages | None = None
+        # stage name to output index, when the stages are outputs
+        self.stages_outputs = dict[str, int]()
+        self.run_thread: Thread | None = None
+
+        self.profiler: FilterProfiler | None = None
+
+        self.sweep_dialog = SweepDialog(self.main)
+        self.profile_dialog = FilterProfileDialog(self.main)
+        self.history_dialog = BenchmarkHistoryDialog(self.main)
+        self.breakdown_dialog = BreakdownDialog(self.main)
+        self.outputs_dialog = OutputsComparisonDialog(self.main)
+
+        self.update_info_timer = Timer(timeout=self.update_info, timerType=Qt.TimerType.PreciseTimer)
+
+        self.set_qobject_names()
+
+    def setup_ui(self) -> None:
+        super().setup_ui()
+
+        self.start_frame_control = FrameEdit(self, valueChanged=lambda value: self.update_controls(start=value))
+
+        self.end_frame_control = FrameEdit(self, valueChanged=lambda value: self.update_controls(end=value))
+
+        self.total_frames_control = FrameEdit(self, 1, valueChanged=lambda value: self.update_controls(total=value))
+
+        self.unsequenced_checkbox = CheckBox(
+            'Unsequenced', self, checked=True, tooltip=(
+                "If enabled, next frame will be requested each time frameserver returns completed frame.\n"
+                "If disabled, first frame that's currently processing will be waited before requesting the next one."
+            )
+        )
+
+        self.prefetch_checkbox = CheckBox(
+            'Prefetch', self, checked=True, tooltip='Request multiple frames in advance.',
+            stateChanged=self.on_prefetch_changed
+        )
+
+        self.pattern_combobox = ComboBox[str](
+            self, model=GeneralModel[str]([str(x.value) for x in AccessPattern], False),
+            currentIndex=0, sizeAdjustPolicy=QComboBox.SizeAdjustPolicy.AdjustToContents,
+            toolTip='Order in which frames of the range are requested.\n'
+            'Scene boundaries seeks to the starts and ends of the scenes in the current scening list.'
+        )
+        self.pattern_combobox.currentTextChanged.connect(
+            lambda pattern: self.stride_spinbox.setEnabled(AccessPattern(pattern) is AccessPattern.STRIDED)
+        )
+
+        self.stride_spinbox = SpinBox(self, 2, 1 << 20, tooltip='Frames skipped by every strided jump', value=24)
+        self.stride_spinbox.setEnabled(False)
+
+        self.profile_checkbox = CheckBox(
+            'Profile filters', self, checked=False,
+            tooltip="Attribute the time spent to every filter of the output's graph (needs core node timing support)"
+        )
+
+        self.breakdown_checkbox = CheckBox(
+            'Breakdown', self, checked=False, tooltip=(
+                "Run the script's output node and the preview pipeline node back to back, then the preview "
+                "conversion alone,\nto separate the cost of the script from the one of VSPreview's conversion."
+            )
+        )
+
+        self.run_abort_button = PushButton('Run', self, checkable=True, clicked=self.on_run_abort_pressed)
+
+        self.sweep_button = PushButton(
+            'Sweep', self, checkable=True, clicked=self.on_sweep_pressed,
+            tooltip='Run the benchmark for every combination of the thread counts, requests and cache sizes in settings'
+        )
+
+        self.all_outputs_button = PushButton(
+            'All outputs', self, checkable=True, clicked=self.on_all_outputs_pressed,
+            tooltip='Run the same benchmark on every video output set in settings, resetting caches in between'
+        )
+
+        self.history_button = PushButton(
+            'History', self, clicked=self.on_history_clicked,
+            tooltip='Show the recorded runs of this script and compare them against a baseline'
+        )
+
+        self.info_label = QLabel(self)
+
+        self.latency_plot = LatencyPlot(self)
+
+        self.memory_plot = MemoryPlot(self)
+
+        self.export_csv_button = PushButton(
+            'Export CSV', self, clicked=self.on_export_csv_clicked, tooltip='Save the latency of every frame'
+        )
+
+        self.slowest_to_scening_button = PushButton(
+            'Slowest to scening', self, clicked=self.on_slowest_to_scening_clicked,
+            tooltip='Put the slowest frames in a new scening list'
+        )
+
+        self.set_results_available(False)
+
+        self.hlayout.addWidgets([
+            QLabel('Start:'), self.start_frame_control,
+            QLabel('End:'), self.end_frame_control,
+            QLabel('Total:'), self.total_frames_control,
+            QLabel('Pattern:'), self.pattern_combobox, self.stride_spinbox,
+            self.prefetch_checkbox,
+            self.unsequenced_checkbox,
+            self.profile_checkbox,
+            self.breakdown_checkbox,
+            self.run_abort_button,
+            self.sweep_button,
+            self.all_outputs_button,
+            self.history_button,
+            self.info_label,
+            self.latency_plot,
+            self.memory_plot,
+            self.export_csv_button,
+            self.slowest_to_scening_button,
+        ])
+        self.hlayout.addStretch()
+
+    def on_current_output_changed(self, index: int, prev_index: int) -> None:
+        self.start_frame_control.setMaximum(self.main.current_output.total_frames - 1)
+        self.end_frame_control.setMaximum(self.main.current_output.total_frames - 1)
+        self.total_frames_control.setMaximum(self.main.current_output.total_frames - Frame(1))
+
+    def run(self) -> None:
+        if self.settings.clear_cache_enabled:
+            vs_clear_cache()
+
+        if self.settings.frame_data_sharing_fix_enabled:
+            self.main.current_output.update_graphic_item(
+                self.main.current_output.graphics_scene_item.pixmap().copy()
+            )
+
+        if self.prefetch_checkbox.isChecked():
+            concurrent_requests_count = self.main.settings.usable_cpus_count
+        else:
+            concurrent_requests_count = 1
+
+        if not (frames := self.get_pattern_frames()):
+            self.main.show_message('Benchmark: no frames to request with this access pattern')
+            self.run_abort_button.click()
+            return
+
+        self.sweep = None
+        self.stages = None
+        self.stages_outputs = {}
+
+        if self.breakdown_checkbox.isChecked():
+            self.runner = None
+            self.profiler = None
+            self.stages = BenchmarkStages(
+                self.get_breakdown_stages(frames),
+                int(self.start_frame_control.value()), int(self.end_frame_control.value()),
+                concurrent_requests_count, self.unsequenced_checkbox.isChecked(), vs_clear_cache, self.access_pattern,
+                self.sample_interval
+            )
+
+            self.start_thread(self.stages.run)
+            return
+
+        self.runner = BenchmarkRunner(
+            self.main.current_output.prepared.clip,
+            int(self.start_frame_control.value()), int(self.end_frame_control.value()),
+            concurrent_requests_count, self.unsequenced_checkbox.isChecked(), self.access_pattern, frames,
+            sample_interval=self.sample_interval
+        )
+
+        self.profiler = None
+
+        if self.profile_checkbox.isChecked():
+            if is_node_timing_supported():
+                self.profiler = FilterProfiler(self.runner.clip)
+                self.profiler.start()
+            else:
+                self.main.show_message('Benchmark: this VapourSynth core has no node timing, not profiling filters')
+
+        self.start_thread(self.runner.run)
+
+    def run_sweep(self) -> None:
+        configurations = BenchmarkSweep.make_grid(
+            self.settings.sweep_threads, self.settings.sweep_requests, self.settings.sweep_cache_sizes
+        )
+
+        if not configurations:
+            self.main.show_message('Benchmark sweep: no thread counts, requests or cache sizes set in settings')
+            self.sweep_button.click()
+            return
+
+        if not (frames := self.get_pattern_frames()):
+            self.main.show_message('Benchmark: no frames to request with this access pattern')
+            self.sweep_button.click()
+            return
+
+        self.runner = None
+        self.stages = None
+        self.stages_outputs = {}
+        self.sweep = BenchmarkSweep(
+            self.main.current_output.prepared.clip,
+            int(self.start_frame_control.value()), int(self.end_frame_control.value()),
+            self.unsequenced_checkbox.isChecked(), configurations, vs_clear_cache, self.access_pattern, frames,
+            self.sample_interval
+        )
+
+        self.start_thread(self.sweep.run)
+
+    def run_all_outputs(self) -> None:
+        assert self.main.outputs
+
+        indices = self.settings.benchmarked_outputs or range(len(self.main.outputs))
+        outputs = [self.main.outputs[i] for i in dict.fromkeys(indices) if 0 <= i < len(self.main.outputs)]
+
+        if not (frames := self.get_pattern_frames()):
+            self.main.show_message('Benchmark: no frames to request with this access pattern')
+            self.all_outputs_button.click()
+            return
+
+        stages = list[BenchmarkStage]()
+        stages_outputs = dict[str, int]()
+
+        for output in outputs:
+            # shorter outputs only get the frames they have
+            if output_frames := [n for n in frames if n < output.total_frames]:
+                stages.append(BenchmarkStage(f'{output.index}: {output.name}', output.prepared.clip, output_frames))
+                stages_outputs[stages[-1].name] = output.index
+
+        if not stages:
+            self.main.show_message('Benchmark: none of the selected outputs has frames in this range')
+            self.all_outputs_button.click()
+            return
+
+        self.runner = None
+        self.sweep = None
+        self.profiler = None
+        self.stages_outputs = stages_outputs
+        self.stages = BenchmarkStages(
+            stages, int(self.start_frame_control.value()), int(self.end_frame_control.value()),
+            self.main.settings.usable_cpus_count if self.prefetch_checkbox.isChecked() else 1,
+            self.unsequenced_checkbox.isChecked(), vs_clear_cache, self.access_pattern,
+            self.sample_interval, self.settings.outputs_interleave
+        )
+
+        self.start_thread(self.stages.run)
+
+    def get_breakdown_stages(self, frames: list[int]) -> list[BenchmarkStage]:
+        output = self.main.current_output
+        display_profile = self.main.display_profile
+
+        # the same conversion, applied to a blank clip carrying the props of a single, cached, source frame
+        conversion_source = output.source.clip.std.BlankClip(keep=True).std.CopyFrameProps(
+            output.source.clip[int(self.start_frame_control.value())]
+        )
+
+        return [
+            BenchmarkStage('Script', output.source.clip, frames),
+            BenchmarkStage(
+                'Preview pipeline', output.prepared.clip, frames,
+                lambda frame: output.frame_to_qimage(frame, False, display_profile)
+            ),
+            BenchmarkStage(
+                'Conversion only',
+                output.prepare_vs_output(conversion_source).std.CopyFrameProps(conversion_source), frames
+            )
+        ]
+
+    @property
+    def sample_interval(self) -> float:
+        return float(self.settings.refresh_interval)
+
+    @property
+    def access_pattern(self) -> AccessPattern:
+        return AccessPattern(self.pattern_combobox.currentValue())
+
+    def get_pattern_frames(self) -> list[int]:
+        scene_frames = list[int]()
+
+        if self.access_pattern is AccessPattern.SCENES and (scening_list := self.main.toolbars.scening.current_list):
+            scene_frames = list(dict.fromkeys(
+                int(frame) for scene in scening_list for frame in (scene.start, scene.end)
+            ))
+
+        return self.access_pattern.get_frames(
+            int(self.start_frame_control.value()), int(self.end_frame_control.value()),
+            self.stride_spinbox.value(), None, scene_frames
+        )
+
+    def start_thread(self, target: Callable[[], Any]) -> None:
+        # runners block on frames, the GUI only polls their counters
+        self.run_thread = Thread(target=target, name='vspreview-benchmark', daemon=True)
+
+        self.running = True
+        self.set_results_available(False)
+        self.run_thread.start()
+
+        self.update_info_timer.setInterval(round(float(self.settings.refresh_interval) * 1000))
+        self.update_info_timer.start()
+
+    @property
+    def current_runner(self) -> BenchmarkRunner | None:
+        if self.sweep is not None:
+            return self.sweep.current
+
+        if self.stages is not None:
+            return self.stages.current
+
+        return self.runner
+
+    def abort(self) -> None:
+        if self.sweep is not None:
+            self.sweep.abort()
+        elif self.stages is not None:
+            self.stages.abort()
+        elif self.runner is not None:
+            self.runner.abort()
+
+        if self.run_thread is not None and self.run_thread.is_alive():
+            # in-flight requests are still being drained, update_info finishes once the thread is done
+            self.set_buttons_enabled(False)
+            return
+
+        self.finish()
+
+    def finish(self) -> None:
+        if self.running:
+            self.running = False
+            self.update_info()
+
+            if self.sweep is not None:
+                self.sweep_dialog.set_results(self.sweep.results)
+                self.sweep_dialog.show()
+
+            if self.stages is not None and self.stages_outputs:
+                self.outputs_dialog.set_results([
+                    (BenchmarkRecord.from_result(result, self.main.script_path, self.stages_outputs[name]), name)
+                    for name, result in self.stages.results
+                ])
+                self.outputs_dialog.show()
+
+                if self.settings.history_enabled:
+                    for name, result in self.stages.results:
+                        self.record_result(result, self.stages_outputs[name])
+            elif self.stages is not None:
+                self.breakdown_dialog.set_results(self.stages.results)
+                self.breakdown_dialog.show()
+
+            if self.profiler is not None and self.runner is not None:
+                self.profile_dialog.set_timings(
+                    self.profiler.stop(self.runner.frames_done, self.runner.elapsed),
+                    self.runner.frames_done, self.runner.elapsed
+                )
+                self.profile_dialog.show()
+
+                self.profiler = None
+
+            if self.sweep is None and self.runner is not None and self.settings.history_enabled:
+                self.record_result(self.runner.result)
+
+        self.update_info_timer.stop()
+
+        self.set_results_available(self.runner is not None and bool(self.runner.result.latencies))
+
+        for button in (self.run_abort_button, self.sweep_button, self.all_outputs_button):
+            qt_silent_call(button.setChecked, False)
+
+        self.set_buttons_enabled(True)
+        self.set_ui_editable(True)
+
+    def set_buttons_enabled(self, enabled: bool) -> None:
+        self.run_abort_button.setEnabled(enabled)
+        self.sweep_button.setEnabled(enabled)
+        self.all_outputs_button.setEnabled(enabled)
+
+    def get_history(self) -> BenchmarkHistory:
+        return BenchmarkHistory.for_script(self.main.current_config_dir, self.main.script_path)
+
+    def record_result(self, result: BenchmarkResult, output: int | None = None) -> None:
+        if result.aborted or result.error or not result.frames_done:
+            return
+
+        history = self.get_history()
+        record = BenchmarkRecord.from_result(
+            result, self.main.script_path, self.main.current_output.index if output is None else output
+        )
+
+        try:
+            history.append(record)
+        except OSError as e:
+            self.main.show_message(f'Benchmark: could not save the history: {e}')
+            return
+
+        if (baseline := history.get_baseline_for(record)) is not None:
+            if regressions := compare_records(record, baseline, self.settings.regression_threshold):
+                self.main.show_message('Benchmark regression: ' + ', '.join(map(str, regressions)))
+
+        if self.history_dialog.isVisible():
+            self.history_dialog.set_history(history, self.settings.regression_threshold)
+
+    def on_history_clicked(self, checked: bool | None = None) -> None:
+        self.history_dialog.set_history(self.get_history(), self.settings.regression_threshold)
+        self.history_dialog.show()
+
+    def on_run_abort_pressed(self, checked: bool) -> None:
+        if checked:
+            self.set_ui_editable(False)
+            self.sweep_button.setEnabled(False)
+            self.all_outputs_button.setEnabled(False)
+            self.run()
+        else:
+            self.abort()
+
+    def on_sweep_pressed(self, checked: bool) -> None:
+        if checked:
+            self.set_ui_editable(False)
+            self.run_abort_button.setEnabled(False)
+            self.all_outputs_button.setEnabled(False)
+            self.run_sweep()
+        else:
+            self.abort()
+
+    def on_all_outputs_pressed(self, checked: bool) -> None:
+        if checked:
+            self.set_ui_editable(False)
+            self.run_abort_button.setEnabled(False)
+            self.sweep_button.setEnabled(False)
+            self.run_all_outputs()
+        else:
+            self.abort()
+
+    def set_results_available(self, available: bool) -> None:
+        self.export_csv_button.setEnabled(available)
+        self.slowest_to_scening_button.setEnabled(available)
+
+    def on_export_csv_clicked(self, checked: bool | None = None) -> None:
+        if self.runner is None:
+            return
+
+        save_path_str, _ = QFileDialog.getSaveFileName(
+            self.main, 'Export benchmark latencies', str(self.main.script_path.with_suffix('.benchmark.csv')),
+            'CSV (*.csv)'
+        )
+
+        if save_path_str:
+            self.runner.result.write_csv(Path(save_path_str))
+
+    def on_slowest_to_scening_clicked(self, checked: bool | None = None) -> None:
+        if self.runner is None:
+            return
+
+        count = self.settings.slowest_frames_count
+        scening = self.main.toolbars.scening
+
+        scening_list, scening_list_index = scening.lists.add(f'Benchmark: {count} slowest frames')
+
+        for n, latency in self.runner.result.slowest_frames(count):
+            scening_list.add(Frame(n), label=f'{latency * 1000:.2f} ms')
+
+        scening.current_list_index = scening_list_index
+
+        self.main.show_message(f'Added the {count} slowest frames to "{scening_list.name}"')
+
+    def on_prefetch_changed(self, new_state: int) -> None:
+        if new_state == Qt.Checked:
+            self.unsequenced_checkbox.setEnabled(True)
+        elif new_state == Qt.Unchecked:
+            self.unsequenced_checkbox.setChecked(False)
+            self.unsequenced_checkbox.setEnabled(False)
+
+    def set_ui_editable(self, new_state: bool) -> None:
+        self. start_frame_control.setEnabled(new_state)
+        self.end_frame_control.setEnabled(new_state)
+        self.total_frames_control.setEnabled(new_state)
+        self.prefetch_checkbox.setEnabled(new_state)
+        self. unsequenced_checkbox.setEnabled(new_state)
+        self.profile_checkbox.setEnabled(new_state)
+        self.breakdown_checkbox.setEnabled(new_state)
+        self.pattern_combobox.setEnabled(new_state)
+        self.stride_spinbox.setEnabled(new_state and self.access_pattern is AccessPattern.STRIDED)
+
+    def update_controls(
+        self, start: Frame | None = None, end: Frame | None = None, total: Frame | None = None
+    ) -> None:
+        if not hasattr(self.main, 'current_output'):
+            return
+
+        if start is not None:
+            end = self.end_frame_control.value()
+            total = self.total_frames_control.value()
+
+            if start > end:
+                end = start
+            total = end - start + Frame(1)
+        elif end is not None:
+            start = self.start_frame_control.value()
+            total = self.total_frames_control.value()
+
+            if end < start:
+                start = end
+            total = end - start + Frame(1)
+        elif total is not None:
+            start = self.start_frame_control.value()
+            end = self.end_frame_control.value()
+            old_total = end - start + Frame(1)
+            delta = total - old_total
+
+            end += delta
+            if end > (e := self.main.current_output.total_frames - 1):
+                start -= end - e
+                end = e
+        else:
+            return
+
+        qt_silent_call(self.start_frame_control.setValue, start)
+        qt_silent_call(self.end_frame_control.setValue, end)
+        qt_silent_call(self.total_frames_control.setValue, total)
+
+    def update_info(self) -> None:
+        if (runner := self.current_runner) is None:
+            return
+
+        run_time = Time(seconds=runner.elapsed)
+        frames_done = runner.frames_done
+        fps = frames_done / (float(run_time) or 1)
+
+        info_str = (
+            f"{frames_done}/{runner.result.total_frames} frames in {strfdelta(run_time, '%M:%S.%Z')}, "
+            f"{fps:.4f} fps"
+        )
+
+        if self.stages is not None and self.stages.current_stage is not None:
+            info_str = f'[{self.stages.current_stage.name}] {info_str}'
+
+        if self.sweep is not None:
+            info_str = (
+                f'[{len(self.sweep.results) + self.running}/{len(self.sweep.configurations)}: '
+                f'{self.sweep.current_configuration}] {info_str}'
+            )
+
+        if not self.running:
+            stats = runner.result.latency_stats()
+
+            info_str += ', latency ' + ', '.join(f'{name} {value * 1000:.2f} ms' for name, value in stats.items())
+
+            self.latency_plot.set_points(runner.result.latencies, stats['p95'])
+
+            if memory := runner.result.memory_stats():
+                info_str += (
+                    f", RSS peak {memory['peak_rss'] / 2 ** 20:.0f} MB, steady {memory['steady_rss'] / 2 ** 20:.0f} MB"
+                    f", VS cache peak {memory['peak_cache_size'] / 2 ** 20:.0f} MB"
+                )
+        else:
+            self.latency_plot.set_points(list(runner.result.latencies))
+
+        self.memory_plot.set_samples(list(runner.result.memory_samples))
+
+        if runner.result.error:
+            info_str += f' (failed: {runner.result.error})'
+
+        self.info_label.setText(info_str)
+
+        if self.running and self.run_thread is not None and not self.run_thread.is_alive():
+            self.finish()
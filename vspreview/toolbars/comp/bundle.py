@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Callable, Sequence
+from urllib.parse import quote
+
+VIEWER_HTML = '''<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Comparison</title>
+<style>
+  body { margin: 0; background: #1e1e1e; color: #ddd; font-family: sans-serif; }
+  #bar { position: fixed; top: 0; left: 0; right: 0; padding: 6px 10px; background: rgba(0, 0, 0, 0.7); }
+  #bar span { margin-right: 12px; }
+  #bar .current { color: #fff; font-weight: bold; }
+  #frames { float: right; }
+  img { display: block; margin: 0 auto; image-rendering: pixelated; }
+  #download { display: block; padding: 60px 10px 0; text-align: center; color: #8cf; }
+  #help { color: #888; }
+</style>
+</head>
+<body>
+<div id="bar">
+  <select id="frames"></select>
+  <span id="name"></span><span id="outputs"></span><span id="help"></span>
+</div>
+<img id="image">
+<a id="download" hidden></a>
+<script>
+let frame = 0, output = 0;
+
+function render() {
+  const comp = window.comparison;
+  const frames = document.getElementById('frames');
+
+  document.title = comp.name;
+  document.getElementById('name').textContent = comp.name;
+  document.getElementById('help').textContent = (
+    '1-9 / \\u2191\\u2193 output, \\u2190\\u2192 frame'
+    + (comp.complete ? '' : ` (${comp.frames.length}/${comp.total} frames written)`)
+  );
+
+  if (frames.options.length !== comp.frames.length) {
+    frames.innerHTML = '';
+    comp.frames.forEach((item, i) => frames.add(new Option(`Frame ${item.frame}`, i)));
+  }
+
+  if (!comp.frames.length) return;
+
+  frame = Math.min(frame, comp.frames.length - 1);
+  frames.value = frame;
+
+  document.getElementById('outputs').replaceChildren(...comp.outputs.map((name, i) => {
+    const span = document.createElement('span');
+    span.textContent = `${i + 1}: ${name}`;
+    span.className = i === output ? 'current' : '';
+    return span;
+  }));
+
+  const image = document.getElementById('image'), download = document.getElementById('download');
+  const src = comp.frames[frame].images[output];
+
+  image.hidden = false;
+  download.hidden = true;
+  download.href = src;
+  download.textContent = `This browser can't show ${decodeURIComponent(src)}, download it instead`;
+  image.src = src;
+}
+
+// formats like QOI are only written to disk, they're opened with a local image viewer
+document.getElementById('image').onerror = (e) => {
+  e.target.hidden = true;
+  document.getElementById('download').hidden = false;
+};
+
+function reload() {
+  // data.js is rewritten as frames are extracted, fetch() is not allowed on file:// pages
+  const script = document.createElement('script');
+  script.src = 'data.js?' + Date.now();
+  script.onload = () => { script.remove(); render(); if (!window.comparison.complete) setTimeout(reload, 2000); };
+  document.head.appendChild(script);
+}
+
+document.getElementById('frames').onchange = (e) => { frame = +e.target.value; render(); };
+
+document.onkeydown = (e) => {
+  const comp = window.comparison;
+
+  if (!comp || e.target.tagName === 'SELECT') return;
+
+  if (e.key >= '1' && e.key <= '9' && +e.key <= comp.outputs.length) output = +e.key - 1;
+  else if (e.key === 'ArrowUp') output = (output + comp.outputs.length - 1) % comp.outputs.length;
+  else if (e.key === 'ArrowDown') output = (output + 1) % comp.outputs.length;
+  else if (e.key === 'ArrowLeft') frame = Math.max(frame - 1, 0);
+  else if (e.key === 'ArrowRight') frame = Math.min(frame + 1, comp.frames.length - 1);
+  else return;
+
+  e.preventDefault();
+  render();
+};
+
+reload();
+</script>
+</body>
+</html>
+'''
+
+
+class LocalBundle:
+    __slots__ = ('path', 'name', 'outputs', 'frames', 'paths')
+
+    def __init__(
+        self, path: Path, name: str, outputs: Sequence[str], frames: Sequence[int], paths: Sequence[Sequence[Path]]
+    ) -> None:
+        self.path = path
+        self.name = name
+        self.outputs = list(outputs)
+        self.frames = list(frames)
+        # per output, then per frame, as laid out by the extractor
+        self.paths = paths
+
+    @property
+    def index(self) -> Path:
+        return self.path / 'index.html'
+
+    def write(self, wait_for: Callable[[Path], bool] | None = None) -> bool:
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.index.write_text(VIEWER_HTML, 'utf-8')
+
+        self.update(0)
+
+        # the viewer is usable from the start, every frame shows up once all of its images are written
+        for j in range(len(self.frames)):
+            for paths in self.paths:
+                if wait_for is not None and not wait_for(paths[j]):
+                    return False
+
+            self.update(j + 1)
+
+        return True
+
+    def update(self, frames_done: int) -> None:
+        data = {
+            'name': self.name,
+            'outputs': self.outputs,
+            'frames': [
+                {
+                    'frame': frame,
+                    'images': [quote(paths[j].relative_to(self.path).as_posix()) for paths in self.paths]
+                } for j, frame in enumerate(self.frames[:frames_done])
+            ],
+            'total': len(self.frames),
+            'complete': frames_done == len(self.frames)
+        }
+
+        temp = self.path / 'data.js.tmp'
+        temp.write_text(f'window.comparison = {json.dumps(data)};\n', 'utf-8')
+
+        # so the viewer never loads a partially written file
+        os.replace(temp, self.path / 'data.js')
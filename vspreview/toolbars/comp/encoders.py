@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from importlib.util import find_spec
+from math import ceil
+from pathlib import Path
+from typing import NamedTuple
+
+from PyQt6.QtGui import QImage, QImageWriter
+
+
+class ImageEncoder(ABC):
+    __slots__ = ('name', 'suffix', 'content_type', 'uploadable')
+
+    def __init__(self, name: str, suffix: str, content_type: str, uploadable: bool = True) -> None:
+        self.name = name
+        self.suffix = suffix
+        self.content_type = content_type
+        # slow.pics only takes some of the formats browsers can show, local bundles take them all
+        self.uploadable = uploadable
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    @property
+    def key(self) -> str:
+        # anything changing the written file has to be part of it, the images store depends on it
+        return self.name
+
+    @abstractmethod
+    def encode(self, image: QImage, path: Path) -> None:
+        ...
+
+
+class QtImageEncoder(ImageEncoder):
+    __slots__ = ('format', 'quality')
+
+    def __init__(
+        self, name: str, format: str, suffix: str, content_type: str, quality: int = -1, uploadable: bool = True
+    ) -> None:
+        super().__init__(name, suffix, content_type, uploadable)
+
+        self.format = format
+        self.quality = quality
+
+    @property
+    def available(self) -> bool:
+        return self.format.lower().encode() in map(bytes, QImageWriter.supportedImageFormats())
+
+    @property
+    def key(self) -> str:
+        return f'{self.format}:{self.quality}'
+
+    def encode(self, image: QImage, path: Path) -> None:
+        if not image.save(str(path), self.format, self.quality):
+            raise OSError(f'Could not save "{path}" as {self.format}!')
+
+
+class PNGEncoder(QtImageEncoder):
+    __slots__ = ()
+
+    def __init__(self, name: str, level: int | None = None) -> None:
+        # Qt maps the quality to the zlib level as (100 - quality) * 9 / 91
+        super().__init__(name, 'PNG', '.png', 'image/png', -1 if level is None else 100 - ceil(level * 91 / 9))
+
+
+class QOIEncoder(ImageEncoder):
+    __slots__ = ()
+
+    def __init__(self, name: str = 'QOI') -> None:
+        super().__init__(name, '.qoi', 'image/qoi', False)
+
+    @property
+    def available(self) -> bool:
+        return find_spec('qoi') is not None and find_spec('numpy') is not None
+
+    def encode(self, image: QImage, path: Path) -> None:
+        import numpy as np
+        import qoi
+
+        image = image.convertToFormat(QImage.Format.Format_RGB888)
+
+        width, height = image.width(), image.height()
+
+        pointer = image.constBits()
+        pointer.setsize(image.sizeInBytes())
+
+        # lines are padded to 4 bytes
+        data = np.frombuffer(pointer, np.uint8).reshape(height, image.bytesPerLine())[:, :width * 3]
+
+        path.write_bytes(qoi.encode(np.ascontiguousarray(data.reshape(height, width, 3))))
+
+
+class EncoderStats(NamedTuple):
+    name: str
+    images: int
+    seconds: float
+    size: int
+    reused: int = 0
+
+    def __str__(self) -> str:
+        info = list[str]()
+
+        if self.images:
+            # seconds are summed over the encoding threads
+            info.append(
+                f'{self.images / max(self.seconds, 1e-9):.1f} img/s per thread, '
+                f'{self.size / self.images / 2 ** 20:.2f} MiB/img'
+            )
+
+        if self.reused:
+            info.append(f'{self.reused} reused')
+
+        return f'{self.name}: {", ".join(info) or "-"}'
+
+
+image_encoders = dict[str, ImageEncoder]()
+
+
+def register_image_encoder(encoder: ImageEncoder) -> ImageEncoder:
+    image_encoders[encoder.name] = encoder
+
+    return encoder
+
+
+def get_image_encoder(name: str) -> ImageEncoder:
+    try:
+        encoder = image_encoders[name]
+    except KeyError:
+        raise ValueError(f'There\'s no "{name}" image encoder!')
+
+    if not encoder.available:
+        raise ValueError(f'The "{name}" image encoder is not available, its Qt plugin or package is missing!')
+
+    return encoder
+
+
+def get_available_image_encoders() -> list[str]:
+    return [name for name, encoder in image_encoders.items() if encoder.available]
+
+
+register_image_encoder(PNGEncoder('PNG'))
+register_image_encoder(PNGEncoder('PNG (fast)', 1))
+register_image_encoder(PNGEncoder('PNG (smallest)', 9))
+register_image_encoder(QtImageEncoder('WebP (lossless)', 'WEBP', '.webp', 'image/webp', 100))
+register_image_encoder(QOIEncoder())
+register_image_encoder(QtImageEncoder('BMP (uncompressed)', 'BMP', '.bmp', 'image/bmp', uploadable=False))
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from threading import Condition, Event, Lock, Semaphore
+from time import perf_counter
+from typing import Callable, Sequence
+
+from PyQt6.QtGui import QImage
+from vstools import vs
+
+from ...core import VideoOutput
+from .encoders import EncoderStats, ImageEncoder, get_image_encoder
+from .store import ImageStore
+
+
+def get_image_paths(path: Path, output: VideoOutput, frames: Sequence[int], suffix: str = '.png') -> list[Path]:
+    digits = len('%i' % max(frames))
+
+    return [path / output.name / (f'{output.name}_' + f'{f}'.zfill(digits) + suffix) for f in frames]
+
+
+class FrameExtractor:
+    __slots__ = (
+        'outputs', 'frames', 'paths', 'encoder', 'in_flight', 'encoders', 'store', 'keys', 'reused',
+        'done', 'total', 'finished', 'encoded', 'encode_time', 'encoded_size',
+        '_lock', '_slots', '_error', '_cancelled', '_encoder_pool', '_encoded', '_encoded_condition'
+    )
+
+    def __init__(
+        self, outputs: Sequence[VideoOutput], frames: Sequence[int], path: Path,
+        encoder: ImageEncoder | None = None, in_flight: int = 8, encoders: int = 4,
+        store: ImageStore | None = None, fingerprints: Sequence[str | None] | None = None
+    ) -> None:
+        self.encoder = encoder or get_image_encoder('PNG')
+        self.outputs = list(outputs)
+        self.frames = list(frames)
+        self.paths = [get_image_paths(path, output, self.frames, self.encoder.suffix) for output in self.outputs]
+        self.in_flight = max(in_flight, 1)
+        self.encoders = max(encoders, 1)
+
+        self.store = store if fingerprints is not None else None
+        # outputs without a fingerprint are never reused nor stored
+        self.keys = [
+            None if fingerprint is None else [ImageStore.get_key(fingerprint, n, self.encoder.key) for n in self.frames]
+            for fingerprint in fingerprints
+        ] if self.store is not None and fingerprints is not None else None
+        self.reused = 0
+
+        self.done = 0
+        self.total = len(self.outputs) * len(self.frames)
+        self.finished = False
+
+        self.encoded = 0
+        self.encode_time = 0.0
+        self.encoded_size = 0
+
+        self._lock = Lock()
+        self._slots = Semaphore(self.in_flight)
+        self._error: BaseException | None = None
+        self._cancelled = Event()
+
+        self._encoded = set[Path]()
+        self._encoded_condition = Condition()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+        with self._encoded_condition:
+            self._encoded_condition.notify_all()
+
+    @property
+    def error(self) -> BaseException | None:
+        return self._error
+
+    @property
+    def stats(self) -> EncoderStats:
+        with self._lock:
+            return EncoderStats(self.encoder.name, self.encoded, self.encode_time, self.encoded_size, self.reused)
+
+    def wait_for(self, path: Path) -> bool:
+        # blocks until the image is written, False if it never will be
+        with self._encoded_condition:
+            self._encoded_condition.wait_for(
+                lambda: path in self._encoded or self.finished or self._cancelled.is_set() or self._error is not None
+            )
+
+            return path in self._encoded
+
+    def run(self, progress: Callable[[int, int], None] | None = None) -> list[list[Path]]:
+        for paths in self.paths:
+            paths[0].parent.mkdir(parents=True, exist_ok=True)
+
+        self._encoder_pool = ThreadPoolExecutor(self.encoders, 'vspreview-comp-encoder')
+
+        try:
+            # same frame of every output back to back, so shared upstream nodes are still cached
+            for j, n in enumerate(self.frames):
+                for i, output in enumerate(self.outputs):
+                    if self.store is not None and self.keys is not None and (keys := self.keys[i]) is not None:
+                        # unchanged outputs are only linked from the store
+                        if self.store.fetch(keys[j], self.paths[i][j]):
+                            with self._lock:
+                                self.reused += 1
+
+                            self._image_done(self.paths[i][j], progress)
+                            continue
+
+                    self._slots.acquire()
+
+                    if self._cancelled.is_set() or self._error is not None:
+                        self._slots.release()
+                        break
+
+                    output.prepared.clip.get_frame_async(n).add_done_callback(
+                        partial(self._on_frame, i, j, progress=progress)
+                    )
+
+                if self._cancelled.is_set() or self._error is not None:
+                    break
+
+            # every slot back means every frame was encoded or dropped
+            for _ in range(self.in_flight):
+                self._slots.acquire()
+        finally:
+            self._encoder_pool.shutdown(wait=True)
+
+            with self._encoded_condition:
+                self.finished = True
+                self._encoded_condition.notify_all()
+
+            if self.store is not None:
+                self.store.evict()
+
+        if self._error is not None:
+            raise self._error
+
+        return self.paths
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def _on_frame(
+        self, i: int, j: int, future: Future[vs.VideoFrame], progress: Callable[[int, int], None] | None = None
+    ) -> None:
+        try:
+            frame = future.result()
+
+            try:
+                # the copy is all that is done on the VapourSynth thread, encoding happens in the pool
+                image = self.outputs[i].frame_to_qimage(frame)
+            finally:
+                frame.close()
+
+            self._encoder_pool.submit(
+                self._encode, image, self.paths[i][j], progress,
+                keys[j] if self.keys is not None and (keys := self.keys[i]) is not None else None
+            )
+        except BaseException as e:
+            self._fail(e)
+            self._slots.release()
+
+    def _encode(
+        self, image: QImage, path: Path, progress: Callable[[int, int], None] | None, key: str | None = None
+    ) -> None:
+        try:
+            if self._cancelled.is_set() or self._error is not None:
+                return
+
+            start = perf_counter()
+
+            self.encoder.encode(image, path)
+
+            elapsed, size = perf_counter() - start, path.stat().st_size
+
+            with self._lock:
+                self.encoded += 1
+                self.encode_time += elapsed
+                self.encoded_size += size
+
+            if self.store is not None and key is not None:
+                self.store.put(key, path)
+
+            self._image_done(path, progress)
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self._slots.release()
+
+    def _image_done(self, path: Path, progress: Callable[[int, int], None] | None) -> None:
+        with self._lock:
+            self.done += 1
+            done = self.done
+
+        with self._encoded_condition:
+            self._encoded.add(path)
+            self._encoded_condition.notify_all()
+
+        if progress is not None:
+            progress(done, self.total)
+
+    def _fail(self, error: BaseException) -> None:
+        with self._lock:
+            if self._error is None:
+                self._error = error
+
+        with self._encoded_condition:
+            self._encoded_condition.notify_all()
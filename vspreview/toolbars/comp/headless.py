@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Lock
+from typing import Any, Sequence
+
+from ...core import PictureType
+
+
+def run_headless_comp(
+    script_path: Path, external_args: list[tuple[str, str]] | None = None, frames: Sequence[int] | None = None,
+    random: int = 0, picture_type: str | None = None, collection_name: str | None = None, local: bool = False,
+    public: bool = True, nsfw: bool = False, config_dir: Path | None = None, selection: str = 'Random'
+) -> dict[str, Any]:
+    # same as the GUI, with the comp toolbar filled in from the arguments and a window that's never shown
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    from PyQt6.QtWidgets import QApplication
+
+    from ...main import MainWindow
+    from .toolbar import Worker
+
+    # has to stay referenced for as long as the window lives
+    app = QApplication.instance() or QApplication(sys.argv)  # noqa: F841
+
+    main_window = MainWindow(config_dir or script_path.parent)
+    main_window.load_script(script_path, external_args, False)
+
+    if main_window.script_exec_failed or not main_window.outputs:
+        raise RuntimeError(f'Could not load "{script_path}", see the output above for details!')
+
+    comp = main_window.toolbars.comp
+
+    comp.collection_name_lineedit.setText(collection_name or '{script_name}')
+    comp.selection_combox.setCurrentValue(selection)
+    comp.manual_frames_lineedit.setText(','.join(map(str, frames or [])))
+    comp.current_frame_checkbox.setChecked(False)
+    comp.pic_type_combox.setCurrentValue(PictureType(picture_type.encode()) if picture_type else PictureType.ALL)
+    comp.is_public_checkbox.setChecked(public)
+    comp.is_nsfw_checkbox.setChecked(nsfw)
+    comp.local_checkbox.setChecked(local)
+
+    conf = comp.get_slowpics_conf(random)
+
+    results, errors = list[str](), list[str]()
+
+    def _on_status(kind: str, curr: int, total: int) -> None:
+        # the status is the url once it's done, everything else is progress
+        if kind not in ('extract', 'upload', 'search'):
+            results.append(kind)
+
+    worker = Worker()
+    worker.progress_status.connect(_on_status)
+    worker.failed.connect(errors.append)
+
+    # the worker runs in this thread, nothing is waiting on a Qt event loop
+    worker.run(conf)
+
+    if errors:
+        raise ValueError(errors[-1])
+
+    if not results:
+        raise RuntimeError('The comparison was stopped before completion!')
+
+    return {
+        'collection_name': conf.collection_name,
+        'outputs': [output.name for output in conf.outputs],
+        'frames': worker.frames,
+        'local': local,
+        'url': results[-1],
+        'path': str(conf.path) if local else None
+    }
+
+
+class CompManifest:
+    __slots__ = ('path', 'entries', '_lock')
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries = list[dict[str, Any]]()
+
+        self._lock = Lock()
+
+    def add(self, entry: dict[str, Any]) -> None:
+        with self._lock:
+            self.entries.append(entry)
+
+            # rewritten after every script, a long batch can be followed or resumed from it
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            temp = self.path.with_suffix(self.path.suffix + '.tmp')
+            temp.write_text(json.dumps({'comparisons': self.entries}, indent=4), 'utf-8')
+
+            os.replace(temp, self.path)
+
+
+def run_comp_batch(scripts: Sequence[Path], forwarded_args: Sequence[str], jobs: int, manifest_path: Path) -> int:
+    # every script gets its own process, and with it its own core and outputs
+    manifest = CompManifest(manifest_path)
+
+    with TemporaryDirectory(prefix='vspreview-comp-') as temp_dir:
+        def _run(index: int, script: Path) -> dict[str, Any]:
+            result_path = Path(temp_dir) / f'{index}.json'
+
+            started = datetime.now()
+
+            process = subprocess.run([
+                sys.executable, '-m', 'vspreview', str(script), '--comp-result', str(result_path), *forwarded_args
+            ])
+
+            entry: dict[str, Any] = {
+                'script': str(script), 'started': started.isoformat(timespec='seconds'),
+                'duration': round((datetime.now() - started).total_seconds(), 3), 'returncode': process.returncode
+            }
+
+            try:
+                entry |= json.loads(result_path.read_text('utf-8'))
+            except (OSError, ValueError):
+                entry['error'] = 'The comp process exited without a result!'
+
+            return entry
+
+        with ThreadPoolExecutor(max(jobs, 1), 'vspreview-comp-batch') as pool:
+            futures = [pool.submit(_run, i, script) for i, script in enumerate(scripts)]
+
+            for future in as_completed(futures):
+                entry = future.result()
+
+                manifest.add(entry)
+
+                if 'error' in entry:
+                    logging.error(f'Comp of "{entry["script"]}" failed: {entry["error"]}')
+                else:
+                    logging.info(f'Comp of "{entry["script"]}": {entry["url"]}')
+
+    return int(any('error' in entry for entry in manifest.entries))
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import random
+from array import array
+from bisect import bisect_right
+from concurrent.futures import Future
+from enum import Enum
+from pathlib import Path
+from threading import Event, Lock, Semaphore, Thread
+from typing import Callable, Sequence
+
+from vstools import vs
+
+from ...core import FramePropsCache
+
+
+class FrameSelection(str, Enum):
+    RANDOM = 'Random'
+    HIGHEST_DIFFERENCE = 'Highest difference'
+    DARKEST_SCENES = 'Darkest scenes'
+    ONE_PER_SCENE = 'One per scene'
+
+    @classmethod
+    def list(cls) -> list[str]:
+        return [selection.value for selection in cls]
+
+
+def get_frame_metrics_key(keys: Sequence[str], width: int) -> str:
+    return hashlib.sha1(f'{":".join(keys)}:{width}:metrics'.encode('utf-8')).hexdigest()
+
+
+def make_metrics_node(clips: Sequence[vs.VideoNode], width: int) -> vs.VideoNode:
+    num_frames = min(clip.num_frames for clip in clips)
+
+    # every output at the same low resolution, so they can be told apart with a single PlaneStats
+    height = max(round(width * clips[0].height / clips[0].width / 2) * 2, 2)
+
+    small = list[vs.VideoNode]()
+
+    for clip in clips:
+        assert clip.format
+
+        small.append(clip[:num_frames].resize.Bilinear(
+            width, height, format=vs.GRAYS, matrix_s='709' if clip.format.color_family == vs.RGB else None
+        ))
+
+    reference = small[0]
+
+    # compared to the previous frame, the first one to itself
+    previous = reference[0] + reference[:-1] if num_frames > 1 else reference
+
+    node = reference.std.PlaneStats(previous, prop='VSPTemporal')
+
+    for i, clip in enumerate(small[1:], 1):
+        node = node.std.PlaneStats(clip, prop=f'VSPOutput{i}')
+
+    return FramePropsCache.make_props_node(node)
+
+
+class FrameMetricsIndex:
+    BLACK_THRESHOLD = 0.03
+    SCENE_THRESHOLD = 0.08
+    WIDTH = 160
+
+    __slots__ = (
+        'cache_dir', 'key', 'clips', 'in_flight', 'num_frames', 'brightness', 'difference', 'scenes',
+        'done', 'total', '_thread', '_cancelled', '_error', '_lock'
+    )
+
+    def __init__(
+        self, cache_dir: Path | None, keys: Sequence[str], clips: Sequence[vs.VideoNode], in_flight: int = 8
+    ) -> None:
+        # None when the sources are unknown, same as for the picture types
+        self.cache_dir = cache_dir
+        self.key = get_frame_metrics_key(keys, self.WIDTH)
+        self.clips = list(clips)
+        self.in_flight = max(in_flight, 1)
+
+        self.num_frames = min(clip.num_frames for clip in self.clips)
+
+        # per frame: average luma of the first output, largest difference to it of the others, scene start flag
+        self.brightness: array[float] | None = None
+        self.difference: array[float] | None = None
+        self.scenes: array[int] | None = None
+
+        self.done = 0
+        self.total = self.num_frames
+
+        self._thread: Thread | None = None
+        self._cancelled = Event()
+        self._error: BaseException | None = None
+        self._lock = Lock()
+
+    def start(self) -> None:
+        if self._thread is not None and not self._thread.is_alive() and not self.ready:
+            # a failed or cancelled scan is started over
+            self._thread, self._error, self.done = None, None, 0
+            self._cancelled.clear()
+
+        if self._thread is None:
+            self._thread = Thread(target=self._run, name='vspreview-frame-metrics', daemon=True)
+            self._thread.start()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def ready(self) -> bool:
+        return self.scenes is not None
+
+    def wait(
+        self, progress: Callable[[int, int], None] | None = None, stopped: Callable[[], bool] | None = None
+    ) -> bool:
+        self.start()
+
+        assert self._thread
+
+        while self._thread.is_alive():
+            if stopped is not None and stopped():
+                return False
+
+            if progress is not None:
+                progress(self.done, self.total)
+
+            self._thread.join(0.1)
+
+        if self._error is not None:
+            raise self._error
+
+        if not self.ready:
+            raise RuntimeError('The frame metrics scan was cancelled!')
+
+        return True
+
+    def get_scenes(self) -> list[range]:
+        self.wait()
+
+        assert self.scenes is not None
+
+        starts = [n for n, flag in enumerate(self.scenes) if flag] or [0]
+
+        return [range(start, end) for start, end in zip(starts, starts[1:] + [self.num_frames])]
+
+    def select(
+        self, selection: FrameSelection, k: int, candidates: Sequence[int] | None = None, seed: int | None = None
+    ) -> list[int]:
+        scenes = self.get_scenes()
+
+        assert self.brightness is not None and self.difference is not None
+
+        if selection is FrameSelection.HIGHEST_DIFFERENCE and len(self.clips) < 2:
+            raise ValueError('Selecting by difference needs at least two outputs!')
+
+        # black frames are never worth a comparison slot
+        frames = [
+            n for n in (range(self.num_frames) if candidates is None else candidates)
+            if n < self.num_frames and self.brightness[n] > self.BLACK_THRESHOLD
+        ]
+
+        starts = [scene.start for scene in scenes]
+
+        per_scene = dict[int, list[int]]()
+
+        for n in frames:
+            per_scene.setdefault(bisect_right(starts, n) - 1, []).append(n)
+
+        # a single frame per scene, so no two picks are near identical
+        picks = list[tuple[float, int]]()
+
+        for i, scene_frames in per_scene.items():
+            scene = scenes[i]
+
+            if selection is FrameSelection.HIGHEST_DIFFERENCE:
+                n = max(scene_frames, key=lambda n: self.difference[n])  # type: ignore
+                picks.append((-self.difference[n], n))
+                continue
+
+            middle = (scene.start + scene.stop - 1) / 2
+            n = min(scene_frames, key=lambda n: abs(n - middle))
+
+            if selection is FrameSelection.DARKEST_SCENES:
+                picks.append((sum(self.brightness[scene.start:scene.stop]) / len(scene), n))
+            else:
+                picks.append((scene.start, n))
+
+        if len(picks) < k:
+            raise ValueError(
+                f'There aren\'t enough scenes for "{selection.value}", {len(picks)} found for {k} requested'
+            )
+
+        picks.sort()
+
+        if selection is FrameSelection.ONE_PER_SCENE:
+            # spread over the whole clip, with a random offset so repeated comps differ
+            step = len(picks) / k
+            offset = random.Random(seed).random() * step
+
+            return [picks[int(offset + i * step)][1] for i in range(k)]
+
+        return sorted(n for _, n in picks[:k])
+
+    def _run(self) -> None:
+        try:
+            if not self._load():
+                self._scan()
+
+                if self.ready:
+                    self._save()
+        except BaseException as e:
+            self._error = e
+
+    def _scan(self) -> None:
+        node = make_metrics_node(self.clips, self.WIDTH)
+
+        brightness = array('f', bytes(4 * self.num_frames))
+        difference = array('f', bytes(4 * self.num_frames))
+        scenes = array('B', bytes(self.num_frames))
+
+        slots = Semaphore(self.in_flight)
+
+        def _on_done(n: int, future: Future[vs.VideoFrame]) -> None:
+            try:
+                with future.result() as frame:
+                    props = frame.props
+
+                    brightness[n] = props['VSPTemporalAverage']
+                    difference[n] = max(
+                        (props[f'VSPOutput{i}Diff'] for i in range(1, len(self.clips))), default=0.0
+                    )
+
+                    # the source scene detection wins over the rough temporal difference
+                    scene_change = props.get('_SceneChangePrev', None)
+
+                    if scene_change is None:
+                        scene_change = props['VSPTemporalDiff'] > self.SCENE_THRESHOLD
+
+                    scenes[n] = n == 0 or bool(scene_change)
+
+                with self._lock:
+                    self.done += 1
+            except BaseException as e:
+                self._error = e
+                self._cancelled.set()
+            finally:
+                slots.release()
+
+        for n in range(self.num_frames):
+            slots.acquire()
+
+            if self._cancelled.is_set():
+                slots.release()
+                break
+
+            node.get_frame_async(n).add_done_callback(lambda future, n=n: _on_done(n, future))
+
+        for _ in range(self.in_flight):
+            slots.acquire()
+
+        if not self._cancelled.is_set():
+            self.brightness, self.difference, self.scenes = brightness, difference, scenes
+
+    def _load(self) -> bool:
+        if self.cache_dir is None:
+            return False
+
+        try:
+            data = (self.cache_dir / f'{self.key}.bin').read_bytes()
+        except OSError:
+            return False
+
+        if len(data) != 9 * self.num_frames:
+            return False
+
+        brightness, difference, scenes = array('f'), array('f'), array('B')
+
+        brightness.frombytes(data[:4 * self.num_frames])
+        difference.frombytes(data[4 * self.num_frames:8 * self.num_frames])
+        scenes.frombytes(data[8 * self.num_frames:])
+
+        self.done = self.total
+        self.brightness, self.difference, self.scenes = brightness, difference, scenes
+
+        return True
+
+    def _save(self) -> None:
+        assert self.brightness is not None and self.difference is not None and self.scenes is not None
+
+        if self.cache_dir is None:
+            return
+
+        try:
+            self.cache_dir.mkdir(0o777, True, True)
+            (self.cache_dir / f'{self.key}.bin').write_bytes(
+                self.brightness.tobytes() + self.difference.tobytes() + self.scenes.tobytes()
+            )
+        except OSError as e:
+            logging.warning(f'Frame metrics: could not save the index of {self.key}: {e}')
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, NamedTuple
+from uuid import uuid4
+
+
+class MultipartCancelled(Exception):
+    ...
+
+
+class MultipartFile(NamedTuple):
+    filename: str
+    path: Path
+    content_type: str = 'application/octet-stream'
+
+
+# file-like multipart/form-data body, files are only read from disk as the body is being read
+class MultipartEncoder:
+    CHUNK_SIZE = 1 << 16
+
+    __slots__ = (
+        'boundary', 'parts', 'len', 'bytes_read', 'files', 'files_read', 'callback', 'wait_for', '_chunks', '_buffer'
+    )
+
+    def __init__(
+        self, fields: Iterable[tuple[str, str | MultipartFile]],
+        callback: Callable[[MultipartEncoder], None] | None = None,
+        wait_for: Callable[[Path], bool] | None = None
+    ) -> None:
+        self.boundary = uuid4().hex
+        self.callback = callback
+        # called before a file is read, for files still being written, returning False cancels the body
+        self.wait_for = wait_for
+
+        self.parts = [(self._get_part_header(name, value), value) for name, value in fields]
+
+        self.len: int | None = None
+
+        # when every file already exists, the length can be sent upfront
+        if wait_for is None:
+            self.len = sum(
+                len(header) + 2 + (
+                    os.path.getsize(value.path) if isinstance(value, MultipartFile) else len(value.encode())
+                ) for header, value in self.parts
+            ) + len(self._get_closing_boundary())
+
+        self.bytes_read = 0
+        self.files = sum(isinstance(value, MultipartFile) for _, value in self.parts)
+        self.files_read = 0
+
+        self._chunks = self._iter_chunks()
+        self._buffer = bytearray()
+
+    @property
+    def content_type(self) -> str:
+        return f'multipart/form-data; boundary={self.boundary}'
+
+    def __len__(self) -> int:
+        if self.len is None:
+            raise TypeError('The length is only known once every file has been written!')
+
+        return self.len
+
+    def __iter__(self) -> Iterator[bytes]:
+        while chunk := self.read(self.CHUNK_SIZE):
+            yield chunk
+
+    def read(self, size: int | None = -1) -> bytes:
+        if size is None or size < 0:
+            size = self.len or (1 << 62)
+
+        while len(self._buffer) < size:
+            if (chunk := next(self._chunks, None)) is None:
+                break
+
+            self._buffer += chunk
+
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+
+        self.bytes_read += len(data)
+
+        if self.callback is not None and data:
+            self.callback(self)
+
+        return data
+
+    def _get_part_header(self, name: str, value: str | MultipartFile) -> bytes:
+        header = f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"'
+
+        if isinstance(value, MultipartFile):
+            header += f'; filename="{value.filename}"\r\nContent-Type: {value.content_type}'
+
+        return (header + '\r\n\r\n').encode()
+
+    def _get_closing_boundary(self) -> bytes:
+        return f'--{self.boundary}--\r\n'.encode()
+
+    def _iter_chunks(self) -> Iterator[bytes]:
+        for header, value in self.parts:
+            yield header
+
+            if isinstance(value, MultipartFile):
+                if self.wait_for is not None and not self.wait_for(value.path):
+                    raise MultipartCancelled(f'"{value.path}" will never be written!')
+
+                with open(value.path, 'rb') as file:
+                    while chunk := file.read(self.CHUNK_SIZE):
+                        yield chunk
+
+                self.files_read += 1
+            else:
+                yield value.encode()
+
+            yield b'\r\n'
+
+        yield self._get_closing_boundary()
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+from array import array
+from concurrent.futures import Future
+from pathlib import Path
+from threading import Event, Lock, Semaphore, Thread
+from typing import Callable, Sequence
+
+from vstools import vs
+
+from ...core import FramePropsCache, PictureType
+
+
+def get_picture_type_code(props: vs.FrameProps) -> int:
+    picture_type = props.get('_PictType', None)
+
+    if isinstance(picture_type, str):
+        picture_type = picture_type.encode('utf-8')
+
+    # 0 stands for frames without the prop
+    return picture_type[0] if picture_type else 0
+
+
+def get_picture_types_key(script_hash: str, index: int, clip: vs.VideoNode, source: str | None = None) -> str:
+    # nodes can't be identified across sessions, the source files are what tells a re-encode apart
+    return hashlib.sha1(
+        f'{script_hash}:{index}:{clip.num_frames}:{clip.width}x{clip.height}:{clip.format and clip.format.name}:'
+        f'{clip.fps}:{source}'.encode('utf-8')
+    ).hexdigest()
+
+
+class PictureTypeIndex:
+    __slots__ = (
+        'cache_dir', 'keys', 'clips', 'in_flight', 'types', 'done', 'total',
+        '_thread', '_cancelled', '_error', '_lock'
+    )
+
+    def __init__(
+        self, cache_dir: Path | None, keys: Sequence[str], clips: Sequence[vs.VideoNode], in_flight: int = 8
+    ) -> None:
+        # None for outputs whose sources are unknown, their index is only kept in memory
+        self.cache_dir = cache_dir
+        self.keys = list(keys)
+        self.clips = list(clips)
+        self.in_flight = max(in_flight, 1)
+
+        # one byte per frame and output, the first letter of _PictType
+        self.types: list[array[int] | None] = [None] * len(self.clips)
+
+        self.done = 0
+        self.total = sum(clip.num_frames for clip in self.clips)
+
+        self._thread: Thread | None = None
+        self._cancelled = Event()
+        self._error: BaseException | None = None
+        self._lock = Lock()
+
+    def start(self) -> None:
+        if self._thread is not None and not self._thread.is_alive() and not self.ready:
+            # a failed or cancelled scan is started over
+            self._thread, self._error, self.done = None, None, 0
+            self._cancelled.clear()
+
+        if self._thread is None:
+            self._thread = Thread(target=self._run, name='vspreview-picture-types', daemon=True)
+            self._thread.start()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def ready(self) -> bool:
+        return all(types is not None for types in self.types)
+
+    def wait(
+        self, progress: Callable[[int, int], None] | None = None, stopped: Callable[[], bool] | None = None
+    ) -> bool:
+        self.start()
+
+        assert self._thread
+
+        while self._thread.is_alive():
+            if stopped is not None and stopped():
+                return False
+
+            if progress is not None:
+                progress(self.done, self.total)
+
+            self._thread.join(0.1)
+
+        if self._error is not None:
+            raise self._error
+
+        return True
+
+    def get_frames(self, picture_type: PictureType, num_frames: int | None = None) -> list[int]:
+        self.wait()
+
+        code = picture_type.value[0]
+
+        frames: set[int] | None = None
+
+        for types in self.types:
+            if types is None:
+                raise RuntimeError('The picture types scan was cancelled!')
+
+            matching = {n for n, value in enumerate(types[:num_frames]) if value == code}
+            frames = matching if frames is None else frames & matching
+
+        return sorted(frames or ())
+
+    def _run(self) -> None:
+        try:
+            for i, (key, clip) in enumerate(zip(self.keys, self.clips)):
+                if self._cancelled.is_set():
+                    return
+
+                if (types := self._load(key, clip.num_frames)) is None:
+                    types = self._scan(clip)
+
+                    if types is None:
+                        return
+
+                    self._save(key, types)
+                else:
+                    with self._lock:
+                        self.done += clip.num_frames
+
+                self.types[i] = types
+        except BaseException as e:
+            self._error = e
+
+    def _scan(self, clip: vs.VideoNode) -> array[int] | None:
+        node = FramePropsCache.make_props_node(clip)
+        types = array('B', bytes(clip.num_frames))
+
+        slots = Semaphore(self.in_flight)
+
+        def _on_done(n: int, future: Future[vs.VideoFrame]) -> None:
+            try:
+                with future.result() as frame:
+                    types[n] = get_picture_type_code(frame.props)
+
+                with self._lock:
+                    self.done += 1
+            except BaseException as e:
+                self._error = e
+                self._cancelled.set()
+            finally:
+                slots.release()
+
+        for n in range(clip.num_frames):
+            slots.acquire()
+
+            if self._cancelled.is_set():
+                slots.release()
+                break
+
+            node.get_frame_async(n).add_done_callback(lambda future, n=n: _on_done(n, future))
+
+        for _ in range(self.in_flight):
+            slots.acquire()
+
+        return None if self._cancelled.is_set() else types
+
+    def _load(self, key: str, num_frames: int) -> array[int] | None:
+        if self.cache_dir is None:
+            return None
+
+        try:
+            data = (self.cache_dir / f'{key}.bin').read_bytes()
+        except OSError:
+            return None
+
+        if len(data) != num_frames:
+            return None
+
+        return array('B', data)
+
+    def _save(self, key: str, types: array[int]) -> None:
+        if self.cache_dir is None:
+            return
+
+        try:
+            self.cache_dir.mkdir(0o777, True, True)
+            (self.cache_dir / f'{key}.bin').write_bytes(types.tobytes())
+        except OSError as e:
+            logging.warning(f'Picture types: could not save the index of {key}: {e}')
@@ -2,11 +2,20 @@ from __future__ import annotations
 
 from typing import Any, Mapping
 
-from ...core import AbstractToolbarSettings, CheckBox, try_load
+from PyQt6.QtWidgets import QComboBox, QLabel
+
+from ...core import AbstractToolbarSettings, CheckBox, HBoxLayout, SpinBox, try_load
+from ...core.custom import ComboBox
+from ...main.settings import MainSettings
+from ...models import GeneralModel
+from .encoders import get_available_image_encoders
 
 
 class CompSettings(AbstractToolbarSettings):
-    __slots__ = ('delete_cache_checkbox', )
+    __slots__ = (
+        'delete_cache_checkbox', 'frames_in_flight_spinbox', 'encoding_threads_spinbox', 'pipelined_checkbox',
+        'image_store_size_spinbox', 'image_encoder_combobox'
+    )
 
     DEFAULT_COLLECTION_NAME = ''
 
@@ -15,20 +24,87 @@ class CompSettings(AbstractToolbarSettings):
 
         self.delete_cache_checkbox = CheckBox('Delete images cache after upload')
 
+        self.pipelined_checkbox = CheckBox(
+            'Upload while extracting', self, tooltip=(
+                'Start the upload right away and send every image as soon as it is written.\n'
+                'The request body is sent chunked, since its length is not known upfront.'
+            )
+        )
+
+        self.frames_in_flight_spinbox = SpinBox(
+            self, 1, 256, tooltip='Frames requested or waiting to be encoded at once, across all outputs'
+        )
+
+        self.encoding_threads_spinbox = SpinBox(self, 1, 256, tooltip='Threads encoding the extracted images')
+
+        self.image_encoder_combobox = ComboBox[str](
+            self, model=GeneralModel[str](get_available_image_encoders(), False),
+            sizeAdjustPolicy=QComboBox.SizeAdjustPolicy.AdjustToContents
+        )
+
+        self.image_store_size_spinbox = SpinBox(
+            self, 0, 1 << 20, ' MB', specialValueText='Disabled',
+            tooltip='Extracted images are kept and reused for unchanged outputs, up to this size'
+        )
+
         self.vlayout.addWidget(self.delete_cache_checkbox)
+        self.vlayout.addWidget(self.pipelined_checkbox)
+        self.vlayout.addLayout(HBoxLayout([QLabel('Frames in flight', self), self.frames_in_flight_spinbox]))
+        self.vlayout.addLayout(HBoxLayout([QLabel('Images encoder', self), self.image_encoder_combobox]))
+        self.vlayout.addLayout(HBoxLayout([QLabel('Encoding threads', self), self.encoding_threads_spinbox]))
+        self.vlayout.addLayout(HBoxLayout([QLabel('Images store size', self), self.image_store_size_spinbox]))
 
     def set_defaults(self) -> None:
+        cpus_count = MainSettings.get_usable_cpus_count()
+
         self.delete_cache_checkbox.setChecked(True)
+        self.pipelined_checkbox.setChecked(False)
+        self.frames_in_flight_spinbox.setValue(cpus_count * 2)
+        self.encoding_threads_spinbox.setValue(cpus_count)
+        self.image_store_size_spinbox.setValue(0)
+        self.image_encoder_combobox.setCurrentValue('PNG')
 
     @property
     def delete_cache_enabled(self) -> bool:
         return self.delete_cache_checkbox.isChecked()
 
+    @property
+    def pipelined_enabled(self) -> bool:
+        return self.pipelined_checkbox.isChecked()
+
+    @property
+    def frames_in_flight(self) -> int:
+        return self.frames_in_flight_spinbox.value()
+
+    @property
+    def encoding_threads(self) -> int:
+        return self.encoding_threads_spinbox.value()
+
+    @property
+    def image_encoder(self) -> str:
+        return self.image_encoder_combobox.currentValue()
+
+    @property
+    def image_store_size(self) -> int:
+        return self.image_store_size_spinbox.value()
+
     def __getstate__(self) -> Mapping[str, Any]:
         return {
-            'delete_cache_enabled': self.delete_cache_enabled
+            'delete_cache_enabled': self.delete_cache_enabled,
+            'pipelined_enabled': self.pipelined_enabled,
+            'frames_in_flight': self.frames_in_flight,
+            'encoding_threads': self.encoding_threads,
+            'image_store_size': self.image_store_size,
+            'image_encoder': self.image_encoder
         }
 
     def __setstate__(self, state: Mapping[str, Any]) -> None:
         try_load(state, 'delete_cache_enabled', bool, self.delete_cache_checkbox.setChecked)
+        try_load(state, 'pipelined_enabled', bool, self.pipelined_checkbox.setChecked)
+        try_load(state, 'frames_in_flight', int, self.frames_in_flight_spinbox.setValue)
+        try_load(state, 'encoding_threads', int, self.encoding_threads_spinbox.setValue)
+        try_load(state, 'image_store_size', int, self.image_store_size_spinbox.setValue)
+
+        if state.get('image_encoder', None) in get_available_image_encoders():
+            self.image_encoder_combobox.setCurrentValue(state['image_encoder'])
         super().__setstate__(state)
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import shutil
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+from vstools import vs
+
+from ...core import AbstractMainWindow, VideoOutput
+from ..benchmark.profiler import get_filter_name, get_node_dependencies, walk_graph
+
+
+def _describe_value(value: Any) -> str:
+    if isinstance(value, vs.RawNode):
+        return f'<{get_filter_name(value)}>'
+
+    if isinstance(value, (list, tuple)):
+        return '[' + ','.join(map(_describe_value, value)) + ']'
+
+    # callables and the likes have their address in their repr, they just never match
+    return repr(value)
+
+
+def get_source_identity(clip: vs.VideoNode) -> str | None:
+    # the files read by the source filters, a re-encode leaves the script and the graph as they were
+    files = list[str]()
+
+    for node in walk_graph(clip):
+        if get_node_dependencies(node):
+            continue
+
+        try:
+            inputs = node._inputs
+        except Exception:
+            return None
+
+        # without graph inspection the output is the only node, and it has nothing to show
+        if not inputs:
+            return None
+
+        for value in inputs.values():
+            for item in (value if isinstance(value, (list, tuple)) else [value]):
+                if isinstance(item, bytes):
+                    item = item.decode('utf-8', 'replace')
+
+                if not isinstance(item, str) or not item or not os.path.isfile(item):
+                    continue
+
+                try:
+                    stat = os.stat(item)
+                except OSError:
+                    return None
+
+                files.append(f'{os.path.abspath(item)}:{stat.st_size}:{stat.st_mtime_ns}')
+
+    return hashlib.sha1('\n'.join(sorted(files)).encode('utf-8')).hexdigest()
+
+
+def get_node_fingerprint(clip: vs.VideoNode) -> str:
+    description = list[str]()
+
+    for node in walk_graph(clip):
+        try:
+            inputs = node._inputs
+        except Exception:
+            inputs = {}
+
+        description.append(
+            get_filter_name(node) + '(' + ','.join(
+                f'{key}={_describe_value(value)}' for key, value in sorted(inputs.items())
+            ) + ')'
+        )
+
+    description.append(
+        f'{clip.num_frames}:{clip.width}x{clip.height}:{clip.format and clip.format.name}:{clip.fps}'
+    )
+
+    return hashlib.sha1('\n'.join(description).encode('utf-8')).hexdigest()
+
+
+def get_output_fingerprint(main: AbstractMainWindow, output: VideoOutput) -> str | None:
+    # the script alone can't tell outputs or re-encoded files apart, such outputs are never reused
+    if (source := get_source_identity(output.source.clip)) is None:
+        return None
+
+    # the preview conversion settings are part of the prepared node, but not visible without graph inspection
+    settings = (
+        main.VS_OUTPUT_MATRIX, main.VS_OUTPUT_TRANSFER, main.VS_OUTPUT_PRIMARIES,
+        main.VS_OUTPUT_RANGE, main.VS_OUTPUT_CHROMALOC, main.toolbars.playback.settings.dither_type,
+        output._NORML_FMT.name
+    )
+
+    return hashlib.sha1(
+        f'{output.index}:{source}:{get_node_fingerprint(output.source.clip)}:{settings!r}'.encode('utf-8')
+    ).hexdigest()
+
+
+class ImageStore:
+    __slots__ = ('root', 'max_size', '_lock')
+
+    def __init__(self, root: Path, max_size: int) -> None:
+        self.root = root
+        self.max_size = max_size
+
+        self._lock = Lock()
+
+    @staticmethod
+    def get_key(fingerprint: str, frame: int, encoding: str) -> str:
+        return hashlib.sha1(f'{fingerprint}:{frame}:{encoding}'.encode('utf-8')).hexdigest()
+
+    def get_path(self, key: str) -> Path:
+        # the encoding is part of the key, the extension is left out
+        return self.root / key[:2] / key
+
+    def fetch(self, key: str, destination: Path) -> bool:
+        if not (path := self.get_path(key)).is_file():
+            return False
+
+        try:
+            self._link(path, destination)
+
+            # the modification time is the last use, for eviction
+            path.touch()
+        except OSError:
+            return False
+
+        return True
+
+    def put(self, key: str, source: Path) -> None:
+        path = self.get_path(key)
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            if not path.exists():
+                self._link(source, path)
+        except OSError as e:
+            logging.warning(f'Comp image store: could not store "{source}": {e}')
+
+    def evict(self) -> None:
+        with self._lock:
+            try:
+                files = [(path, path.stat()) for path in self.root.glob('*/*')]
+            except OSError:
+                return
+
+            total = sum(stat.st_size for _, stat in files)
+
+            for path, stat in sorted(files, key=lambda item: item[1].st_mtime):
+                if total <= self.max_size:
+                    break
+
+                try:
+                    path.unlink()
+                    total -= stat.st_size
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _link(source: Path, destination: Path) -> None:
+        # a hard link costs no space nor copy, falling back to a copy across file systems
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copyfile(source, destination)
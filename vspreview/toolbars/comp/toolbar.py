@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
 import random
@@ -9,7 +10,8 @@ import string
 import unicodedata
 from functools import partial
 from pathlib import Path
-from typing import Any, Callable, Final, NamedTuple, cast
+from threading import Thread
+from typing import TYPE_CHECKING, Callable, NamedTuple
 
 from PyQt6.QtCore import QObject, QThread, pyqtSignal
 from PyQt6.QtWidgets import QComboBox, QLabel
@@ -19,14 +21,18 @@ from ...core import (
     AbstractMainWindow, AbstractToolbar, CheckBox, LineEdit, PictureType, ProgressBar, PushButton, main_window
 )
 from ...core.custom import ComboBox, FrameEdit
-from ...models import PictureTypes, VideoOutputs
+from ...models import GeneralModel, PictureTypes, VideoOutputs
+from .bundle import LocalBundle
+from .encoders import ImageEncoder, get_image_encoder
+from .extract import FrameExtractor
+from .metrics import FrameMetricsIndex, FrameSelection, get_frame_metrics_key
+from .multipart import MultipartEncoder, MultipartFile
+from .picture_types import PictureTypeIndex, get_picture_types_key
 from .settings import CompSettings
+from .store import ImageStore, get_output_fingerprint, get_source_identity
 
-_MAX_ATTEMPTS_PER_PICTURE_TYPE: Final[int] = 50
-
-
-def select_frames(clip: vs.VideoNode, indices: list[int]) -> vs.VideoNode:
-    return clip.std.BlankClip(length=len(indices)).std.FrameEval(lambda n: clip[indices[n]])
+if TYPE_CHECKING:
+    from requests import Response
 
 
 def clear_filename(filename: str) -> str:
@@ -73,6 +79,44 @@ def clear_filename(filename: str) -> str:
     return filename
 
 
+class FrameSampling(NamedTuple):
+    count: int
+    num_frames: int
+    picture_type: PictureType
+    picture_type_index: PictureTypeIndex | None = None
+    selection: FrameSelection = FrameSelection.RANDOM
+    frame_metrics_index: FrameMetricsIndex | None = None
+
+    def wait(self, progress: Callable[[int, int], None], stopped: Callable[[], bool]) -> bool:
+        for index in (self.picture_type_index, self.frame_metrics_index):
+            if index is not None and not index.wait(progress, stopped):
+                return False
+
+        return True
+
+    def select(self) -> list[int]:
+        if self.frame_metrics_index is not None:
+            candidates = None
+
+            if self.picture_type_index is not None:
+                candidates = self.picture_type_index.get_frames(self.picture_type, self.num_frames)
+
+            return self.frame_metrics_index.select(self.selection, self.count, candidates)
+
+        if self.picture_type_index is None:
+            return random.sample(range(self.num_frames), self.count)
+
+        candidates = self.picture_type_index.get_frames(self.picture_type, self.num_frames)
+
+        if len(candidates) < self.count:
+            raise ValueError(
+                f'There aren\'t enough of {self.picture_type} in these clips, '
+                f'{len(candidates)} found for {self.count} requested'
+            )
+
+        return random.sample(candidates, self.count)
+
+
 class WorkerConfiguration(NamedTuple):
     outputs: VideoOutputs
     collection_name: str
@@ -81,18 +125,32 @@ class WorkerConfiguration(NamedTuple):
     optimise: bool
     remove_after: int | None
     frames: list[int]
-    compression: int
+    encoder: ImageEncoder
     path: Path
     main: AbstractMainWindow
     delete_cache: bool
+    frames_in_flight: int
+    encoding_threads: int
+    pipelined: bool
+    store: ImageStore | None
+    fingerprints: list[str | None]
+    local: bool
+    sampling: FrameSampling | None = None
 
 
 class Worker(QObject):
     finished = pyqtSignal()
     progress_bar = pyqtSignal(int)
     progress_status = pyqtSignal(str, int, int)
+    encoder_status = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+    # can be pointed to a local stand-in server
+    SLOWPICS_URL = os.environ.get('VSPREVIEW_SLOWPICS_URL', 'https://slow.pics').rstrip('/')
 
     is_finished = False
+    extractor: FrameExtractor | None = None
+    frames: list[int] | None = None
 
     def _progress_update_func(self, value: int, endvalue: int) -> None:
         if value == 0:
@@ -103,114 +161,184 @@ class Worker(QObject):
     def isFinished(self) -> bool:
         return self.is_finished
 
+    def stop(self) -> None:
+        self.is_finished = True
+
+        if self.extractor is not None:
+            self.extractor.cancel()
+
+    def _search_progress(self, done: int, total: int) -> None:
+        self.progress_status.emit('search', done, total)
+        self._progress_update_func(done, total)
+
+    def sample_frames(self, conf: WorkerConfiguration) -> list[int] | None:
+        assert conf.sampling
+
+        # scanning the clips can take a while, it's waited on here and never in the GUI thread
+        if not conf.sampling.wait(self._search_progress, self.isFinished):
+            return None
+
+        return sorted(set(conf.frames) | set(conf.sampling.select()))
+
+    def _extract_progress(self, done: int, total: int) -> None:
+        self.progress_status.emit('extract', done, total)
+        self._progress_update_func(done, total)
+        self._encoder_progress(done, total)
+
+    def _encoder_progress(self, done: int, total: int) -> None:
+        if self.extractor is not None:
+            self.encoder_status.emit(str(self.extractor.stats))
+
+    def _run_extractor(self, progress: Callable[[int, int], None] | None = None) -> None:
+        assert self.extractor
+
+        try:
+            self.extractor.run(progress)
+        except BaseException:
+            # reported through the upload, which can't go on without the images
+            pass
+
+    def upload(
+        self, conf: WorkerConfiguration, fields: dict[str, str | MultipartFile],
+        wait_for: Callable[[Path], bool] | None = None
+    ) -> Response | None:
+        from requests import Session
+
+        with Session() as sess:
+            sess.get(f'{self.SLOWPICS_URL}/api/comparison')
+            if self.isFinished():
+                return None
+            head_conf = {
+                'collectionName': conf.collection_name,
+                'public': str(conf.public).lower(),
+                'optimizeImages': str(conf.optimise).lower(),
+                'hentai': str(conf.nsfw).lower(),
+            }
+            if conf.remove_after is not None:
+                head_conf |= {'removeAfter': str(conf.remove_after)}
+
+            def _monitor_cb(monitor: MultipartEncoder) -> None:
+                if monitor.len is None:
+                    self.progress_status.emit('upload', monitor.files_read, monitor.files)
+                    self._progress_update_func(monitor.files_read, monitor.files)
+                else:
+                    self._progress_update_func(monitor.bytes_read, monitor.len)
+
+            # the images are streamed from disk while uploading, never all held in memory
+            files = MultipartEncoder((head_conf | fields).items(), _monitor_cb, wait_for)
+
+            headers = {
+                "Accept": "*/*",
+                "Accept-Encoding": "gzip, deflate, br",
+                "Accept-Language": "en-US,en;q=0.5",
+                "Content-Type": files.content_type,
+                "Origin": f'{self.SLOWPICS_URL}/',
+                "Referer": f'{self.SLOWPICS_URL}/comparison',
+                "Sec-Fetch-Mode": "cors",
+                "Sec-Fetch-Site": "same-origin",
+                "User-Agent": (
+                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+                ),
+                "X-XSRF-TOKEN": sess.cookies.get_dict()["XSRF-TOKEN"]  # noqa
+            }
+
+            if files.len is None:
+                # the images sizes aren't known yet, so the body goes chunked
+                return sess.post(f'{self.SLOWPICS_URL}/api/comparison', iter(files), headers=headers)
+
+            return sess.post(
+                f'{self.SLOWPICS_URL}/api/comparison', files, headers=headers | {"Content-Length": str(files.len)}
+            )
+
     def run(self, conf: WorkerConfiguration) -> None:
         try:
-            from requests import Session
-            from requests_toolbelt import MultipartEncoder, MultipartEncoderMonitor
+            import requests  # noqa: F401
         except ModuleNotFoundError:
             raise ModuleNotFoundError(
-                'You are missing `requests` and `requests` toolbelt!\n'
-                'Install them with "pip install requests requests_toolbelt"!'
+                'You are missing `requests`!\n'
+                'Install it with "pip install requests"!'
             )
 
-        all_images = list[list[Path]]()
-        conf.path.mkdir(parents=True, exist_ok=False)
-
-        try:
-            for i, output in enumerate(conf.outputs):
-                if self.isFinished():
-                    raise StopIteration
-                self.progress_status.emit('extract', i + 1, len(conf.outputs))
+        if conf.sampling is not None:
+            try:
+                frames = self.sample_frames(conf)
+            except (ValueError, RuntimeError) as e:
+                self.failed.emit(str(e))
+                return self.finished.emit()
 
-                path_name = conf.path / output.name
-                path_name.mkdir(parents=True)
+            if frames is None:
+                return self.finished.emit()
 
-                max_num = max(conf.frames)
+            conf = conf._replace(frames=frames)
 
-                path_images = [
-                    path_name / (f'{output.name}_' + f'{f}'.zfill(len("%i" % max_num)) + '.png')
-                    for f in conf.frames
-                ]
+        self.frames = conf.frames
 
-                def _save(n: int, f: vs.VideoFrame) -> vs.VideoFrame:
-                    if self.isFinished():
-                        raise StopIteration
-                    conf.main.current_output.frame_to_qimage(f).save(
-                        str(path_images[n]), 'PNG', conf.compression
-                    )
-                    return f
+        conf.path.mkdir(parents=True, exist_ok=False)
 
-                decimated = select_frames(output.prepared.clip, conf.frames)
-                clip = decimated.std.ModifyFrame(decimated, _save)
+        # every (output, frame) pair is requested at once, up to the in-flight window, and encoded in a pool
+        self.extractor = FrameExtractor(
+            conf.outputs, conf.frames, conf.path, conf.encoder, conf.frames_in_flight, conf.encoding_threads,
+            conf.store, conf.fingerprints
+        )
 
-                with open(os.devnull, 'wb') as devnull:
-                    clip.output(devnull, y4m=False, progress_update=self._progress_update_func)
+        self.progress_status.emit('extract', 0, self.extractor.total)
 
-                if self.isFinished():
-                    raise StopIteration
+        if conf.local:
+            return self.write_bundle(conf)
 
-                all_images.append(sorted(path_images))
-        except StopIteration:
-            return self.finished.emit()
+        extraction: Thread | None = None
 
-        fields = dict[str, Any]()
+        if conf.pipelined:
+            # images are uploaded as soon as they're written, in the order they're extracted in
+            extraction = Thread(
+                target=self._run_extractor, args=(self._encoder_progress, ), name='vspreview-comp-extract', daemon=True
+            )
+            extraction.start()
+        else:
+            self.extractor.run(self._extract_progress)
 
-        for i, (output, images) in enumerate(zip(conf.outputs, all_images)):
             if self.isFinished():
                 return self.finished.emit()
-            for j, (image, frame) in enumerate(zip(images, conf.frames)):
-                if self.isFinished():
-                    return self.finished.emit()
-                fields[f'comparisons[{j}].name'] = str(frame)
+
+        fields = dict[str, str | MultipartFile]()
+
+        for j, frame in enumerate(conf.frames):
+            fields[f'comparisons[{j}].name'] = str(frame)
+
+            for i, output in enumerate(conf.outputs):
+                image = self.extractor.paths[i][j]
+
                 fields[f'comparisons[{j}].images[{i}].name'] = output.name
-                fields[f'comparisons[{j}].images[{i}].file'] = (image.name, image.read_bytes(), 'image/png')
+                fields[f'comparisons[{j}].images[{i}].file'] = MultipartFile(
+                    image.name, image, conf.encoder.content_type
+                )
 
-        self.progress_status.emit('upload', 0, 0)
+        if not conf.pipelined:
+            self.progress_status.emit('upload', 0, 0)
 
-        with Session() as sess:
-            sess.get('https://slow.pics/api/comparison')
+        try:
+            response = self.upload(conf, fields, self.extractor.wait_for if conf.pipelined else None)
+        except Exception:
             if self.isFinished():
                 return self.finished.emit()
-            head_conf = {
-                'collectionName': conf.collection_name,
-                'public': str(conf.public).lower(),
-                'optimizeImages': str(conf.optimise).lower(),
-                'hentai': str(conf.nsfw).lower(),
-            }
-            if conf.remove_after is not None:
-                head_conf |= {'removeAfter': str(conf.remove_after)}
 
-            def _monitor_cb(monitor: MultipartEncoderMonitor) -> None:
-                self._progress_update_func(monitor.bytes_read, monitor.len)
-
-            files = MultipartEncoder(head_conf | fields)
-            monitor = MultipartEncoderMonitor(files, _monitor_cb)
-
-            response = sess.post(
-                'https://slow.pics/api/comparison',
-                cast(bytes, monitor.to_string()),
-                headers={
-                    "Accept": "*/*",
-                    "Accept-Encoding": "gzip, deflate, br",
-                    "Accept-Language": "en-US,en;q=0.5",
-                    "Content-Length": str(files.len),
-                    "Content-Type": files.content_type,
-                    "Origin": "https://slow.pics/",
-                    "Referer": "https://slow.pics/comparison",
-                    "Sec-Fetch-Mode": "cors",
-                    "Sec-Fetch-Site": "same-origin",
-                    "User-Agent": (
-                        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-                    ),
-                    "X-XSRF-TOKEN": sess.cookies.get_dict()["XSRF-TOKEN"]  # noqa
-                }
-            )
+            if self.extractor.error is not None:
+                raise self.extractor.error
+
+            raise
+        finally:
+            if extraction is not None:
+                self.extractor.cancel()
+                extraction.join()
+
+        if response is None:
+            return self.finished.emit()
 
         if conf.delete_cache:
             shutil.rmtree(conf.path, True)
 
-        url = f'https://slow.pics/c/{response.text}'
+        url = f'{self.SLOWPICS_URL}/c/{response.text}'
 
         self.progress_status.emit(url, 0, 0)
 
@@ -224,21 +352,56 @@ class Worker(QObject):
 
         self.finished.emit()
 
+    def write_bundle(self, conf: WorkerConfiguration) -> None:
+        assert self.extractor
+
+        bundle = LocalBundle(
+            conf.path, conf.collection_name, [output.name for output in conf.outputs], conf.frames,
+            self.extractor.paths
+        )
+
+        extraction = Thread(
+            target=self._run_extractor, args=(self._extract_progress, ), name='vspreview-comp-extract', daemon=True
+        )
+        extraction.start()
+
+        try:
+            # the viewer is written first, and the frames are added to it as they're extracted
+            complete = bundle.write(self.extractor.wait_for)
+        finally:
+            self.extractor.cancel()
+            extraction.join()
+
+        if self.isFinished():
+            return self.finished.emit()
+
+        if self.extractor.error is not None:
+            raise self.extractor.error
+
+        if complete:
+            self.progress_status.emit(bundle.index.as_uri(), 0, 0)
+
+        self.finished.emit()
+
 
 class CompToolbar(AbstractToolbar):
     _thread_running = False
 
     __slots__ = (
         'random_frames_control', 'manual_frames_lineedit', 'output_url_lineedit',
-        'current_frame_checkbox', 'is_public_checkbox', 'is_nsfw_checkbox',
+        'current_frame_checkbox', 'is_public_checkbox', 'is_nsfw_checkbox', 'local_checkbox',
         'output_url_copy_button', 'start_upload_button', 'stop_upload_button',
-        'upload_progressbar', 'upload_status_label', 'upload_status_elements'
+        'upload_progressbar', 'upload_status_label', 'encoder_status_label', 'upload_status_elements',
+        'picture_type_index', 'selection_combox', 'frame_metrics_index'
     )
 
     def __init__(self, main: AbstractMainWindow) -> None:
         super().__init__(main, CompSettings())
         self.setup_ui()
 
+        self.picture_type_index: PictureTypeIndex | None = None
+        self.frame_metrics_index: FrameMetricsIndex | None = None
+
         self.set_qobject_names()
 
     def setup_ui(self) -> None:
@@ -257,6 +420,18 @@ class CompToolbar(AbstractToolbar):
             duplicatesEnabled=True, sizeAdjustPolicy=QComboBox.SizeAdjustPolicy.AdjustToContents, currentIndex=0
         )
 
+        self.pic_type_combox.currentIndexChanged.connect(self.on_picture_type_changed)
+
+        self.selection_combox = ComboBox[str](
+            self, model=GeneralModel[str](FrameSelection.list(), False), currentIndex=0,
+            sizeAdjustPolicy=QComboBox.SizeAdjustPolicy.AdjustToContents, toolTip=(
+                'How the random frames are picked.\n'
+                'Every mode but Random picks a single frame per scene and skips black frames.'
+            )
+        )
+
+        self.selection_combox.currentIndexChanged.connect(self.on_selection_changed)
+
         self.pic_type_combox.view().setMinimumWidth(self.pic_type_combox.minimumSizeHint().width())
         temp_width = self.pic_type_combox.minimumSizeHint().width()
         self.pic_type_combox.setMinimumWidth(temp_width + temp_width // 10)
@@ -265,6 +440,13 @@ class CompToolbar(AbstractToolbar):
 
         self.is_nsfw_checkbox = CheckBox('NSFW', self, checked=False)
 
+        self.local_checkbox = CheckBox(
+            'Local', self, checked=False, tooltip=(
+                'Write the comparison to a local folder with an HTML viewer, instead of uploading it to slow.pics'
+            )
+        )
+        self.local_checkbox.stateChanged.connect(self.on_local_changed)
+
         self.output_url_lineedit = LineEdit('https://slow.pics/c/', self, enabled=False)
 
         self.output_url_copy_button = PushButton('⎘', self, clicked=self.on_copy_output_url_clicked)
@@ -278,13 +460,15 @@ class CompToolbar(AbstractToolbar):
 
         self.upload_status_label = QLabel(self)
 
+        self.encoder_status_label = QLabel(self)
+
         self.upload_status_elements = (
-            self.get_separator(), self.upload_progressbar, self.upload_status_label
+            self.get_separator(), self.upload_progressbar, self.upload_status_label, self.encoder_status_label
         )
 
         self.hlayout.addWidgets([
             self.collection_name_lineedit,
-            QLabel('Random:'), self.random_frames_control,
+            QLabel('Random:'), self.random_frames_control, self.selection_combox,
             QLabel('Manual:'), self.manual_frames_lineedit,
             self.current_frame_checkbox,
             self.get_separator(),
@@ -292,6 +476,7 @@ class CompToolbar(AbstractToolbar):
             self.get_separator(),
             self.is_public_checkbox,
             self.is_nsfw_checkbox,
+            self.local_checkbox,
             self.get_separator(),
             self.output_url_lineedit,
             self.output_url_copy_button,
@@ -308,6 +493,14 @@ class CompToolbar(AbstractToolbar):
         self.main.clipboard.setText(self.output_url_lineedit.text())
         self.main.show_message('Slow.pics URL copied to clipboard!')
 
+    def on_local_changed(self, state: int) -> None:
+        local = self.local_checkbox.isChecked()
+
+        self.is_public_checkbox.setEnabled(not local)
+        self.is_nsfw_checkbox.setEnabled(not local)
+        self.start_upload_button.setText('Start Export' if local else 'Start Upload')
+        self.stop_upload_button.setText('Stop Export' if local else 'Stop Upload')
+
     def update_upload_status_visibility(self, visible: bool) -> None:
         for element in self.upload_status_elements:
             element.setVisible(visible)
@@ -332,7 +525,7 @@ class CompToolbar(AbstractToolbar):
             self.upload_status_label.setText("Finished!")
 
     def on_stop_upload(self) -> None:
-        self.upload_worker.is_finished = True
+        self.upload_worker.stop()
 
         self.on_end_upload(forced=True)
 
@@ -352,57 +545,79 @@ class CompToolbar(AbstractToolbar):
 
         self.upload_status_label.setText(f'{message}{moreinfo}...')
 
-    def _rand_num_frames(self, checked: set[int], rand_func: Callable[[], int]) -> int:
-        rnum = rand_func()
-        while rnum in checked:
-            rnum = rand_func()
-        return rnum
-
-    def _select_samples_ptypes(self, num_frames: int, k: int, picture_type: PictureType) -> list[int]:
-        samples = set[int]()
-        _max_attempts = 0
-        _rnum_checked = set[int]()
-        while len(samples) < k:
-            _attempts = 0
-            while True:
-                self.update_status_label('search', _attempts, _MAX_ATTEMPTS_PER_PICTURE_TYPE)
-                if len(_rnum_checked) >= num_frames:
-                    raise ValueError(f'There aren\'t enough of {picture_type} in these clips')
-                rnum = self._rand_num_frames(_rnum_checked, partial(random.randrange, start=0, stop=num_frames))
-                _rnum_checked.add(rnum)
-
-                if all(
-                    cast(bytes, f.props['_PictType']).decode('utf-8') == str(picture_type)[0]
-                    for f in vs.core.std.Splice(
-                        [select_frames(out.prepared.clip, [rnum]) for out in self.main.outputs], True
-                    ).frames()
-                ):
-                    break
-
-                _attempts += 1
-                _max_attempts += 1
-
-                if _attempts > _MAX_ATTEMPTS_PER_PICTURE_TYPE:
-                    logging.warning(
-                        f'{_MAX_ATTEMPTS_PER_PICTURE_TYPE} attempts were made for sample {len(samples)} '
-                        f'and no match found for {picture_type}; stopping iteration...')
-                    break
-
-            if _max_attempts > (curr_max_att := _MAX_ATTEMPTS_PER_PICTURE_TYPE * k):
-                raise RecursionError(f'Comp: attempts max of {curr_max_att} has been reached!')
-
-            if _attempts < _MAX_ATTEMPTS_PER_PICTURE_TYPE:
-                samples.add(rnum)
-                self.upload_progressbar.setValue(int())
-                self.upload_progressbar.setValue(int(100 * len(samples) / k))
-
-        return list(samples)
-
-    def get_slowpics_conf(self) -> WorkerConfiguration:
+    def get_script_hash(self) -> str:
+        try:
+            return hashlib.sha1(self.main.script_path.read_bytes()).hexdigest()
+        except OSError:
+            return str(self.main.script_path)
+
+    def get_scan_keys(self) -> tuple[list[str], bool]:
+        script_hash = self.get_script_hash()
+
+        sources = [get_source_identity(output.source.clip) for output in self.main.outputs]
+
+        keys = [
+            get_picture_types_key(script_hash, output.index, output.source.clip, source)
+            for output, source in zip(self.main.outputs, sources)
+        ]
+
+        # a scan of unknown sources could be of a file that's since been re-encoded, it's not kept on disk
+        return keys, None not in sources
+
+    def get_picture_type_index(self) -> PictureTypeIndex:
+        assert self.main.outputs
+
+        keys, persistent = self.get_scan_keys()
+
+        if self.picture_type_index is None or self.picture_type_index.keys != keys:
+            if self.picture_type_index is not None:
+                self.picture_type_index.cancel()
+
+            self.picture_type_index = PictureTypeIndex(
+                self.main.current_config_dir / 'picture_types' if persistent else None, keys,
+                [output.source.clip for output in self.main.outputs], self.main.settings.usable_cpus_count * 2
+            )
+
+        self.picture_type_index.start()
+
+        return self.picture_type_index
+
+    def on_picture_type_changed(self, index: int) -> None:
+        # the scan runs in the background while the rest of the comp is set up
+        if self.pic_type_combox.currentData() is not PictureType.ALL and self.main.outputs:
+            self.get_picture_type_index()
+
+    def get_frame_metrics_index(self) -> FrameMetricsIndex:
+        assert self.main.outputs
+
+        keys, persistent = self.get_scan_keys()
+
+        if self.frame_metrics_index is None or self.frame_metrics_index.key != get_frame_metrics_key(
+            keys, FrameMetricsIndex.WIDTH
+        ):
+            if self.frame_metrics_index is not None:
+                self.frame_metrics_index.cancel()
+
+            self.frame_metrics_index = FrameMetricsIndex(
+                self.main.current_config_dir / 'frame_metrics' if persistent else None, keys,
+                [output.source.clip for output in self.main.outputs], self.main.settings.usable_cpus_count * 2
+            )
+
+        self.frame_metrics_index.start()
+
+        return self.frame_metrics_index
+
+    def on_selection_changed(self, index: int) -> None:
+        # same as the picture types, the scan is already going once the comp is started
+        if self.selection_combox.currentValue() != FrameSelection.RANDOM.value and self.main.outputs:
+            self.get_frame_metrics_index()
+
+    def get_slowpics_conf(self, random_count: int | None = None) -> WorkerConfiguration:
         self.update_upload_status_visibility(True)
 
         clips: dict[str, vs.VideoNode]
-        num = int(self.random_frames_control.value())
+        # headless comps pass the count in, the frame edit is capped to the current output
+        num = int(self.random_frames_control.value()) if random_count is None else random_count
         frames = list[int](
             map(int, filter(None, [x.strip() for x in self.manual_frames_lineedit.text().split(',')]))
         )
@@ -415,18 +630,21 @@ class CompToolbar(AbstractToolbar):
 
         lens_n = min(lens)
 
-        path = Path(main_window().current_config_dir) / ''.join(
-            random.choices(string.ascii_uppercase + string.digits, k=16)
-        )
+        if not 0 <= num <= lens_n:
+            raise ValueError(f'Can\'t pick {num} random frames out of {lens_n}!')
+
+        selection = FrameSelection(self.selection_combox.currentValue())
+
+        samples = list[int]()
+        sampling = None
 
         if num:
-            if picture_type is PictureType.ALL:
-                samples = random.sample(range(lens_n), num)
-            else:
-                logging.info('Making samples according to specified picture types...')
-                samples = self._select_samples_ptypes(lens_n, num, picture_type)
-        else:
-            samples = []
+            # the random frames are picked by the worker, once the picture types and metrics scans are done
+            sampling = FrameSampling(
+                num, lens_n, picture_type,
+                None if picture_type is PictureType.ALL else self.get_picture_type_index(), selection,
+                None if selection is FrameSelection.RANDOM else self.get_frame_metrics_index()
+            )
 
         if len(frames):
             samples.extend(frames)
@@ -446,27 +664,57 @@ class CompToolbar(AbstractToolbar):
             script_name=self.main.script_path.stem
         )
 
+        local = self.local_checkbox.isChecked()
+
+        path = Path(main_window().current_config_dir)
+
+        if local:
+            # bundles are kept, so they're named after the collection
+            path = path / 'Local Comps' / clear_filename(
+                f'{collection_name} - ' + ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
+            )
+        else:
+            path = path / ''.join(random.choices(string.ascii_uppercase + string.digits, k=16))
+
         sample_frames = list(sorted(set(samples)))
 
+        if not sample_frames and sampling is None:
+            raise ValueError('There are no frames to compare!')
+
         check_frame = sample_frames and sample_frames[0] or 0
 
         filtered_outputs = []
 
-        for output in self.main.outputs:
-            props = output.props
+        # all outputs at once, rather than one synchronous get_frame after the other
+        for future in [output.props_cache.prefetch([check_frame]) for output in self.main.outputs]:
+            future.result()
 
-            if not props:
-                props = output.source.clip.get_frame(check_frame).props
+        for output in self.main.outputs:
+            props = output.props_cache[check_frame]
 
-            if '_VSPDisableComp' in props and props._DisableComp == 1:
+            if props.get('_VSPDisableComp', 0) == 1:
                 continue
 
             filtered_outputs.append(output)
 
+        encoder = get_image_encoder(self.settings.image_encoder)
+
+        if not local and not encoder.uploadable:
+            raise ValueError(f'Images encoded as {encoder.name} can\'t be uploaded to slow.pics!')
+
+        store, fingerprints = None, list[str]()
+
+        if self.settings.image_store_size:
+            store = ImageStore(self.main.current_config_dir / 'comp_images', self.settings.image_store_size * 2 ** 20)
+
+            fingerprints = [get_output_fingerprint(self.main, output) for output in filtered_outputs]
+
         return WorkerConfiguration(
             filtered_outputs, collection_name,
             self.is_public_checkbox.isChecked(), self.is_nsfw_checkbox.isChecked(),
-            True, None, sample_frames, -1, path, self.main, self.settings.delete_cache_enabled
+            True, None, sample_frames, encoder, path, self.main, self.settings.delete_cache_enabled,
+            self.settings.frames_in_flight, self.settings.encoding_threads, self.settings.pipelined_enabled,
+            store, fingerprints, local, sampling
         )
 
     def upload_to_slowpics(self) -> bool:
@@ -491,6 +739,10 @@ class CompToolbar(AbstractToolbar):
 
             self.upload_worker.progress_bar.connect(self.upload_progressbar.setValue)
             self.upload_worker.progress_status.connect(self.update_status_label)
+            self.upload_worker.encoder_status.connect(self.encoder_status_label.setText)
+            self.upload_worker.failed.connect(self.main.show_message)
+
+            self.encoder_status_label.clear()
 
             self.upload_thread.start()
 
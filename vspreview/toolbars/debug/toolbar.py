@@ -2,7 +2,10 @@ from __future__ import annotations
 
 import logging
 
-from ...core import AbstractMainWindow, AbstractToolbar, LineEdit, PushButton
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QLabel
+
+from ...core import AbstractMainWindow, AbstractToolbar, LineEdit, PushButton, Timer, get_process_memory
 from ...utils import debug, vs_clear_cache
 from .settings import DebugSettings
 
@@ -10,13 +13,15 @@ from .settings import DebugSettings
 class DebugToolbar(AbstractToolbar):
     _no_visibility_choice = True
 
-    __slots__ = ('exec_lineedit', )
+    __slots__ = ('exec_lineedit', 'memory_label', 'memory_timer')
 
     def __init__(self, main: AbstractMainWindow) -> None:
         super().__init__(main, DebugSettings())
 
         self.setup_ui()
 
+        self.memory_timer = Timer(timeout=self.update_memory_label, interval=self.main.settings.MEMORY_REFRESH_INTERVAL)
+
         if self.settings.DEBUG_TOOLBAR_BUTTONS_PRINT_STATE:
             self.filter = debug.EventFilter(main)
             self.main.toolbars.main.widget.installEventFilter(self.filter)
@@ -42,6 +47,29 @@ class DebugToolbar(AbstractToolbar):
 
         self.hlayout.addStretch()
 
+        self.memory_label = QLabel(self)
+        self.memory_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+
+        self.vlayout.addWidget(self.memory_label)
+
+    def on_toggle(self, new_state: bool) -> None:
+        super().on_toggle(new_state)
+
+        if new_state:
+            self.update_memory_label()
+            self.memory_timer.start()
+        else:
+            self.memory_timer.stop()
+
+    def update_memory_label(self) -> None:
+        sizes = self.main.memory.sizes()
+
+        self.memory_label.setText(
+            f'Memory: {get_process_memory() // 2 ** 20} MB used, '
+            f'{sum(sizes.values()) // 2 ** 20} MB accounted ('
+            + ', '.join(f'{name}: {size // 2 ** 20} MB' for name, size in sizes.items()) + ')'
+        )
+
     def test_button_clicked(self, checked: bool | None = None) -> None:
         vs_clear_cache()
 
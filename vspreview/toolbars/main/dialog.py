@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Any, Mapping
+
 from PyQt6.QtCore import QPointF, Qt
 from PyQt6.QtGui import QColor, QMouseEvent, QPainter, QPaintEvent
 from PyQt6.QtWidgets import QLabel
@@ -103,13 +105,13 @@ class FramePropsDialog(ExtendedWidget):
             Stretch()
         ])
 
-    def showDialog(self, props: FrameProps | None) -> None:
+    def showDialog(self, props: FrameProps | Mapping[str, Any] | None) -> None:
         if props is not None:
             self.update_frame_props(props)
 
         super().show()
 
-    def update_frame_props(self, props: FrameProps) -> None:
+    def update_frame_props(self, props: FrameProps | Mapping[str, Any]) -> None:
         node_idx = self.main_window.toolbars.main.outputs_combobox.currentIndex()
         self.header.setText(
             f'Frame Props - Node {node_idx} / Frame {self.main_window.current_output.last_showed_frame}'
@@ -77,7 +77,7 @@ class MainToolbar(AbstractToolbar):
         )
 
         self.frame_props_tab_button = PushButton(
-            'Frame Props', self, clicked=lambda: self.frame_props_dialog.showDialog(self.main.current_output.props)
+            'Frame Props', self, clicked=lambda: self.frame_props_dialog.showDialog(self.current_frame_props)
         )
 
         self.settings_button = PushButton('Settings', self, clicked=self.main.app_settings.show)
@@ -143,7 +143,11 @@ class MainToolbar(AbstractToolbar):
             self.on_sync_outputs_clicked(True, force_frame=frame)
 
         if not self.frame_props_dialog.isHidden():
-            self.frame_props_dialog.update_frame_props(self.main.current_output.props)
+            self.frame_props_dialog.update_frame_props(self.current_frame_props)
+
+    @property
+    def current_frame_props(self) -> dict[str, Any]:
+        return self.main.current_output.props_cache[int(self.main.current_output.last_showed_frame)]
 
     def on_current_output_changed(self, index: int, prev_index: int) -> None:
         qt_silent_call(self.outputs_combobox.setCurrentIndex, index)
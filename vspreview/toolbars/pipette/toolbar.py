@@ -11,7 +11,7 @@ from PyQt6.QtGui import QFont, QMouseEvent
 from PyQt6.QtWidgets import QGraphicsView, QLabel
 from vstools import vs
 
-from ...core import AbstractMainWindow, AbstractToolbar, PushButton, VideoOutput
+from ...core import AbstractMainWindow, AbstractToolbar, PushButton, VideoOutput, get_frame_size
 from .colorview import ColorView
 from .settings import PipetteSettings
 
@@ -55,11 +55,28 @@ class PipetteToolbar(AbstractToolbar):
 
         main.reload_signal.connect(self.clear_outputs)
 
+        self.main.memory.register('Pipette outputs', self.get_hidden_outputs_size, self.clear_hidden_outputs, 30)
+
         self.set_qobject_names()
 
     def clear_outputs(self) -> None:
         self.outputs.clear()
 
+    def get_hidden_outputs_size(self) -> int:
+        # every prepared node keeps at least its last frame alive in the core cache
+        return sum(
+            get_frame_size(node) for output, node in list(self.outputs.items())
+            if output is not self.main.current_output
+        )
+
+    def clear_hidden_outputs(self) -> None:
+        # they're prepared again when the pipette is used on them
+        for output in list(self.outputs.keys()):
+            if output is not self.main.current_output:
+                del self.outputs[output]
+                self._curr_frame_cache.pop(output, None)
+                self._curr_alphaframe_cache.pop(output, None)
+
     def setup_ui(self) -> None:
         super().setup_ui()
 
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import logging
+from concurrent.futures import Future
+from queue import SimpleQueue
+from threading import Thread
+from typing import Callable, Union
+
+from vstools import vs
+
+# future of a frame not needed anymore, with what to do with it once it's done, if anything
+ReaperJob = tuple[Future[Union[vs.VideoFrame, vs.AudioFrame]], Union[Callable[[vs.VideoFrame], None], None]]
+
+
+class FrameReaper:
+    __slots__ = ('_queue', '_thread')
+
+    def __init__(self) -> None:
+        self._queue = SimpleQueue[ReaperJob]()
+        self._thread: Thread | None = None
+
+    def reap(
+        self, future: Future[vs.VideoFrame] | Future[vs.AudioFrame],
+        callback: Callable[[vs.VideoFrame], None] | None = None
+    ) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = Thread(target=self._run, name='vspreview-frame-reaper', daemon=True)
+            self._thread.start()
+
+        self._queue.put((future, callback))
+
+    def _run(self) -> None:
+        while True:
+            future, callback = self._queue.get()
+
+            try:
+                frame = future.result()
+            except Exception:
+                continue
+
+            try:
+                if callback is not None:
+                    callback(frame)
+            except Exception as e:
+                logging.error(f'Playback: failed to keep a stopped frame: {e}')
+            finally:
+                frame.close()
+                del frame, future
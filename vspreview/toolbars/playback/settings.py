@@ -22,6 +22,7 @@ class PlaybackSettings(AbstractToolbarSettings):
     FPS_AVERAGING_WINDOW_SIZE = Frame(100)
     FPS_REFRESH_INTERVAL = 150  # ms
     SEEK_STEP = 1
+    STOPPED_FRAMES_KEPT = 8  # buffered frames after the pause point that get kept as rendered frames
 
     def setup_ui(self) -> None:
         from ...core import main_window
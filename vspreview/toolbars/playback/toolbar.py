@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import gc
 import logging
 from collections import deque
 from concurrent.futures import Future
@@ -14,17 +13,17 @@ from PyQt6.QtWidgets import QComboBox, QSlider
 from vstools import vs
 
 from ...core import (
-    AbstractMainWindow, AbstractToolbar, AudioOutput, CheckBox, DoubleSpinBox, Frame, PushButton, Time, Timer, try_load
+    AbstractMainWindow, AbstractToolbar, AudioOutput, CheckBox, DoubleSpinBox, Frame, PushButton, Time, Timer,
+    get_frame_size, try_load
 )
 from ...core.custom import ComboBox, FrameEdit, TimeEdit
 from ...models import AudioOutputs
 from ...utils import debug, qt_silent_call
+from .reaper import FrameReaper
 from .settings import PlaybackSettings
 
 
-def _del_future(f: Future[vs.VideoFrame]) -> None:
-    f0 = f.result()
-    del f, f0
+AUDIO_FRAME_SAMPLES = 3072
 
 
 class PlaybackToolbar(AbstractToolbar):
@@ -40,7 +39,7 @@ class PlaybackToolbar(AbstractToolbar):
         'play_end_frame', 'play_buffer', 'toggle_button', 'play_timer_audio',
         'current_audio_frame', 'play_buffer_audio', 'audio_outputs',
         'audio_outputs_combobox', 'seek_to_start_button', 'seek_to_end_button',
-        'audio_volume_slider'
+        'audio_volume_slider', 'frame_reaper'
     )
 
     def __init__(self, main: AbstractMainWindow) -> None:
@@ -48,6 +47,7 @@ class PlaybackToolbar(AbstractToolbar):
         self.setup_ui()
 
         self.play_buffer = deque[tuple[int, Future[vs.VideoFrame]]]()
+        self.frame_reaper = FrameReaper()
         self.play_timer = Timer(timeout=self._show_next_frame, timerType=Qt.TimerType.PreciseTimer)
 
         self.play_timer_audio = Timer(timeout=self._play_next_audio_frame, timerType=Qt.TimerType.PreciseTimer)
@@ -72,6 +72,10 @@ class PlaybackToolbar(AbstractToolbar):
         self.setVolume(50, True)
         self.setMute(True)
 
+        # in-flight requests can't be given back, they're only accounted for
+        self.main.memory.register('Playback buffer', self.get_play_buffer_size, priority=200)
+        self.main.memory.register('Audio playback buffer', self.get_play_buffer_audio_size, priority=200)
+
         self.main.timeline.clicked.connect(self.on_timeline_clicked)
 
         self.add_shortcuts()
@@ -212,6 +216,28 @@ class PlaybackToolbar(AbstractToolbar):
 
         self.play_buffer = deque([], play_buffer_size)
 
+    def get_play_buffer_size(self) -> int:
+        if not self.play_buffer or not self.main.outputs:
+            return 0
+
+        output = self.main.current_output
+
+        if output.prepared.alpha is None:
+            return len(self.play_buffer) * get_frame_size(output.prepared.clip)
+
+        # the clip and alpha frames are separate entries, every frame takes two of them
+        return (len(self.play_buffer) + 1) // 2 * (
+            get_frame_size(output.prepared.clip) + get_frame_size(output.prepared.alpha)
+        )
+
+    def get_play_buffer_audio_size(self) -> int:
+        if not self.play_buffer_audio or self.current_audio_output is None:
+            return 0
+
+        vs_output = self.current_audio_output.vs_output
+
+        return len(self.play_buffer_audio) * AUDIO_FRAME_SAMPLES * vs_output.num_channels * vs_output.bytes_per_sample
+
     def play(self, stop_at_frame: int | Frame | None = None) -> None:
         if self.main.current_output.last_showed_frame > self.main.current_output.total_frames:
             return
@@ -253,7 +279,10 @@ class PlaybackToolbar(AbstractToolbar):
                 self.fps_timer.start(self.settings.FPS_REFRESH_INTERVAL)
         else:
             if self.fps_variable_checkbox.isChecked() and self.main.current_output._stateset:
-                fps = self.get_true_fps(self.last_frame, self.main.current_output.props)
+                fps = self.get_true_fps(
+                    self.last_frame,
+                    self.main.current_output.props_cache[int(self.main.current_output.last_showed_frame)]
+                )
             else:
                 fps = self.main.current_output.play_fps
 
@@ -366,13 +395,7 @@ class PlaybackToolbar(AbstractToolbar):
         if self.main.statusbar.label.text() == 'Playing':
             self.main.statusbar.label.setText('Ready')
 
-        for future in self.play_buffer:
-            future[1].add_done_callback(_del_future)
-
-        self.play_buffer.clear()
-        del self.play_buffer
-
-        gc.collect(generation=2)
+        self.reap_play_buffer()
 
         self.current_audio_output = self.audio_outputs_combobox.currentValue()
 
@@ -390,6 +413,23 @@ class PlaybackToolbar(AbstractToolbar):
             )
             self.play_start_time = None
 
+    def reap_play_buffer(self) -> None:
+        # waiting on in-flight requests happens in the reaper's thread, nothing blocks here
+        output = self.main.current_output
+        last_showed_frame = int(output.last_showed_frame)
+        keep_frames = output.prepared is not None and output.prepared.alpha is None
+
+        for n, future in self.play_buffer:
+            if keep_frames and n - last_showed_frame <= self.settings.STOPPED_FRAMES_KEPT:
+                self.frame_reaper.reap(future, partial(
+                    output.cache_rendered_frame, n, output_colorspace=self.main.display_profile,
+                    generation=self.main.rendered_frames.generation
+                ))
+            else:
+                self.frame_reaper.reap(future)
+
+        self.play_buffer = deque[tuple[int, Future[vs.VideoFrame]]]()
+
     def stop_audio(self) -> None:
         if self.current_audio_output is None:
             return
@@ -399,7 +439,7 @@ class PlaybackToolbar(AbstractToolbar):
         self.play_timer_audio.stop()
 
         for future in self.play_buffer_audio:
-            future.add_done_callback(_del_future)
+            self.frame_reaper.reap(future)
 
         self.play_buffer_audio.clear()
 
@@ -74,7 +74,14 @@ def set_status_label(label: str) -> Callable[[F], F]:
     return cast(Callable[[F], F], _decorator)
 
 
-def vs_clear_cache() -> None:
+def vs_clear_cache() -> bool:
+    # newer cores can drop every cached frame themselves
+    if hasattr(vs.core, 'clear_cache'):
+        vs.core.clear_cache()
+        return True
+
+    # only flushes what one frame of the current output goes through, benchmarks have to report it as warm
+
     cache_size = vs.core.max_cache_size
     vs.core.max_cache_size = 1
     for output in list(vs.get_outputs().values()):
@@ -82,3 +89,5 @@ def vs_clear_cache() -> None:
             output.clip.get_frame(int(main_window().current_output.last_showed_frame or Frame(0)))
             break
     vs.core.max_cache_size = cache_size
+
+    return False